@@ -6,13 +6,38 @@
 演示：
 - 离线阶段：Chunk → Embed(BatchNode) → Index
 - 在线阶段：Retrieve → Generate
-- BatchNode 批量计算 embedding
+- BatchNode 按微批次计算 embedding：每次 exec 处理一批文本，重试也以批为单位
+- IndexNode 构建 VectorIndex（float32 矩阵 + argpartition top-k）
+- 索引落盘后，在线 Flow 可在新进程中通过 memmap 直接打开，无需重新 embedding
+- 按内容哈希增量重建：只 embedding 新增/变更的 chunk，删除的 chunk 打墓碑
+- shared["index_type"] = "ivf" 时额外构建 IVF 近似索引，RetrieveNode 无需改动
+- shared["index_type"] = "int8" / "float16" 时构建量化索引，常驻内存的矩阵缩小 4 / 2 倍，
+  shared["rescore_k"] 控制用原始 float32 向量重排的候选数
+- 流式导入：StreamChunk → Embed → Index 循环，每次只处理一小批 chunk，内存占用恒定
+- EmbeddingCache：按文本哈希 + 模型 id 缓存向量（内存 LRU + SQLite），重复问题不再 embedding
+- 批量检索：BatchRetrieve 把一批问题一起 embedding，用一次矩阵-矩阵乘法打分
+- 混合检索：shared["hybrid"] = True 时 IndexNode 同时构建 BM25 倒排索引，检索时与向量结果做 RRF 融合，
+  错误码、编号这类关键词也能精确命中
 
 注意：本示例使用模拟的 embedding 和 LLM，无需 API 密钥。
 """
 
-import math
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
 from pocketflow import Node, BatchNode, Flow
+from rag_utils import VectorIndex, load_index, load_manifest, plan_reindex, update_index, compact_index
+from rag_utils import IVFIndex, save_ivf, load_ivf, remove_ivf, iter_file_reindex
+from rag_utils import QuantizedIndex, save_quantized, load_quantized, remove_quantized
+from rag_utils import EMBED_DIM, micro_batches, mock_embed_texts, EmbeddingCache
+from rag_utils import BM25Index, save_bm25, load_bm25, remove_bm25, hybrid_search, reciprocal_rank_fusion
+
+INDEX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rag_index")
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rag_cache.sqlite3")
+COMPACT_RATIO = 0.5  # 墓碑行超过一半时重写索引
 
 
 # ========== 模拟工具函数 ==========
@@ -22,22 +47,9 @@ def split_text(text: str, chunk_size: int = 50) -> list[str]:
     return [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
 
 
-def mock_compute_embedding(text: str) -> list[float]:
-    """模拟 embedding 计算：基于字符哈希生成简单向量"""
-    vec = [0.0] * 8
-    for i, ch in enumerate(text):
-        vec[i % 8] += ord(ch) * 0.001
-    # 归一化
-    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
-    return [x / norm for x in vec]
-
-
-def cosine_similarity(a: list[float], b: list[float]) -> float:
-    """余弦相似度"""
-    dot = sum(x * y for x, y in zip(a, b))
-    na = math.sqrt(sum(x * x for x in a))
-    nb = math.sqrt(sum(x * x for x in b))
-    return dot / (na * nb) if na * nb > 0 else 0.0
+def embed_texts(texts: list[str], cache: EmbeddingCache = None) -> np.ndarray:
+    """批量 embedding，有缓存时只计算未命中的文本"""
+    return cache.embed(texts, mock_embed_texts) if cache else mock_embed_texts(texts)
 
 
 def mock_call_llm(prompt: str) -> str:
@@ -51,70 +63,248 @@ def mock_call_llm(prompt: str) -> str:
 
 class ChunkNode(Node):
     def prep(self, shared):
-        return shared["documents"]
+        docs = shared["documents"]
+        if not isinstance(docs, dict):
+            docs = {f"doc-{i}": doc for i, doc in enumerate(docs)}
+        # 读取已有索引的清单，对比内容哈希
+        return docs, load_manifest(shared.get("index_dir"))
+
+    def exec(self, data):
+        docs, manifest = data
+        plan = plan_reindex(docs, manifest, lambda text: split_text(text, chunk_size=50))
+        print(f"[Chunk] 切分出 {len(plan['new_chunks'])} 个新片段，"
+              f"其中 {len(plan['embed_texts'])} 个需要 embedding，删除 {len(plan['tombstones'])} 个旧片段")
+        return plan
+
+    def post(self, shared, prep_res, exec_res):
+        shared["index_plan"] = exec_res
+        shared["chunks"] = exec_res["embed_texts"]  # 只把新内容交给 EmbedBatch
+
+
+class StreamChunkNode(Node):
+    """流式切分：直接读磁盘文件，每次只取出一批 chunk 交给 EmbedBatch"""
 
-    def exec(self, docs):
-        chunks = []
-        for doc in docs:
-            chunks.extend(split_text(doc, chunk_size=50))
-        print(f"[Chunk] 切分为 {len(chunks)} 个片段")
-        return chunks
+    def prep(self, shared):
+        if "chunk_stream" not in shared:
+            shared["chunk_stream"] = iter_file_reindex(
+                shared["files"],
+                load_manifest(shared["index_dir"]),
+                chunk_size=shared.get("chunk_size", 500),
+                overlap=shared.get("chunk_overlap", 50),
+                batch_size=shared.get("stream_batch_size", 64),
+            )
+        return shared["chunk_stream"]
+
+    def exec(self, stream):
+        return next(stream)
 
     def post(self, shared, prep_res, exec_res):
-        shared["chunks"] = exec_res
+        if exec_res["final"]:
+            del shared["chunk_stream"]
+        shared["index_plan"] = exec_res
+        shared["chunks"] = exec_res["embed_texts"]  # 上一批的 chunk 随之释放
+        print(f"[Stream] 取出 {len(exec_res['new_chunks'])} 个片段，"
+              f"其中 {len(exec_res['embed_texts'])} 个需要 embedding")
 
 
 class EmbedBatch(BatchNode):
-    """使用 BatchNode 批量处理每个 chunk"""
+    """使用 BatchNode 按微批次计算 embedding
+
+    Args:
+        batch_size: 每次 exec 处理的 chunk 数量（1 即逐条调用）
+        max_tokens: 每批的 token 预算，None 表示不限制
+        cache: 可选的 EmbeddingCache
+    """
+
+    def __init__(self, batch_size=64, max_tokens=None, cache=None, max_retries=1, wait=0):
+        super().__init__(max_retries=max_retries, wait=wait)
+        self.batch_size = batch_size
+        self.max_tokens = max_tokens
+        self.cache = cache
 
     def prep(self, shared):
-        return shared["chunks"]  # 返回列表
+        # 返回微批次列表，exec 每次收到一批
+        return micro_batches(shared["chunks"], self.batch_size, self.max_tokens)
 
-    def exec(self, chunk):
-        # 每个 chunk 独立计算 embedding
-        embedding = mock_compute_embedding(chunk)
-        return embedding
+    def exec(self, texts):
+        # 一次调用算出整批 embedding，失败时只重试这一批
+        return embed_texts(texts, self.cache)
 
     def post(self, shared, prep_res, exec_res):
-        shared["embeddings"] = exec_res  # 所有 embedding 的列表
-        print(f"[Embed] 批量计算完成，共 {len(exec_res)} 个向量")
+        embeddings = np.concatenate(exec_res) if exec_res else np.empty((0, EMBED_DIM), dtype=np.float32)
+        shared["embeddings"] = embeddings  # (chunk 数, 维度) 的矩阵
+        print(f"[Embed] 批量计算完成，{len(exec_res)} 个批次共 {len(embeddings)} 个向量")
 
 
 class IndexNode(Node):
     def prep(self, shared):
+        plan = shared["index_plan"]
         return {
-            "chunks": shared["chunks"],
+            "plan": plan,
             "embeddings": shared["embeddings"],
+            # 只在需要复用旧向量时 memmap 打开索引（流式导入的每一批都会走到这里，不读文档清单）
+            "stored": load_index(shared["index_dir"]).embeddings if plan["reuse"] else None,
         }
 
     def exec(self, data):
-        # 构建简单的内存索引（实际场景用向量数据库）
-        index = list(zip(data["chunks"], data["embeddings"]))
-        print(f"[Index] 索引构建完成，共 {len(index)} 条记录")
+        # 新行的向量：刚算出来的，或复用索引里相同内容的旧向量
+        plan = data["plan"]
+        fresh = dict(zip(plan["embed_hashes"], data["embeddings"]))
+        vectors = [
+            fresh[h] if h in fresh else data["stored"][plan["reuse"][h]]
+            for h in plan["new_hashes"]
+        ]
+        print(f"[Index] 新增 {len(vectors)} 条记录（复用已有向量 {len(vectors) - len(fresh)} 个）")
+        return vectors
+
+    def post(self, shared, prep_res, exec_res):
+        plan = prep_res["plan"]
+        index_dir = shared.get("index_dir")
+        if not plan["final"]:
+            # 流式导入的中间批次：只追加，墓碑、文档清单、压缩和 ANN 都留到最后一批
+            update_index(index_dir, plan["new_chunks"], exec_res, plan["new_hashes"])
+            return "next"
+        if not index_dir:
+            # 构建内存向量索引（实际场景用向量数据库）
+            # 没有文档时 exec_res 是空列表，按 (0, 维度) 的矩阵建一个空索引
+            vectors = np.array(exec_res, dtype=np.float32).reshape(len(exec_res), EMBED_DIM)
+            index = VectorIndex(plan["new_chunks"], vectors)
+            shared["index"] = self.build_ann(shared, index)
+            shared["bm25"] = self.build_bm25(shared, index)
+            return
+        update_index(index_dir, plan["new_chunks"], exec_res, plan["new_hashes"],
+                     plan["tombstones"], plan["docs"], live_from=plan["first_row"])
+        index = load_index(index_dir)
+        dead = len(index) - int(index.alive.sum())
+        if dead > len(index) * COMPACT_RATIO:
+            del index
+            compact_index(index_dir)
+            index = load_index(index_dir)
+            print(f"[Index] 墓碑过多，已压缩索引")
+        print(f"[Index] 索引已更新：{index_dir}（有效 {int(index.alive.sum())} / 共 {len(index)} 行）")
+        shared["index"] = self.build_ann(shared, index)
+        shared["bm25"] = self.build_bm25(shared, index)
+        return "done"
+
+    def build_ann(self, shared, index):
+        """按 shared["index_type"] 在精确索引之上构建近似索引或量化索引
+
+        磁盘上的结构仍对应当前的行（行指纹一致）且参数相同时直接复用：只删除文档的增量运行不用重建，
+        墓碑在检索时按 alive 掩码过滤。
+        """
+        index_type, index_dir = shared.get("index_type"), shared.get("index_dir")
+        if index_dir:
+            existing = self.existing_ann(shared, index)
+            # 其余的近似/量化结构来自另一种 index_type 或已过期，连同数据文件一律删掉，避免在线阶段误用
+            if not isinstance(existing, IVFIndex):
+                remove_ivf(index_dir)
+            if not isinstance(existing, QuantizedIndex):
+                remove_quantized(index_dir)
+            if existing is not None:
+                print(f"[Index] 索引行未变化，复用已有的 {index_type} 结构")
+                return existing
+        if len(index) == 0:
+            return index
+        if index_type == "ivf":
+            ivf = IVFIndex.build(index, nlist=shared.get("ivf_nlist"), nprobe=shared.get("ivf_nprobe", 8))
+            if index_dir:
+                save_ivf(ivf, index_dir)
+            print(f"[Index] IVF 构建完成：nlist={ivf.nlist}，nprobe={ivf.nprobe}")
+            return ivf
+        if index_type in ("int8", "float16"):
+            quantized = QuantizedIndex.build(index, index_type, rescore_k=shared.get("rescore_k"))
+            if index_dir:
+                save_quantized(quantized, index_dir)
+            print(f"[Index] {index_type} 量化完成：{index.embeddings.nbytes} → {quantized.nbytes} 字节")
+            return quantized
         return index
 
+    def existing_ann(self, shared, index):
+        """磁盘上与当前行、本次参数都一致的近似/量化结构，没有时返回 None"""
+        index_type, index_dir = shared.get("index_type"), shared["index_dir"]
+        if index_type == "ivf":
+            ivf = load_ivf(index_dir, index)
+            if ivf is not None and ivf.nprobe == shared.get("ivf_nprobe", 8) \
+                    and shared.get("ivf_nlist") in (None, ivf.nlist):
+                return ivf
+        if index_type in ("int8", "float16"):
+            quantized = load_quantized(index_dir, index)
+            if quantized is not None and quantized.mode == index_type \
+                    and quantized.rescore_k == shared.get("rescore_k"):
+                return quantized
+        return None
+
+    def build_bm25(self, shared, index):
+        """shared["hybrid"] 为真时，在同一批行上构建 BM25 倒排索引（行号与向量索引一致）
+
+        磁盘上的倒排表仍对应当前的行时直接复用（词频统计不看墓碑，只删除文档时结果不变）。
+        """
+        index_dir = shared.get("index_dir")
+        if index_dir and shared.get("hybrid"):
+            existing = load_bm25(index_dir, index)
+            if existing is not None:
+                print("[Index] 索引行未变化，复用已有的 BM25 倒排表")
+                return existing
+        if index_dir:
+            remove_bm25(index_dir)  # 旧倒排表可能对应别的行，非混合模式下也不能留给在线阶段
+        if not shared.get("hybrid"):
+            return None
+        bm25 = BM25Index.build(index.chunks, alive=index.alive)
+        if shared.get("index_dir"):
+            save_bm25(bm25, shared["index_dir"])
+        print(f"[Index] BM25 构建完成：{len(bm25.vocab)} 个词项")
+        return bm25
+
+
+class IngestReportNode(Node):
+    """流式导入结束：汇报索引规模"""
+
+    def prep(self, shared):
+        return shared["index"]
+
+    def exec(self, index):
+        return len(index)
+
     def post(self, shared, prep_res, exec_res):
-        shared["index"] = exec_res
+        print(f"[Ingest] 流式导入完成，索引共 {exec_res} 行")
 
 
 # ========== 在线阶段：检索回答 ==========
 
+def get_index(shared):
+    """取 shared 中的索引；服务进程里没有离线阶段的结果时，直接 memmap 打开磁盘上的索引"""
+    if shared.get("index") is None:
+        start = time.perf_counter()
+        index = load_index(shared["index_dir"])
+        # 有 IVF 就用近似检索，有量化矩阵就在量化矩阵上打分
+        ann = load_ivf(shared["index_dir"], index) or load_quantized(shared["index_dir"], index)
+        shared["index"] = index if ann is None else ann
+        shared["bm25"] = load_bm25(shared["index_dir"], index)  # 有倒排表就做混合检索
+        print(f"[Retrieve] memmap 打开索引耗时 {(time.perf_counter() - start) * 1000:.2f} ms")
+    return shared["index"]
+
+
 class RetrieveNode(Node):
+    def __init__(self, cache=None, max_retries=1, wait=0):
+        super().__init__(max_retries=max_retries, wait=wait)
+        self.cache = cache  # 高频问题直接命中缓存，跳过 embedding
+
     def prep(self, shared):
         return {
             "question": shared["question"],
-            "index": shared["index"],
+            "index": get_index(shared),
+            "bm25": shared.get("bm25"),
         }
 
     def exec(self, data):
-        q_embedding = mock_compute_embedding(data["question"])
-        # 计算相似度并排序
-        scored = [
-            (chunk, cosine_similarity(q_embedding, emb))
-            for chunk, emb in data["index"]
-        ]
-        scored.sort(key=lambda x: x[1], reverse=True)
-        top_k = [chunk for chunk, score in scored[:3]]
+        q_embedding = embed_texts([data["question"]], self.cache)[0]
+        if data["bm25"] is not None:
+            # 向量和 BM25 各取候选，按名次做 RRF 融合
+            hits = hybrid_search(data["index"], data["bm25"], data["question"], q_embedding, k=3)
+        else:
+            # 一次矩阵-向量乘法算出全部相似度，argpartition 取 top-3
+            hits = data["index"].search(q_embedding, k=3)
+        top_k = [chunk for chunk, score in hits]
         print(f"[Retrieve] 检索到 top-3 片段：")
         for i, chunk in enumerate(top_k):
             print(f"  {i + 1}. {chunk[:40]}...")
@@ -124,6 +314,41 @@ class RetrieveNode(Node):
         shared["context"] = "\n".join(exec_res)
 
 
+class BatchRetrieveNode(BatchNode):
+    """批量检索：一次 Flow 处理一整批突发问题
+
+    每个微批次的问题一起 embedding，再与索引做一次矩阵-矩阵乘法，逐行取 top-k。
+    有 BM25 索引时，向量检索多取一些候选，再逐个问题与 BM25 结果做 RRF 融合。
+    """
+
+    def __init__(self, batch_size=64, k=3, cache=None, max_retries=1, wait=0):
+        super().__init__(max_retries=max_retries, wait=wait)
+        self.batch_size = batch_size
+        self.k = k
+        self.cache = cache
+
+    def prep(self, shared):
+        index = get_index(shared)
+        bm25 = shared.get("bm25")
+        return [(questions, index, bm25) for questions in micro_batches(shared["questions"], self.batch_size)]
+
+    def exec(self, item):
+        questions, index, bm25 = item
+        q_embeddings = embed_texts(questions, self.cache)
+        if bm25 is None:
+            return [[chunk for chunk, score in hits] for hits in index.search_batch(q_embeddings, k=self.k)]
+        fetch_k = 4 * self.k
+        return [
+            [index.chunks[row] for row, score in
+             reciprocal_rank_fusion([vec_ids, bm25.search_ids(question, fetch_k)[0]])[:self.k]]
+            for question, (vec_ids, _) in zip(questions, index.search_ids_batch(q_embeddings, k=fetch_k))
+        ]
+
+    def post(self, shared, prep_res, exec_res):
+        shared["contexts"] = ["\n".join(top_k) for batch in exec_res for top_k in batch]
+        print(f"[BatchRetrieve] {len(shared['contexts'])} 个问题检索完成（{len(exec_res)} 个批次）")
+
+
 class GenerateNode(Node):
     def prep(self, shared):
         return {
@@ -141,32 +366,113 @@ class GenerateNode(Node):
         print(f"\n[Generate] 最终回答：{exec_res}")
 
 
+class BatchGenerateNode(BatchNode):
+    """为每个问题分别生成回答"""
+
+    def prep(self, shared):
+        return list(zip(shared["questions"], shared["contexts"]))
+
+    def exec(self, item):
+        question, context = item
+        return mock_call_llm(f"基于以下信息回答问题：\n{context}\n\n问题：{question}")
+
+    def post(self, shared, prep_res, exec_res):
+        shared["answers"] = exec_res
+        for (question, _), answer in zip(prep_res, exec_res):
+            print(f"  Q：{question}\n  A：{answer}")
+
+
 # ========== 构建并运行 ==========
 
 if __name__ == "__main__":
-    # 模拟知识库文档
-    documents = [
-        "PocketFlow 是一个仅 100 行代码的极简 LLM 应用框架。它零依赖、无厂商锁定。",
-        "PocketFlow 的核心只有两个概念：Node（节点）和 Flow（流程）。Node 负责做事，Flow 负责调度。",
-        "每个 Node 遵循三阶段模型：prep 从 shared 读取数据，exec 执行核心逻辑，post 将结果写回 shared。",
-        "PocketFlow 还提供 BatchNode 用于批量处理，AsyncNode 用于异步并发，支持多种设计模式。",
-    ]
+    # 模拟知识库文档（doc_id → 内容）
+    documents = {
+        "intro": "PocketFlow 是一个仅 100 行代码的极简 LLM 应用框架。它零依赖、无厂商锁定。",
+        "core": "PocketFlow 的核心只有两个概念：Node（节点）和 Flow（流程）。Node 负责做事，Flow 负责调度。",
+        "lifecycle": "每个 Node 遵循三阶段模型：prep 从 shared 读取数据，exec 执行核心逻辑，post 将结果写回 shared。",
+        "batch": "PocketFlow 还提供 BatchNode 用于批量处理，AsyncNode 用于异步并发，支持多种设计模式。",
+        "errors": "错误码 PF-4042 表示 post 返回的 action 没有对应的后继节点，Flow 会在此处结束并给出警告。",
+    }
+
+    # embedding 缓存：离线、在线阶段共用，SQLite 文件跨运行保留
+    cache = EmbeddingCache(path=CACHE_PATH)
 
     # --- 离线阶段：构建索引 ---
     print("=== 离线阶段：构建索引 ===\n")
+    shutil.rmtree(INDEX_DIR, ignore_errors=True)  # 从空索引开始演示
     chunk = ChunkNode()
-    embed = EmbedBatch()
+    embed = EmbedBatch(cache=cache)
     index = IndexNode()
     chunk >> embed >> index
     offline_flow = Flow(start=chunk)
-    shared = {"documents": documents}
-    offline_flow.run(shared)
+    offline_flow.run({"documents": documents, "index_dir": INDEX_DIR, "index_type": "ivf", "hybrid": True})
+
+    # --- 增量重建：修改一篇、删除一篇 ---
+    print("\n=== 离线阶段：增量重建 ===\n")
+    documents["batch"] = documents["batch"].replace("多种", "六大")
+    del documents["intro"]
+    offline_flow.run({"documents": documents, "index_dir": INDEX_DIR, "index_type": "ivf", "hybrid": True})
+
+    # --- 流式导入：直接从文件读取，新增一篇长文档 ---
+    print("\n=== 离线阶段：流式导入文件 ===\n")
+    with tempfile.TemporaryDirectory() as doc_dir:
+        documents["handbook"] = "".join(
+            f"第 {i} 条：Flow 沿 post 返回的 action 寻找下一个节点。" for i in range(1, 21)
+        )
+        files = {}
+        for doc_id, text in documents.items():
+            files[doc_id] = os.path.join(doc_dir, f"{doc_id}.txt")
+            with open(files[doc_id], "w", encoding="utf-8") as f:
+                f.write(text)
+
+        stream = StreamChunkNode()
+        stream_embed = EmbedBatch(cache=cache)
+        stream_index = IndexNode()
+        report = IngestReportNode()
+        stream >> stream_embed >> stream_index
+        stream_index - "next" >> stream  # 还有剩余 chunk，继续取下一批
+        stream_index - "done" >> report
+        stream_flow = Flow(start=stream)
+        stream_flow.run({
+            "files": files, "index_dir": INDEX_DIR, "index_type": "int8", "rescore_k": 10, "hybrid": True,
+            "chunk_size": 50, "chunk_overlap": 10, "stream_batch_size": 8,
+        })
 
     # --- 在线阶段：检索回答 ---
+    # 全新的 shared，只知道索引目录，模拟独立的服务进程
     print("\n=== 在线阶段：检索回答 ===\n")
-    shared["question"] = "PocketFlow 的核心概念是什么？"
-    retrieve = RetrieveNode()
+    shared = {"index_dir": INDEX_DIR}
+    retrieve = RetrieveNode(cache=cache)
     generate = GenerateNode()
     retrieve >> generate
     online_flow = Flow(start=retrieve)
-    online_flow.run(shared)
+    for question in ["PocketFlow 的核心概念是什么？", "PocketFlow 的核心概念是什么？"]:  # 第二次命中缓存
+        shared["question"] = question
+        online_flow.run(shared)
+
+    # --- 在线阶段：批量检索 ---
+    print("\n=== 在线阶段：批量检索 ===\n")
+    batch_retrieve = BatchRetrieveNode(batch_size=2, cache=cache)
+    batch_generate = BatchGenerateNode()
+    batch_retrieve >> batch_generate
+    burst_flow = Flow(start=batch_retrieve)
+    burst_flow.run({
+        "index": shared["index"],
+        "bm25": shared["bm25"],
+        "questions": ["什么是 Node？", "BatchNode 有什么用？", "PocketFlow 有多少行代码？", "PF-4042 是什么错误？"],
+    })
+
+    # --- 边界情况：空知识库（内存索引） ---
+    print("\n=== 边界情况：空知识库 ===\n")
+    empty_chunk = ChunkNode()
+    empty_chunk >> EmbedBatch() >> IndexNode()
+    empty = {"documents": {}}
+    Flow(start=empty_chunk).run(empty)
+    empty["question"] = "PocketFlow 的核心概念是什么？"
+    Flow(start=RetrieveNode()).run(empty)
+    assert len(empty["index"]) == 0 and empty["context"] == ""
+
+    stats = cache.stats()
+    print(f"\n[Cache] 命中 {stats['hits']} 次（磁盘层 {stats['disk_hits']} 次），"
+          f"未命中 {stats['misses']} 次，命中率 {stats['hit_rate']:.0%}")
+    cache.close()
@@ -1,2 +1,2 @@
-from .call_llm import call_llm
+from .call_llm import call_llm, call_llm_async
 from .search_web import search_web
@@ -2,15 +2,35 @@
 LLM 调用工具
 
 默认使用模拟实现，方便无 API 密钥时直接运行。
-如需接入真实 LLM，取消注释下方的 OpenAI 实现即可。
+设置环境变量后改为调用 OpenAI 兼容接口：
+  OPENAI_API_KEY   API 密钥（只设置它时使用 https://api.openai.com/v1）
+  LLM_BASE_URL     接口地址，如本地替身服务 http://127.0.0.1:8000/v1（python -m utils.mock_llm_server）
+  OPENAI_MODEL     模型名，默认 gpt-4o-mini
+  LLM_TIMEOUT      等待响应的秒数，默认 60
+
+整个进程共用一个带连接池的客户端，连接在多次调用之间复用；
+AsyncNode 中使用 call_llm_async，它不会阻塞事件循环。
+
+设置 LLM_CACHE_PATH 后启用 SQLite 响应缓存，接口地址、模型、参数和 prompt 都相同时直接返回上次的回复：
+  LLM_CACHE_PATH   缓存文件路径，多个进程可以共用
+  LLM_CACHE_TTL    缓存有效期（秒），默认不过期
+  LLM_CACHE_MAX_MB 缓存总大小上限，默认 64
 """
 
+import asyncio
+import functools
 import os
 
+if __package__:
+    from .llm_client import LLMClient, AsyncLLMClient
+    from .response_cache import ResponseCache
+else:  # python utils/call_llm.py 直接运行
+    from llm_client import LLMClient, AsyncLLMClient
+    from response_cache import ResponseCache
 
-def call_llm(prompt: str) -> str:
-    """调用 LLM API（当前为模拟实现）"""
-    # ---------- 模拟实现 ----------
+
+def mock_reply(prompt: str) -> str:
+    """模拟的 LLM 回复（本地替身服务也返回同样的内容）"""
     if "SEARCH" in prompt.upper() or "搜索" in prompt:
         if "已有信息" in prompt and len(prompt) > 200:
             return "ANSWER"
@@ -19,15 +39,83 @@ def call_llm(prompt: str) -> str:
         return "PocketFlow 是一个 100 行代码的极简 LLM 框架，支持多种设计模式。"
     return f"模拟回复：{prompt[:50]}..."
 
-    # ---------- 真实 OpenAI 实现（取消注释即可使用） ----------
-    # from openai import OpenAI
-    #
-    # client = OpenAI(api_key=os.getenv("OPENAI_API_KEY", ""))
-    # r = client.chat.completions.create(
-    #     model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-    #     messages=[{"role": "user", "content": prompt}],
-    # )
-    # return r.choices[0].message.content
+
+def _client_config():
+    """环境变量中的接口配置；没有配置时返回 None，使用模拟实现"""
+    base_url = os.getenv("LLM_BASE_URL")
+    api_key = os.getenv("OPENAI_API_KEY", "")
+    if not base_url and not api_key:
+        return None
+    return {
+        "base_url": base_url or "https://api.openai.com/v1",
+        "api_key": api_key,
+        "model": os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+        "timeout": float(os.getenv("LLM_TIMEOUT", "60")),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def get_client():
+    """进程内共用的同步客户端（未配置接口时为 None）"""
+    config = _client_config()
+    return LLMClient(**config) if config else None
+
+
+@functools.lru_cache(maxsize=None)
+def get_async_client():
+    """进程内共用的异步客户端（未配置接口时为 None）"""
+    config = _client_config()
+    return AsyncLLMClient(**config) if config else None
+
+
+@functools.lru_cache(maxsize=None)
+def get_cache():
+    """进程内共用的响应缓存（未设置 LLM_CACHE_PATH 时为 None），cache.stats 查看命中率"""
+    path = os.getenv("LLM_CACHE_PATH")
+    if not path:
+        return None
+    ttl = os.getenv("LLM_CACHE_TTL")
+    max_mb = float(os.getenv("LLM_CACHE_MAX_MB", "64"))
+    return ResponseCache(path, ttl=float(ttl) if ttl else None, max_bytes=int(max_mb * (1 << 20)))
+
+
+def _cache_key(cache, prompt: str, params: dict) -> bytes:
+    # 接口地址也计入键：同名模型在不同服务上的回复不能互相命中
+    config = _client_config()
+    if config is None:
+        return cache.key("mock", {"base_url": None, **params}, prompt)
+    return cache.key(config["model"], {"base_url": config["base_url"], **params}, prompt)
+
+
+def call_llm(prompt: str, **params) -> str:
+    """调用 LLM（未配置接口时为模拟实现），params（temperature 等）原样放进请求体"""
+    cache = get_cache()
+    if cache is not None:
+        key = _cache_key(cache, prompt, params)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    client = get_client()
+    response = mock_reply(prompt) if client is None else client.complete(prompt, **params)
+    if cache is not None:
+        cache.put(key, response)
+    return response
+
+
+async def call_llm_async(prompt: str, **params) -> str:
+    """call_llm 的异步版本，供 AsyncNode 的 exec_async 使用"""
+    cache = get_cache()
+    if cache is not None:
+        key = _cache_key(cache, prompt, params)
+        # SQLite 读写可能等待其他进程的写锁，放到线程里执行，不阻塞事件循环
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            return cached
+    client = get_async_client()
+    response = mock_reply(prompt) if client is None else await client.complete(prompt, **params)
+    if cache is not None:
+        await asyncio.to_thread(cache.put, key, response)
+    return response
 
 
 if __name__ == "__main__":
@@ -0,0 +1,227 @@
+"""
+OpenAI 兼容接口的连接池客户端
+
+每次调用都新建 OpenAI() 客户端，就要重新做一次 TCP（和 TLS）握手；智能体一轮要调用好几次 LLM，
+握手的往返时间会叠加到每一次调用上。这里的客户端只依赖标准库：
+- LLMClient：同步版本，keep-alive 连接放回池中复用，可以被多个线程共用
+- AsyncLLMClient：异步版本，给 AsyncNode 使用，每个事件循环一个连接池
+- connect_timeout / timeout 分别限制建立连接和等待响应的时间
+- 复用的连接被服务端关闭时自动换一条新连接重发一次
+- fork 出的子进程不会复用父进程的连接（连接池按进程 id 区分）
+- 连接关闭 Nagle 算法（TCP_NODELAY），小请求不会因为延迟 ACK 多等几十毫秒
+
+connections_opened 记录新建连接的次数，用来确认连接确实被复用。
+"""
+
+import asyncio
+import http.client
+import json
+import os
+import socket
+import ssl
+import threading
+import weakref
+from urllib.parse import urlsplit
+
+
+class LLMError(Exception):
+    """服务端返回非 2xx 状态码"""
+
+    def __init__(self, status: int, body: bytes):
+        super().__init__(f"HTTP {status}: {body[:200].decode('utf-8', 'replace')}")
+        self.status = status
+        self.body = body
+
+
+class _BaseClient:
+    def __init__(self, base_url: str, api_key: str = "", model: str = "gpt-4o-mini",
+                 timeout: float = 60.0, connect_timeout: float = 5.0, pool_size: int = 8):
+        url = urlsplit(base_url.rstrip("/"))
+        self.https = url.scheme == "https"
+        self.host = url.hostname
+        self.port = url.port or (443 if self.https else 80)
+        self.path = url.path + "/chat/completions"
+        self.model = model
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.pool_size = pool_size
+        self.connections_opened = 0
+        self._headers = {"Content-Type": "application/json", "Host": url.netloc, "Connection": "keep-alive"}
+        if api_key:
+            self._headers["Authorization"] = f"Bearer {api_key}"
+
+    def _body(self, messages, params) -> bytes:
+        return json.dumps({"model": self.model, "messages": messages, **params}, ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def _content(status: int, data: bytes) -> str:
+        if status >= 300:
+            raise LLMError(status, data)
+        return json.loads(data)["choices"][0]["message"]["content"]
+
+
+class LLMClient(_BaseClient):
+    """同步客户端：chat(messages) / complete(prompt) 返回回复文本
+
+    Args:
+        base_url: 如 https://api.openai.com/v1 或 http://127.0.0.1:8000/v1
+        timeout: 等待响应的秒数
+        connect_timeout: 建立连接的秒数
+        pool_size: 池中最多保留的空闲连接数（并发超过时临时新建，用完关闭）
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _acquire(self):
+        """返回 (连接, 是否为复用的连接)"""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._idle, self._pid = [], os.getpid()
+            if self._idle:
+                return self._idle.pop(), True
+            self.connections_opened += 1
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        conn = cls(self.host, self.port, timeout=self.connect_timeout)
+        conn.connect()
+        conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn.sock.settimeout(self.timeout)
+        return conn, False
+
+    def _release(self, conn):
+        with self._lock:
+            if self._pid == os.getpid() and len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def chat(self, messages: list, **params) -> str:
+        body = self._body(messages, params)
+        for attempt in range(2):
+            conn, reused = self._acquire()
+            try:
+                conn.request("POST", self.path, body, self._headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if reused and attempt == 0:
+                    continue  # 空闲连接已被服务端关闭，换新连接重发
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            return self._content(resp.status, data)
+
+    def complete(self, prompt: str, **params) -> str:
+        return self.chat([{"role": "user", "content": prompt}], **params)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class AsyncLLMClient(_BaseClient):
+    """异步客户端：await chat(messages) / await complete(prompt)
+
+    连接属于创建它的事件循环，所以每个事件循环各有一个连接池；参数与 LLMClient 相同。
+    同时进行的请求数不受 pool_size 限制，需要限流时配合 flow_utils.RateLimiter 使用。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pools = weakref.WeakKeyDictionary()  # 事件循环 → 空闲的 (reader, writer)
+        self._ssl = ssl.create_default_context() if self.https else None
+
+    def _pool(self) -> list:
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            pool = self._pools[loop] = []
+        return pool
+
+    async def _acquire(self):
+        pool = self._pool()
+        while pool:
+            reader, writer = pool.pop()
+            if not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        self.connections_opened += 1
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self._ssl), self.connect_timeout)
+        writer.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return reader, writer, False
+
+    def _release(self, reader, writer):
+        pool = self._pool()
+        if len(pool) < self.pool_size:
+            pool.append((reader, writer))
+        else:
+            writer.close()
+
+    def _request(self, body: bytes) -> bytes:
+        lines = [f"POST {self.path} HTTP/1.1", f"Content-Length: {len(body)}"]
+        lines += [f"{k}: {v}" for k, v in self._headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+    @staticmethod
+    async def _read_response(reader) -> tuple:
+        """读取一个 HTTP/1.1 响应，返回 (状态码, 小写的响应头, 响应体)"""
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by server")
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while size := int((await reader.readline()).split(b";")[0], 16):
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            await reader.readline()  # 最后一个空块之后的 CRLF（不支持 trailer）
+            return status, headers, b"".join(chunks)
+        return status, headers, await reader.readexactly(int(headers.get("content-length", 0)))
+
+    async def chat(self, messages: list, **params) -> str:
+        request = self._request(self._body(messages, params))
+        for attempt in range(2):
+            reader, writer, reused = await self._acquire()
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, headers, data = await asyncio.wait_for(self._read_response(reader), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            if headers.get("connection", "").lower() == "close":
+                writer.close()
+            else:
+                self._release(reader, writer)
+            return self._content(status, data)
+
+    async def complete(self, prompt: str, **params) -> str:
+        return await self.chat([{"role": "user", "content": prompt}], **params)
+
+    async def aclose(self):
+        """关闭当前事件循环中的空闲连接"""
+        pool = self._pool()
+        while pool:
+            _, writer = pool.pop()
+            writer.close()
@@ -0,0 +1,135 @@
+"""
+本地 OpenAI 兼容替身服务
+
+实现 POST /v1/chat/completions，返回与 call_llm 模拟实现相同的回复，响应格式与 OpenAI 一致：
+- latency：每个请求在返回前等待的秒数（jitter 为额外的随机等待上限），模拟模型推理耗时
+- connect_latency：每个新连接开始处理前等待的秒数，模拟远程服务的 TCP + TLS 握手往返
+- 支持 HTTP/1.1 keep-alive；connections / requests 统计服务端看到的连接数和请求数，
+  可以据此确认客户端是否复用了连接
+- 每个连接一个线程，和真实服务一样可以并发处理请求
+
+命令行运行（在 12_agentic_coding 目录下）：
+  python -m utils.mock_llm_server --port 8000 --latency 0.2
+  LLM_BASE_URL=http://127.0.0.1:8000/v1 python main.py
+
+代码中使用：
+  with MockLLMServer(latency=0.05) as server:
+      client = LLMClient(server.url)
+"""
+
+import argparse
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+if __package__:
+    from .call_llm import mock_reply
+else:
+    from call_llm import mock_reply
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 默认的 HTTP/1.0 每个请求后都会断开连接
+
+    def setup(self):
+        super().setup()
+        # 响应头和响应体分两次写出，不关 Nagle 算法时会和客户端的延迟 ACK 叠加出约 40ms 的停顿
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.count("connections")
+        time.sleep(self.server.connect_latency)
+
+    def do_POST(self):
+        if not self.path.endswith("/chat/completions"):
+            self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        self.server.count("requests")
+        time.sleep(self.server.latency + random.uniform(0, self.server.jitter))
+        prompt = next((m["content"] for m in reversed(request.get("messages", [])) if m.get("role") == "user"), "")
+        content = mock_reply(prompt)
+        self._send(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", ""),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt), "completion_tokens": len(content),
+                      "total_tokens": len(prompt) + len(content)},
+        })
+
+    def _send(self, status: int, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 不逐条打印请求日志
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    """在后台线程中运行的替身服务，port=0 时自动选择空闲端口"""
+
+    daemon_threads = True
+    request_queue_size = 256  # 不复用连接的客户端会同时发起大量新连接
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 connect_latency: float = 0.0):
+        super().__init__((host, port), _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.connect_latency = connect_latency
+        self.connections = 0
+        self.requests = 0
+        self._stats_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def count(self, field: str):
+        with self._stats_lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.connections = self.requests = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.2, help="每个请求的固定耗时（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="额外随机耗时的上限（秒）")
+    parser.add_argument("--connect-latency", type=float, default=0.0, help="每个新连接的握手耗时（秒）")
+    args = parser.parse_args()
+    server = MockLLMServer(args.host, args.port, args.latency, args.jitter, args.connect_latency)
+    print(f"OpenAI 兼容替身服务：{server.url}（latency={args.latency}s）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,176 @@
+"""
+LLM 响应缓存（精确匹配，SQLite 持久化）
+
+DecideAction、Answer 经常发出和几分钟前一字不差的 prompt，每次仍要等模型重新生成。
+ResponseCache 按 (模型, 参数, prompt) 的哈希缓存回复文本：
+- SQLite 文件 + WAL 模式：读写互不阻塞，多个 worker 进程可以同时使用同一个缓存文件
+- 每个进程、每个线程各自打开连接（fork 之后不会沿用父进程的连接），写入用 BEGIN IMMEDIATE 串行化
+- ttl：条目写入 ttl 秒后过期，过期的条目不会命中，在淘汰时删除
+- max_bytes：缓存总大小上限，超出时先删过期条目，再按最久未访问的顺序删到上限的九成
+
+stats 与 flow_utils.MemoStats 的接口相同（hits / misses / hit_rate / as_dict），
+可以和节点的统计一起交给 memo_stats(flow, llm_cache=cache.stats) 汇总；计数只统计当前进程。
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key BLOB PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta (name, value) VALUES ('total_size', 0);
+"""
+
+
+class CacheStats:
+    """当前进程的命中统计"""
+
+    def __init__(self):
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+
+    def count(self, field: str):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate}
+
+
+class ResponseCache:
+    """SQLite 上的 LLM 响应缓存
+
+    Args:
+        path: SQLite 文件路径
+        ttl: 条目的有效期（秒），None 表示不过期
+        max_bytes: 缓存内容的总大小上限（按回复文本的 UTF-8 字节数计）
+    """
+
+    def __init__(self, path: str, ttl: float = None, max_bytes: int = 64 << 20, clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self.evictions = 0
+        self._clock = clock
+        self._local = threading.local()
+        self._db()
+
+    def _db(self) -> sqlite3.Connection:
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            # isolation_level=None：不让 sqlite3 模块隐式开启事务，写入时显式 BEGIN IMMEDIATE
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")  # WAL 下仍保证一致性，只是断电时可能丢最后几次写入
+            db.executescript(_SCHEMA)
+            local.db, local.pid = db, os.getpid()
+        return local.db
+
+    @staticmethod
+    def key(model: str, params: dict, prompt: str) -> bytes:
+        """缓存键；params 要包含接口地址和所有影响回复的请求参数（见 call_llm._cache_key）"""
+        data = json.dumps([model, params, prompt], sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(data.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, key: bytes):
+        """返回缓存的回复，未命中或已过期时返回 None"""
+        db, now = self._db(), self._clock()
+        row = db.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or (self.ttl is not None and row[1] + self.ttl <= now):
+            self.stats.count("misses")
+            return None
+        db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self.stats.count("hits")
+        return row[0]
+
+    def put(self, key: bytes, response: str):
+        db, now = self._db(), self._clock()
+        size = len(response.encode("utf-8"))
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            old = db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            db.execute("INSERT OR REPLACE INTO responses (key, response, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                       (key, response, size, now, now))
+            db.execute("UPDATE meta SET value = value + ? WHERE name = 'total_size'", (size - (old[0] if old else 0),))
+            if self._total_size(db) > self.max_bytes:
+                self._evict(db, now)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _total_size(db) -> int:
+        return db.execute("SELECT value FROM meta WHERE name = 'total_size'").fetchone()[0]
+
+    def _evict(self, db, now: float):
+        """在写事务中调用：删过期条目，再按最久未访问的顺序删到 max_bytes 的九成"""
+        freed, removed = self._delete_expired(db, now)
+        total = self._total_size(db) - freed
+        target = self.max_bytes * 0.9  # 留出余量，避免之后每次写入都触发淘汰
+        while total > target:
+            rows = db.execute("SELECT key, size FROM responses ORDER BY accessed LIMIT 256").fetchall()
+            if not rows:
+                break
+            victims = []
+            for key, size in rows:
+                if total <= target:
+                    break
+                victims.append((key,))
+                total -= size
+            db.executemany("DELETE FROM responses WHERE key = ?", victims)
+            removed += len(victims)
+        db.execute("UPDATE meta SET value = ? WHERE name = 'total_size'", (total,))
+        self.evictions += removed
+
+    def _delete_expired(self, db, now: float) -> tuple:
+        """删除过期条目，返回 (释放的字节数, 条目数)；不更新 total_size"""
+        if self.ttl is None:
+            return 0, 0
+        cutoff = now - self.ttl
+        freed, count = db.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM responses WHERE created <= ?",
+                                  (cutoff,)).fetchone()
+        db.execute("DELETE FROM responses WHERE created <= ?", (cutoff,))
+        return freed, count
+
+    def purge_expired(self):
+        """删除全部过期条目"""
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            freed, count = self._delete_expired(db, self._clock())
+            db.execute("UPDATE meta SET value = value - ? WHERE name = 'total_size'", (freed,))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        self.evictions += count
+
+    def size_bytes(self) -> int:
+        return self._total_size(self._db())
+
+    def __len__(self):
+        return self._db().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        """关闭当前线程的连接"""
+        if getattr(self._local, "pid", None) == os.getpid():
+            self._local.db.close()
+        self._local.pid = None
@@ -0,0 +1,71 @@
+"""
+批量 embedding 基准测试
+
+用案例 03 的 EmbedBatch 节点对比不同微批次大小的吞吐：
+- batch_size=1 相当于逐条调用 embedding 服务
+- --call-ms 模拟每次调用的固定开销（网络往返、排队等），真实服务中这部分占大头
+
+运行：
+  python benchmarks/bench_embed.py
+  python benchmarks/bench_embed.py --chunks 100000 --call-ms 20
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import random
+import sys
+import time
+
+EXAMPLES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, EXAMPLES_DIR)
+
+
+def load_example(filename: str):
+    """按文件名导入示例脚本（文件名以数字开头，无法直接 import）"""
+    name = "example_" + os.path.splitext(filename)[0]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(EXAMPLES_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_chunks(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    alphabet = "PocketFlow 节点流程批量并发检索增强生成。abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choices(alphabet, k=rng.randint(40, 60))) for _ in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=20_000, help="chunk 数量")
+    parser.add_argument("--call-ms", type=float, default=0.0, help="每次 embedding 调用的固定开销（毫秒）")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 64, 256, 1024])
+    args = parser.parse_args()
+
+    rag = load_example("03_rag.py")
+
+    class TimedEmbedBatch(rag.EmbedBatch):
+        def exec(self, texts):
+            if args.call_ms:
+                time.sleep(args.call_ms / 1000)
+            return super().exec(texts)
+
+    chunks = make_chunks(args.chunks)
+    print(f"=== 批量 embedding 基准：{args.chunks:,} 个 chunk，每次调用开销 {args.call_ms} ms ===\n")
+    print(f"{'batch_size':>10}{'调用次数':>10}{'耗时(s)':>10}{'chunks/s':>12}")
+    for batch_size in args.batch_sizes:
+        node = TimedEmbedBatch(batch_size=batch_size)
+        shared = {"chunks": chunks}
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            node.run(shared)
+        elapsed = time.perf_counter() - start
+        calls = -(-len(chunks) // batch_size)
+        print(f"{batch_size:>10}{calls:>10}{elapsed:>10.2f}{len(chunks) / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+IVF 近似检索基准测试
+
+对比 IVFIndex 与精确检索（VectorIndex 暴力扫描）：
+- recall@k：IVF 返回的 top-k 中有多少落在精确 top-k 里
+- QPS：单线程每秒查询数
+
+数据为合成的聚簇向量（模拟真实 embedding 的簇结构），不需要任何模型。
+
+运行：
+  python benchmarks/bench_ivf.py                  # 10 万条
+  python benchmarks/bench_ivf.py --n 1000000      # 100 万条
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag_utils import IVFIndex, VectorIndex, normalize_rows  # noqa: E402
+
+
+def make_dataset(n: int, dim: int, n_queries: int, seed: int = 0):
+    """生成 n 条聚簇向量和 n_queries 条查询向量"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(16, n // 1000), dim)).astype(np.float32)
+    data = centers[rng.integers(len(centers), size=n)]
+    data += 0.5 * rng.standard_normal((n, dim)).astype(np.float32)
+    queries = centers[rng.integers(len(centers), size=n_queries)]
+    queries += 0.5 * rng.standard_normal((n_queries, dim)).astype(np.float32)
+    return normalize_rows(data), queries
+
+
+def run_queries(index, queries, k: int, **kwargs):
+    """逐条查询，返回 (结果行号列表, QPS)"""
+    start = time.perf_counter()
+    results = [index.search_ids(q, k, **kwargs)[0] for q in queries]
+    return results, len(queries) / (time.perf_counter() - start)
+
+
+def recall_at_k(approx, exact) -> float:
+    hits = sum(len(np.intersect1d(a, e)) for a, e in zip(approx, exact))
+    return hits / sum(len(e) for e in exact)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=100_000, help="向量条数")
+    parser.add_argument("--dim", type=int, default=64, help="向量维度")
+    parser.add_argument("--queries", type=int, default=200, help="查询条数")
+    parser.add_argument("--k", type=int, default=10, help="top-k")
+    parser.add_argument("--nlist", type=int, default=None, help="簇数量，默认 4·sqrt(N)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    args = parser.parse_args()
+
+    print(f"=== IVF 基准：N={args.n:,}，dim={args.dim}，k={args.k} ===\n")
+    data, queries = make_dataset(args.n, args.dim, args.queries)
+    flat = VectorIndex.from_normalized(range(args.n), data)
+
+    start = time.perf_counter()
+    ivf = IVFIndex.build(flat, nlist=args.nlist)
+    print(f"IVF 构建耗时：{time.perf_counter() - start:.2f} 秒（nlist={ivf.nlist}）\n")
+
+    exact, flat_qps = run_queries(flat, queries, args.k)
+    print(f"{'方法':<14}{'recall@' + str(args.k):>12}{'QPS':>12}{'加速比':>10}")
+    print(f"{'精确检索':<14}{1.0:>12.3f}{flat_qps:>12.0f}{1.0:>10.1f}x")
+    for nprobe in args.nprobe:
+        if nprobe > ivf.nlist:
+            break
+        approx, qps = run_queries(ivf, queries, args.k, nprobe=nprobe)
+        label = f"IVF nprobe={nprobe}"
+        print(f"{label:<14}{recall_at_k(approx, exact):>12.3f}{qps:>12.0f}{qps / flat_qps:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
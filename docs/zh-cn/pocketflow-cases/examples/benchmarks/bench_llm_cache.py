@@ -0,0 +1,89 @@
+"""
+LLM 响应缓存基准测试
+
+启动案例 12 的本地替身服务，多个 worker 进程共用同一个 SQLite 响应缓存跑智能体 Flow：
+- 第一轮：缓存为空，重复的问题在不同进程之间也能命中
+- 第二轮：全部 prompt 都已缓存，不再请求服务
+- 最后在当前进程里再跑一遍，用 flow_utils.memo_stats 把缓存命中率和节点统计列在一起
+
+"服务请求数"是替身服务实际收到的请求数。
+
+运行：
+  python benchmarks/bench_llm_cache.py
+  python benchmarks/bench_llm_cache.py --questions 200 --distinct 20 --workers 8 --latency-ms 100
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+EXAMPLES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INTRO_EXAMPLES_DIR = os.path.join(EXAMPLES_DIR, "..", "..", "pocketflow-intro", "examples")
+sys.path[:0] = [INTRO_EXAMPLES_DIR, os.path.join(EXAMPLES_DIR, "12_agentic_coding")]
+
+from flow_utils import memo_stats
+from flow import create_agent_flow
+from utils.call_llm import get_cache
+from utils.mock_llm_server import MockLLMServer
+
+
+def run_questions(questions: list) -> dict:
+    """在 worker 进程中依次回答 questions，返回本进程的缓存统计"""
+    flow = create_agent_flow()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for question in questions:
+            flow.run({"question": question})
+    return get_cache().stats.as_dict()
+
+
+def run_round(questions: list, workers: int) -> tuple:
+    parts = [questions[i::workers] for i in range(workers)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        stats = list(pool.map(run_questions, parts))
+    hits, misses = sum(s["hits"] for s in stats), sum(s["misses"] for s in stats)
+    return time.perf_counter() - start, hits, misses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=60, help="每轮的问题数")
+    parser.add_argument("--distinct", type=int, default=10, help="其中不同问题的个数")
+    parser.add_argument("--workers", type=int, default=4, help="worker 进程数")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="模拟的模型推理耗时（毫秒）")
+    parser.add_argument("--ttl", type=float, default=None, help="缓存有效期（秒）")
+    args = parser.parse_args()
+
+    questions = [f"PocketFlow 的设计模式 #{i % args.distinct}？" for i in range(args.questions)]
+    with tempfile.TemporaryDirectory() as tmp, MockLLMServer(latency=args.latency_ms / 1000) as server:
+        # worker 进程继承这些环境变量，各自打开同一个缓存文件
+        os.environ["LLM_BASE_URL"] = server.url
+        os.environ["LLM_CACHE_PATH"] = os.path.join(tmp, "llm_cache.sqlite3")
+        if args.ttl is not None:
+            os.environ["LLM_CACHE_TTL"] = str(args.ttl)
+
+        print(f"{args.questions} 个问题（{args.distinct} 个不同），{args.workers} 个进程，"
+              f"推理耗时 {args.latency_ms}ms\n")
+        print(f"{'':<8}{'耗时 (s)':>10}{'命中':>8}{'未命中':>8}{'服务请求数':>12}")
+        for name in ["第一轮", "第二轮"]:
+            server.reset_stats()
+            elapsed, hits, misses = run_round(questions, args.workers)
+            print(f"{name:<8}{elapsed:>10.2f}{hits:>8}{misses:>8}{server.requests:>12}")
+
+        cache = get_cache()
+        print(f"\n缓存条目 {len(cache)}，共 {cache.size_bytes()} 字节")
+
+        flow = create_agent_flow()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for question in questions[:args.distinct]:
+                flow.run({"question": question})
+        print("\n当前进程再跑一遍：", memo_stats(flow, llm_cache=cache.stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+LLM 客户端连接复用基准测试
+
+启动案例 12 的本地 OpenAI 兼容替身服务，对比几种调用方式的吞吐：
+- 每次新建连接：相当于每次调用都创建一个新的 OpenAI() 客户端
+- 连接池：LLMClient 复用 keep-alive 连接，顺序调用 / 多线程并发
+- 异步：AsyncLLMClient 在一个事件循环里并发，连接同样复用
+
+--connect-ms 模拟远程服务每个新连接的握手往返（本机回环上建立连接几乎没有开销），
+--latency-ms 模拟模型推理耗时。"连接数"是服务端实际接受的 TCP 连接数。
+
+运行：
+  python benchmarks/bench_llm_client.py
+  python benchmarks/bench_llm_client.py --requests 2000 --concurrency 64 --connect-ms 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+EXAMPLES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(EXAMPLES_DIR, "12_agentic_coding"))
+
+from utils.llm_client import LLMClient, AsyncLLMClient
+from utils.mock_llm_server import MockLLMServer
+
+PROMPT = "请回答：PocketFlow 有哪些设计模式？"
+
+
+def run_sync(client, n: int, concurrency: int):
+    if concurrency == 1:
+        for _ in range(n):
+            client.complete(PROMPT)
+        return
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(lambda _: client.complete(PROMPT), range(n)))
+
+
+def run_async(client, n: int, concurrency: int):
+    async def main():
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with sem:
+                return await client.complete(PROMPT)
+        await asyncio.gather(*(one() for _ in range(n)))
+        await client.aclose()
+    asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400, help="每种方式的请求数")
+    parser.add_argument("--concurrency", type=int, default=16, help="并发方式的并发数")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="模拟的模型推理耗时（毫秒）")
+    parser.add_argument("--connect-ms", type=float, default=20.0, help="模拟的每个新连接握手耗时（毫秒）")
+    args = parser.parse_args()
+
+    n, c = args.requests, args.concurrency
+    print(f"请求数 {n}，并发 {c}，推理耗时 {args.latency_ms}ms，握手耗时 {args.connect_ms}ms\n")
+    print(f"{'方式':<20}{'耗时 (s)':>10}{'吞吐 (req/s)':>15}{'连接数':>8}")
+    with MockLLMServer(latency=args.latency_ms / 1000, connect_latency=args.connect_ms / 1000) as server:
+        cases = [
+            ("每次新建连接", lambda: run_sync(LLMClient(server.url, pool_size=0), n, 1)),
+            ("连接池", lambda: run_sync(LLMClient(server.url), n, 1)),
+            (f"每次新建连接 ×{c}", lambda: run_sync(LLMClient(server.url, pool_size=0), n, c)),
+            (f"连接池 ×{c} 线程", lambda: run_sync(LLMClient(server.url, pool_size=c), n, c)),
+            (f"异步连接池 ×{c}", lambda: run_async(AsyncLLMClient(server.url, pool_size=c), n, c)),
+        ]
+        for name, run in cases:
+            server.reset_stats()
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            assert server.requests == n
+            print(f"{name:<20}{elapsed:>10.2f}{n / elapsed:>15.0f}{server.connections:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Flow 追踪
+
+用 flow_utils.Tracer（位于入门教程示例目录）给案例流程加埋点，输出关键路径并导出 Chrome trace：
+- 案例 12：DecideAction ↔ Search → Answer 循环，看每一轮决策、搜索各花多少时间
+- 案例 07：AsyncParallelBatchNode 并发处理，关键路径只保留最慢的那个 item
+
+导出的 JSON 默认写到 traces/ 目录（已加入 .gitignore），拖进 https://ui.perfetto.dev 即可查看时间轴。
+
+运行：
+  python benchmarks/trace_flows.py
+  python benchmarks/trace_flows.py --out /tmp/traces
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+
+EXAMPLES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INTRO_EXAMPLES_DIR = os.path.join(EXAMPLES_DIR, "..", "..", "pocketflow-intro", "examples")
+sys.path[:0] = [INTRO_EXAMPLES_DIR, os.path.join(EXAMPLES_DIR, "12_agentic_coding")]
+
+from pocketflow import AsyncFlow
+from flow_utils import Tracer, load_example
+
+
+def trace_agent(out_dir: str):
+    from flow import create_agent_flow
+
+    flow = create_agent_flow(safe_mode=True)
+    tracer = Tracer().attach(flow)
+    with contextlib.redirect_stdout(io.StringIO()):
+        flow.run({"question": "PocketFlow 有哪些设计模式？"})
+    print("=== 案例 12：智能体编程 ===\n")
+    tracer.print_summary()
+    tracer.save_chrome_trace(os.path.join(out_dir, "trace_agentic_coding.json"))
+
+
+def trace_parallel(out_dir: str):
+    parallel = load_example("07_parallel_processing.py", EXAMPLES_DIR)
+    flow = AsyncFlow(start=parallel.ParallelProcess())
+    tracer = Tracer().attach(flow)
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(flow.run_async({"items": [f"任务_{i + 1}" for i in range(8)]}))
+    print("\n=== 案例 07：并行处理 ===\n")
+    tracer.print_summary()
+    tracer.save_chrome_trace(os.path.join(out_dir, "trace_parallel_processing.json"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default="traces", help="trace JSON 的输出目录")
+    args = parser.parse_args()
+    os.makedirs(args.out, exist_ok=True)
+
+    trace_agent(args.out)
+    trace_parallel(args.out)
+    print(f"\nChrome trace 已写入 {os.path.abspath(args.out)}，可在 https://ui.perfetto.dev 打开")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+from .vector_index import VectorIndex, normalize_rows, top_k_indices
+from .incremental import content_hash, iter_reindex, plan_reindex
+from .index_store import MappedChunks, save_index, load_index, load_manifest, update_index, compact_index
+from .ivf_index import IVFIndex, spherical_kmeans, save_ivf, load_ivf, remove_ivf
+from .streaming import file_hash, iter_file_text, iter_chunks, iter_file_reindex
+from .embedding import EMBED_DIM, EMBED_MODEL, estimate_tokens, micro_batches, mock_embed_texts
+from .embedding_cache import EmbeddingCache
+from .bm25 import BM25Index, tokenize, reciprocal_rank_fusion, hybrid_search, save_bm25, load_bm25, remove_bm25
+from .quantized_index import QuantizedIndex, quantize, save_quantized, load_quantized, remove_quantized
@@ -0,0 +1,145 @@
+"""
+BM25 倒排索引与混合检索
+
+向量检索擅长语义相近的问题，但对产品编号、人名这类"字面必须一致"的关键词不敏感。
+BM25 按词项精确匹配打分，正好互补：
+- 英文/数字按词切分（保留 PF-4042 这类带连字符的编号），中文按相邻二字切分
+- 倒排表用 CSR 结构存储：每个词项对应一段连续的 (行号, 词频)
+- reciprocal_rank_fusion 只看两路结果的名次做融合，不需要对齐两种分数的量纲
+"""
+
+import json
+import os
+import re
+from collections import Counter
+
+import numpy as np
+
+from .index_store import _map_array, _remove_files, _rows_fingerprint, _write_atomic
+from .vector_index import top_k_indices
+
+BM25_META_FILE = "bm25.json"
+BM25_OFFSETS_FILE = "bm25_offsets.i64"
+BM25_DOCS_FILE = "bm25_docs.i32"
+BM25_TFS_FILE = "bm25_tfs.i32"
+BM25_LENGTHS_FILE = "bm25_lengths.i32"
+BM25_FILES = (BM25_META_FILE, BM25_OFFSETS_FILE, BM25_DOCS_FILE, BM25_TFS_FILE, BM25_LENGTHS_FILE)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*|[一-鿿]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """英文、数字、编号整体作为一个词；连续汉字切成二字词（单字保留原样）"""
+    tokens = []
+    for match in _TOKEN_RE.findall(text.lower()):
+        if "一" <= match[0] <= "鿿" and len(match) > 1:
+            tokens.extend(match[i:i + 2] for i in range(len(match) - 1))
+        else:
+            tokens.append(match)
+    return tokens
+
+
+class BM25Index:
+    """BM25 倒排索引，行号与向量索引一一对应"""
+
+    def __init__(self, vocab: dict, offsets, docs, tfs, lengths, alive=None, k1: float = 1.5, b: float = 0.75):
+        self.vocab = vocab  # 词项 -> 倒排表编号
+        self.offsets = offsets  # 第 t 个词项的倒排表位于 docs/tfs[offsets[t]:offsets[t + 1]]
+        self.docs = docs
+        self.tfs = tfs
+        self.lengths = lengths  # 每行的词项总数
+        self.alive = alive
+        self.k1, self.b = k1, b
+        self.avgdl = float(np.mean(lengths)) if len(lengths) else 0.0
+
+    @classmethod
+    def build(cls, chunks, alive=None, k1: float = 1.5, b: float = 0.75) -> "BM25Index":
+        vocab, rows = {}, []
+        lengths = np.zeros(len(chunks), dtype=np.int32)
+        for doc, chunk in enumerate(chunks):
+            counts = Counter(tokenize(chunk))
+            lengths[doc] = sum(counts.values())
+            rows.extend((vocab.setdefault(term, len(vocab)), doc, tf) for term, tf in counts.items())
+        postings = np.array(rows, dtype=np.int64).reshape(-1, 3)
+        postings = postings[np.lexsort((postings[:, 1], postings[:, 0]))]
+        offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(postings[:, 0], minlength=len(vocab)), out=offsets[1:])
+        return cls(vocab, offsets, postings[:, 1].astype(np.int32), postings[:, 2].astype(np.int32),
+                   lengths, alive=alive, k1=k1, b=b)
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def search_ids(self, query: str, k: int = 3) -> tuple[np.ndarray, np.ndarray]:
+        """返回 BM25 分数最高的 k 个 (行号, 分数)，只包含至少命中一个词项的行"""
+        n = len(self)
+        scores = np.zeros(n, dtype=np.float32)
+        for term in set(tokenize(query)):
+            t = self.vocab.get(term)
+            if t is None:
+                continue
+            docs = self.docs[self.offsets[t]:self.offsets[t + 1]]
+            tfs = self.tfs[self.offsets[t]:self.offsets[t + 1]].astype(np.float32)
+            idf = np.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * self.lengths[docs] / self.avgdl)
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+        if self.alive is not None:
+            scores[~np.asarray(self.alive, dtype=bool)] = 0
+        ids = top_k_indices(scores, k)
+        ids = ids[scores[ids] > 0]
+        return ids, scores[ids]
+
+
+def reciprocal_rank_fusion(ranked_lists, k: int = 60) -> list[tuple[int, float]]:
+    """RRF：每路结果中排第 r 名贡献 1 / (k + r)，按总分从高到低返回 (行号, 分数)"""
+    fused = {}
+    for ranked in ranked_lists:
+        for rank, row in enumerate(ranked, start=1):
+            fused[int(row)] = fused.get(int(row), 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda x: x[1], reverse=True)
+
+
+def hybrid_search(index, bm25: BM25Index, query_text: str, query_vec, k: int = 3,
+                  fetch_k: int = None, rrf_k: int = 60) -> list[tuple[str, float]]:
+    """向量检索与 BM25 各取 fetch_k 个候选，用 RRF 融合后返回 top-k 的 (chunk, 融合分数)"""
+    fetch_k = fetch_k or 4 * k
+    vec_ids, _ = index.search_ids(query_vec, fetch_k)
+    bm25_ids, _ = bm25.search_ids(query_text, fetch_k)
+    fused = reciprocal_rank_fusion([vec_ids, bm25_ids], k=rrf_k)[:k]
+    return [(index.chunks[row], score) for row, score in fused]
+
+
+def save_bm25(bm25: BM25Index, path: str):
+    """把倒排表写到索引目录中，与向量索引放在一起"""
+    _write_atomic(os.path.join(path, BM25_OFFSETS_FILE), bm25.offsets.tobytes())
+    _write_atomic(os.path.join(path, BM25_DOCS_FILE), bm25.docs.tobytes())
+    _write_atomic(os.path.join(path, BM25_TFS_FILE), bm25.tfs.tobytes())
+    _write_atomic(os.path.join(path, BM25_LENGTHS_FILE), bm25.lengths.tobytes())
+    meta = {"count": len(bm25), "postings": len(bm25.docs), "k1": bm25.k1, "b": bm25.b,
+            "rows": _rows_fingerprint(path, len(bm25)), "vocab": bm25.vocab}
+    _write_atomic(os.path.join(path, BM25_META_FILE), json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+
+def load_bm25(path: str, base):
+    """memmap 打开倒排表；不存在或已过期（底层索引的行数或行内容变了）时返回 None"""
+    meta_path = os.path.join(path, BM25_META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta["count"] != len(base) or meta.get("rows") != _rows_fingerprint(path, meta["count"]):
+        return None
+    count, postings = meta["count"], meta["postings"]
+    return BM25Index(
+        meta["vocab"],
+        _map_array(os.path.join(path, BM25_OFFSETS_FILE), np.int64, (len(meta["vocab"]) + 1,)),
+        _map_array(os.path.join(path, BM25_DOCS_FILE), np.int32, (postings,)),
+        _map_array(os.path.join(path, BM25_TFS_FILE), np.int32, (postings,)),
+        _map_array(os.path.join(path, BM25_LENGTHS_FILE), np.int32, (count,)),
+        alive=base.alive, k1=meta["k1"], b=meta["b"],
+    )
+
+
+def remove_bm25(path: str):
+    """删除索引目录中的倒排表"""
+    _remove_files(path, BM25_FILES)
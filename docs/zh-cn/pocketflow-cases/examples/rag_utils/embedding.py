@@ -0,0 +1,54 @@
+"""
+批量 embedding
+
+真实的 embedding 服务一次请求处理几百条文本，平均到每条的成本远低于逐条调用。
+这里提供：
+- micro_batches：按条数和 token 预算把文本切成小批次
+- mock_embed_texts：向量化的模拟 embedding，一次计算整批文本
+"""
+
+import numpy as np
+
+from .vector_index import normalize_rows
+
+EMBED_DIM = 8
+EMBED_MODEL = "mock-embedding-v1"
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估计 token 数（中文约 1 字 1 token）"""
+    return max(1, len(text))
+
+
+def micro_batches(texts, batch_size: int = 64, max_tokens: int = None, count_tokens=estimate_tokens) -> list[list]:
+    """把 texts 切成若干批，每批不超过 batch_size 条、max_tokens 个 token
+
+    单条超过 max_tokens 的文本独占一批，交给 embedding 服务自行截断。
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size 必须为正数，实际为 {batch_size}")
+    batches, batch, tokens = [], [], 0
+    for text in texts:
+        n = count_tokens(text)
+        if batch and (len(batch) >= batch_size or (max_tokens and tokens + n > max_tokens)):
+            batches.append(batch)
+            batch, tokens = [], 0
+        batch.append(text)
+        tokens += n
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def mock_embed_texts(texts) -> np.ndarray:
+    """模拟 embedding：第 i 个字符的码位 × 0.001 累加到第 i % 8 维，再归一化
+
+    整批文本拼成一个码位数组，用一次 bincount 完成累加，返回 (len(texts), EMBED_DIM) 矩阵。
+    """
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    codes = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32)
+    rows = np.repeat(np.arange(len(texts)), lengths)
+    starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    bins = rows * EMBED_DIM + (np.arange(len(codes)) - starts) % EMBED_DIM
+    sums = np.bincount(bins, weights=codes * 0.001, minlength=len(texts) * EMBED_DIM)
+    return normalize_rows(sums.reshape(len(texts), EMBED_DIM)).astype(np.float32)
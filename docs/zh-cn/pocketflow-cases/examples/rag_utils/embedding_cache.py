@@ -0,0 +1,116 @@
+"""
+embedding 缓存
+
+同样的文本（重复的 chunk、高频 FAQ 问题）不必反复计算 embedding：
+- 键：blake2b(模型 id + 文本)，换模型后旧向量自然失效
+- 内存层：有容量上限的 LRU
+- 磁盘层（可选）：SQLite 文件，跨进程、跨运行共享，内存层未命中时再查
+- hits / misses 计数器，用 stats() 查看命中率
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .embedding import EMBED_MODEL
+
+
+class EmbeddingCache:
+    """两级 embedding 缓存：内存 LRU + 可选的 SQLite 磁盘层"""
+
+    def __init__(self, model: str = EMBED_MODEL, capacity: int = 10000, path: str = None):
+        self.model = model
+        self.capacity = capacity
+        self.hits = self.misses = self.disk_hits = 0
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)")
+            self._db.commit()
+
+    def key(self, text: str) -> bytes:
+        return hashlib.blake2b(f"{self.model}\0{text}".encode("utf-8"), digest_size=16).digest()
+
+    def _remember(self, key: bytes, vector: np.ndarray):
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.capacity:
+            self._lru.popitem(last=False)
+
+    def _load_from_disk(self, keys: list[bytes]) -> dict:
+        if self._db is None or not keys:
+            return {}
+        found = {}
+        for start in range(0, len(keys), 500):  # SQLite 单条语句的参数个数有上限
+            part = keys[start:start + 500]
+            rows = self._db.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(part))})", part
+            ).fetchall()
+            found.update((bytes(k), np.frombuffer(v, dtype=np.float32)) for k, v in rows)
+        return found
+
+    def embed(self, texts, embed_fn) -> np.ndarray:
+        """返回 texts 的 embedding 矩阵，只把未命中的文本一次性交给 embed_fn 计算"""
+        if not texts:
+            return np.asarray(embed_fn([]), dtype=np.float32)
+        keys = [self.key(t) for t in texts]
+        vectors = [None] * len(texts)
+        with self._lock:
+            for i, k in enumerate(keys):
+                if k in self._lru:
+                    self._lru.move_to_end(k)
+                    vectors[i] = self._lru[k]
+            missing = list({keys[i] for i, v in enumerate(vectors) if v is None})
+            from_disk = self._load_from_disk(missing)
+            for k, v in from_disk.items():
+                self._remember(k, v)
+
+        todo, disk_hits = {}, 0  # todo: key -> 文本，同一批里的重复文本只算一次
+        for i, k in enumerate(keys):
+            if vectors[i] is not None:
+                continue
+            if k in from_disk:
+                vectors[i] = from_disk[k]
+                disk_hits += 1
+            else:
+                todo.setdefault(k, texts[i])
+        computed = dict(zip(todo, embed_fn(list(todo.values())))) if todo else {}
+
+        with self._lock:
+            self.hits += len(texts) - len(todo)
+            self.misses += len(todo)
+            self.disk_hits += disk_hits
+            for k, v in computed.items():
+                self._remember(k, np.asarray(v, dtype=np.float32))
+            if self._db is not None and computed:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(k, np.asarray(v, dtype=np.float32).tobytes()) for k, v in computed.items()],
+                )
+                self._db.commit()
+
+        for i, k in enumerate(keys):
+            if vectors[i] is None:
+                vectors[i] = computed[k]
+        return np.array(vectors, dtype=np.float32).reshape(len(texts), -1)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._lru),
+        }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,149 @@
+"""
+增量索引
+
+按内容哈希对比新旧文档，只让真正变化的部分进入 embedding：
+- 文档哈希不变：保留它在索引中的全部行
+- 文档新增或修改：旧行打墓碑，重新切分后追加新行
+- 文档被删除：旧行打墓碑
+- 新行的 chunk 哈希如果已经在索引中出现过，直接复用那一行的向量
+"""
+
+import hashlib
+
+import numpy as np
+
+HASH_SIZE = 16
+
+
+def content_hash(text: str) -> bytes:
+    """内容哈希（16 字节 blake2b）"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=HASH_SIZE).digest()
+
+
+class _HashLookup:
+    """chunk 哈希 → 行号的查找表，用来判断新 chunk 能否复用已有行的向量
+
+    哈希按 (前 8 字节, 后 8 字节) 两列 uint64 排序存放，每行约 24 字节，没有逐条的 Python 对象。
+    每写入一批新行就加入一段，与前一段大小相近时合并（段数保持在 O(log N)）；查询按批向量化。
+    """
+
+    def __init__(self, hashes, first_row: int = 0):
+        self._runs = []  # [(高 8 字节, 低 8 字节, 行号)]，各自按哈希排序
+        self.add(hashes, first_row)
+
+    def add(self, hashes, first_row: int):
+        """加入从 first_row 开始连续的若干行的哈希（(n, 16) 的 uint8 数组或 bytes 列表）"""
+        keys = self._keys(hashes)
+        if not len(keys):
+            return
+        order = np.lexsort((keys[:, 1], keys[:, 0]))
+        self._runs.append((keys[order, 0], keys[order, 1], order + first_row))
+        while len(self._runs) > 1 and len(self._runs[-2][0]) <= 2 * len(self._runs[-1][0]):
+            (h1, l1, r1), (h2, l2, r2) = self._runs.pop(), self._runs.pop()
+            hi, lo, rows = np.concatenate([h2, h1]), np.concatenate([l2, l1]), np.concatenate([r2, r1])
+            order = np.lexsort((lo, hi))
+            self._runs.append((hi[order], lo[order], rows[order]))
+
+    def lookup(self, hashes) -> np.ndarray:
+        """每个哈希对应的行号，找不到为 -1"""
+        keys = self._keys(hashes)
+        found = np.full(len(keys), -1, dtype=np.int64)
+        for hi, lo, rows in self._runs:
+            i = np.minimum(np.searchsorted(hi, keys[:, 0]), len(hi) - 1)
+            # 前 8 字节相同的多行里只看第一行：漏掉的极少数只会多算一次 embedding，不会错用向量
+            match = (found < 0) & (hi[i] == keys[:, 0]) & (lo[i] == keys[:, 1])
+            found[match] = rows[i[match]]
+        return found
+
+    @staticmethod
+    def _keys(hashes) -> np.ndarray:
+        if isinstance(hashes, list):
+            hashes = np.frombuffer(b"".join(hashes), dtype=np.uint8)
+        return np.ascontiguousarray(hashes, dtype=np.uint8).reshape(-1, HASH_SIZE).view(np.uint64)
+
+
+def _new_batch(docs: dict, first_row: int) -> dict:
+    return {
+        "docs": docs,
+        "first_row": first_row,
+        "tombstones": [],
+        "new_chunks": [],
+        "new_hashes": [],
+        "reuse": {},
+        "embed_texts": [],
+        "embed_hashes": [],
+        "final": False,
+    }
+
+
+def _resolve(batch: dict, known: _HashLookup):
+    """整批查询哈希：已在索引中的复用那一行，其余的（批内去重后）需要 embedding"""
+    rows = known.lookup(batch["new_hashes"])
+    pending = set()
+    for chunk, h, row in zip(batch["new_chunks"], batch["new_hashes"], rows):
+        if row >= 0:
+            batch["reuse"][h] = int(row)
+        elif h not in pending:
+            pending.add(h)
+            batch["embed_texts"].append(chunk)
+            batch["embed_hashes"].append(h)
+
+
+def iter_reindex(sources: dict, manifest: dict, batch_size: int = None):
+    """逐批生成增量更新计划，每批最多 batch_size 个新 chunk（None 表示一次全部生成）
+
+    Args:
+        sources: {doc_id: (doc_hash, make_chunks)}，make_chunks() 惰性地产出该文档的 chunk，
+            只有文档变化时才会被调用
+        manifest: load_manifest() 的返回值
+
+    每批必须先写入索引，再取下一批：后续批次的行号和向量复用都依赖前面批次已落盘。
+    中间批次只追加新行，墓碑和文档清单都放在 "final" 为 True 的最后一批，由它一次提交
+    （update_index 的 docs / live_from 参数），中途中断时索引保持上次提交的状态。
+    复用查询用 _HashLookup，不为每个 chunk 保留 Python 对象。
+    """
+    old_docs = manifest["docs"]
+    docs = {doc_id: doc for doc_id, doc in old_docs.items() if doc_id in sources}
+    first_row = next_row = manifest["count"]
+    known = _HashLookup(manifest["hashes"])
+    tombstones = [row for doc_id, old in old_docs.items() if doc_id not in sources for row in old["rows"]]
+
+    batch = _new_batch(docs, first_row)
+    for doc_id, (doc_hash, make_chunks) in sources.items():
+        old = old_docs.get(doc_id)
+        if old is not None and old["hash"] == doc_hash:
+            continue
+        if old is not None:
+            tombstones.extend(old["rows"])
+        entry = docs[doc_id] = {"hash": doc_hash, "rows": []}
+        for chunk in make_chunks():
+            entry["rows"].append(next_row)
+            batch["new_chunks"].append(chunk)
+            batch["new_hashes"].append(content_hash(chunk))
+            next_row += 1
+            if batch_size and len(batch["new_chunks"]) >= batch_size:
+                _resolve(batch, known)
+                yield batch
+                # 这一批已落盘，其中的 chunk 之后都可以直接复用
+                known.add(batch["new_hashes"], next_row - len(batch["new_hashes"]))
+                batch = _new_batch(docs, first_row)
+
+    _resolve(batch, known)
+    batch["tombstones"] = tombstones
+    batch["final"] = True
+    yield batch
+
+
+def plan_reindex(documents: dict, manifest: dict, split) -> dict:
+    """对比内存中的 documents 与磁盘清单 manifest，一次性生成增量更新计划
+
+    Args:
+        documents: {doc_id: text}
+        manifest: load_manifest() 的返回值
+        split: 切分函数，text -> list[str]
+    """
+    sources = {
+        doc_id: (content_hash(text).hex(), lambda text=text: split(text))
+        for doc_id, text in documents.items()
+    }
+    return next(iter_reindex(sources, manifest))
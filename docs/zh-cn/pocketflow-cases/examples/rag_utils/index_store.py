@@ -0,0 +1,229 @@
+"""
+索引持久化
+
+把 VectorIndex 写成磁盘上的一个目录，在线服务用 numpy.memmap 零拷贝打开：
+- meta.json     维度、条数等元数据（最后写入，作为"提交点"）
+- embeddings.f32 归一化后的 float32 矩阵，按行连续存放
+- text.bin      所有 chunk 的 UTF-8 字节首尾相接
+- offsets.i64   每个 chunk 在 text.bin 中的起止偏移（N+1 个 int64）
+- hashes.u8     每行 chunk 的内容哈希（16 字节）
+- alive.u8      墓碑标记：1 有效，0 已删除
+- docs.json     文档清单 {doc_id: {"hash": ..., "rows": [...]}}
+
+打开索引不读取任何向量数据，页面由操作系统按需加载，多个服务进程共享同一份 page cache。
+增量更新只追加新行、原地改写墓碑标记，最后重写 meta.json 使新行对读者可见；
+流式导入的中间批次只追加（新行先标记为无效），墓碑和文档清单在最后一批一次提交。
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Sequence
+
+import numpy as np
+
+from .incremental import HASH_SIZE, content_hash
+from .vector_index import VectorIndex, normalize_rows
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+EMBEDDINGS_FILE = "embeddings.f32"
+TEXT_FILE = "text.bin"
+OFFSETS_FILE = "offsets.i64"
+HASHES_FILE = "hashes.u8"
+ALIVE_FILE = "alive.u8"
+DOCS_FILE = "docs.json"
+
+
+def _map_array(path: str, dtype, shape, mode: str = "r") -> np.ndarray:
+    """memmap 一个定长数组；空数组无法 mmap，直接返回空 ndarray"""
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode=mode, shape=shape)
+
+
+def _write_atomic(path: str, data: bytes):
+    """先写临时文件再 rename，读者不会看到写了一半的文件"""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _append(path: str, data: bytes, offset: int):
+    """在 offset 处追加数据，先截掉上次未提交（崩溃残留）的尾部"""
+    with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+        f.truncate(offset)
+        f.seek(offset)
+        f.write(data)
+
+
+def _read_json(path: str, default=None):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _remove_files(path: str, names):
+    """删除索引目录中的一组文件（不存在的跳过）；调用方把 meta 文件放在最前面，删到一半中断时结构也不会被加载"""
+    for name in names:
+        file_path = os.path.join(path, name)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def _rows_fingerprint(path: str, count: int):
+    """索引前 count 行内容哈希的摘要，用来判断附属结构是否仍对应当前的行；索引不存在时返回 None"""
+    hashes_path = os.path.join(path, HASHES_FILE)
+    if not os.path.exists(hashes_path):
+        return None
+    with open(hashes_path, "rb") as f:
+        data = f.read(count * HASH_SIZE)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _read_meta(path: str) -> dict:
+    meta = _read_json(os.path.join(path, META_FILE))
+    if meta is None:
+        raise FileNotFoundError(f"索引不存在：{path}")
+    if meta.get("version") != FORMAT_VERSION:
+        raise ValueError(f"不支持的索引格式版本：{meta.get('version')}")
+    return meta
+
+
+def _write_meta(path: str, count: int, dim: int):
+    meta = {"version": FORMAT_VERSION, "count": count, "dim": dim}
+    _write_atomic(os.path.join(path, META_FILE), json.dumps(meta).encode("utf-8"))
+
+
+class MappedChunks(Sequence):
+    """按需从 mmap 的 text.bin 中解码 chunk，不把全部文本读进内存"""
+
+    def __init__(self, text: np.ndarray, offsets: np.ndarray):
+        self._text = text
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        start, end = int(self._offsets[i]), int(self._offsets[i + 1])
+        return self._text[start:end].tobytes().decode("utf-8")
+
+
+def save_index(index: VectorIndex, path: str, hashes=None, docs=None):
+    """把索引完整写入目录 path（已存在则覆盖）"""
+    os.makedirs(path, exist_ok=True)
+    encoded = [chunk.encode("utf-8") for chunk in index.chunks]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    if hashes is None:
+        hashes = [content_hash(chunk) for chunk in index.chunks]
+    hashes = np.asarray(hashes, dtype=np.uint8).reshape(len(index), HASH_SIZE)
+    alive = np.ones(len(index), dtype=bool) if index.alive is None else index.alive
+
+    _write_atomic(os.path.join(path, EMBEDDINGS_FILE), np.ascontiguousarray(index.embeddings).tobytes())
+    _write_atomic(os.path.join(path, TEXT_FILE), b"".join(encoded))
+    _write_atomic(os.path.join(path, OFFSETS_FILE), offsets.tobytes())
+    _write_atomic(os.path.join(path, HASHES_FILE), hashes.tobytes())
+    _write_atomic(os.path.join(path, ALIVE_FILE), np.asarray(alive, dtype=np.uint8).tobytes())
+    _write_atomic(os.path.join(path, DOCS_FILE), json.dumps(docs or {}).encode("utf-8"))
+    _write_meta(path, len(index), index.dim)
+
+
+def load_index(path: str) -> VectorIndex:
+    """以只读 memmap 方式打开 save_index 写出的索引"""
+    meta = _read_meta(path)
+    count, dim = meta["count"], meta["dim"]
+    offsets = _map_array(os.path.join(path, OFFSETS_FILE), np.int64, (count + 1,))
+    text = _map_array(os.path.join(path, TEXT_FILE), np.uint8, (int(offsets[-1]),))
+    embeddings = _map_array(os.path.join(path, EMBEDDINGS_FILE), np.float32, (count, dim))
+    alive = _map_array(os.path.join(path, ALIVE_FILE), np.uint8, (count,)).view(bool)
+    return VectorIndex.from_normalized(MappedChunks(text, offsets), embeddings, alive=alive)
+
+
+def load_manifest(path) -> dict:
+    """读取增量更新所需的清单；path 为空或索引不存在时返回空清单"""
+    if not path or not os.path.exists(os.path.join(path, META_FILE)):
+        return {"count": 0, "dim": None, "docs": {}, "hashes": np.empty((0, HASH_SIZE), dtype=np.uint8),
+                "embeddings": np.empty((0, 0), dtype=np.float32)}
+    meta = _read_meta(path)
+    count, dim = meta["count"], meta["dim"]
+    return {
+        "count": count,
+        "dim": dim,
+        "docs": _read_json(os.path.join(path, DOCS_FILE), {}),
+        "hashes": _map_array(os.path.join(path, HASHES_FILE), np.uint8, (count, HASH_SIZE)),
+        "embeddings": _map_array(os.path.join(path, EMBEDDINGS_FILE), np.float32, (count, dim)),
+    }
+
+
+def update_index(path: str, new_chunks, new_embeddings, new_hashes, tombstones=(), docs=None, live_from: int = None):
+    """原地增量更新：追加新行，最后提交 meta.json
+
+    docs 为 None 时是流式导入的中间批次：新行先标记为无效，不打墓碑、不改写文档清单，
+    每批的开销只与这一批的大小有关。传入 docs 时提交整次更新：从 live_from 行起（默认只含本批）
+    先前追加的行生效、标记墓碑、写入文档清单。中途中断时索引仍是上次提交的状态，
+    已追加的行只是无效行，其向量仍可被下一次导入复用。
+    """
+    os.makedirs(path, exist_ok=True)
+    meta = _read_json(os.path.join(path, META_FILE))
+    count = meta["count"] if meta else 0
+    matrix = np.asarray(new_embeddings, dtype=np.float32)
+    dim = meta["dim"] if meta else (matrix.shape[1] if len(new_chunks) else 0)
+    matrix = matrix.reshape(len(new_chunks), dim if not len(new_chunks) else -1)
+    if len(new_chunks) and matrix.shape[1] != dim:
+        raise ValueError(f"新向量维度 {matrix.shape[1]} 与索引维度 {dim} 不一致")
+
+    offsets_path = os.path.join(path, OFFSETS_FILE)
+    base = int(np.fromfile(offsets_path, dtype=np.int64, count=1, offset=count * 8)[0]) if count else 0
+    encoded = [chunk.encode("utf-8") for chunk in new_chunks]
+    new_offsets = base + np.cumsum([len(b) for b in encoded], dtype=np.int64)
+    if count == 0:
+        new_offsets = np.concatenate([[0], new_offsets]).astype(np.int64)
+
+    commit = docs is not None
+    _append(os.path.join(path, EMBEDDINGS_FILE), normalize_rows(matrix).astype(np.float32).tobytes(), count * dim * 4)
+    _append(os.path.join(path, TEXT_FILE), b"".join(encoded), base)
+    _append(offsets_path, new_offsets.tobytes(), (count + 1) * 8 if count else 0)
+    _append(os.path.join(path, HASHES_FILE), b"".join(new_hashes), count * HASH_SIZE)
+    _append(os.path.join(path, ALIVE_FILE), (b"\x01" if commit else b"\x00") * len(new_chunks), count)
+
+    pending = commit and live_from is not None and live_from < count
+    if commit and (len(tombstones) or pending):
+        alive = _map_array(os.path.join(path, ALIVE_FILE), np.uint8, (count,), mode="r+")
+        if pending:
+            alive[live_from:] = 1
+        alive[np.asarray(tombstones, dtype=np.int64)] = 0
+        alive.flush()
+        del alive
+
+    if commit:
+        _write_atomic(os.path.join(path, DOCS_FILE), json.dumps(docs).encode("utf-8"))
+    _write_meta(path, count + len(new_chunks), dim)
+
+
+def compact_index(path: str):
+    """重写索引，物理删除墓碑行并重新编号文档清单"""
+    index = load_index(path)
+    manifest = load_manifest(path)
+    alive = np.asarray(index.alive, dtype=bool)
+    new_row = np.cumsum(alive) - 1
+    docs = {
+        doc_id: {"hash": doc["hash"], "rows": [int(new_row[r]) for r in doc["rows"] if alive[r]]}
+        for doc_id, doc in manifest["docs"].items()
+    }
+    keep = np.flatnonzero(alive)
+    compacted = VectorIndex.from_normalized(
+        [index.chunks[i] for i in keep], np.array(index.embeddings[keep], dtype=np.float32)
+    )
+    hashes = np.array(manifest["hashes"][keep])
+    del index, manifest, alive  # 先释放 memmap，再覆盖底层文件
+    save_index(compacted, path, hashes=hashes, docs=docs)
@@ -0,0 +1,175 @@
+"""
+IVF 近似最近邻索引
+
+暴力检索的耗时与语料规模成正比。IVF（倒排文件）先用 k-means 把向量分成 nlist 个簇：
+- 建索引：每个向量归入最近的簇中心，同一个簇的向量连续存放
+- 查询：只扫描与 query 最近的 nprobe 个簇，其余簇直接跳过
+
+nprobe 是召回率与速度的旋钮：nprobe = nlist 时等价于精确检索。
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .index_store import _map_array, _remove_files, _rows_fingerprint, _write_atomic
+from .vector_index import normalize_rows, top_k_indices
+
+IVF_META_FILE = "ivf.json"
+IVF_CENTROIDS_FILE = "ivf_centroids.f32"
+IVF_VECTORS_FILE = "ivf_vectors.f32"
+IVF_IDS_FILE = "ivf_ids.i64"
+IVF_OFFSETS_FILE = "ivf_offsets.i64"
+IVF_FILES = (IVF_META_FILE, IVF_CENTROIDS_FILE, IVF_VECTORS_FILE, IVF_IDS_FILE, IVF_OFFSETS_FILE)
+
+ASSIGN_BATCH = 65536  # 分批计算簇分配，限制 (batch × nlist) 分数矩阵的内存
+
+
+def assign_clusters(x: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """把每行分到内积最大的簇中心"""
+    assign = np.empty(len(x), dtype=np.int64)
+    for start in range(0, len(x), ASSIGN_BATCH):
+        assign[start:start + ASSIGN_BATCH] = np.argmax(x[start:start + ASSIGN_BATCH] @ centroids.T, axis=1)
+    return assign
+
+
+def spherical_kmeans(x: np.ndarray, nlist: int, iters: int = 10, seed: int = 0) -> np.ndarray:
+    """球面 k-means：簇中心保持单位长度，与余弦相似度一致"""
+    rng = np.random.default_rng(seed)
+    centroids = x[rng.choice(len(x), nlist, replace=False)].copy()
+    for _ in range(iters):
+        assign = assign_clusters(x, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, x)
+        empty = np.flatnonzero(np.bincount(assign, minlength=nlist) == 0)
+        # 空簇重新随机取一个样本作为中心，避免簇数量塌缩
+        sums[empty] = x[rng.choice(len(x), len(empty), replace=False)]
+        centroids = normalize_rows(sums).astype(np.float32)
+    return centroids
+
+
+class IVFIndex:
+    """倒排文件索引，对外接口与 VectorIndex 相同，可直接替换给 RetrieveNode 使用"""
+
+    def __init__(self, base, centroids, vectors, ids, offsets, nprobe: int = 8):
+        self.base = base  # 底层的 VectorIndex，提供 chunks 和墓碑掩码
+        self.centroids = centroids
+        self.vectors = vectors  # 按簇重排后的向量
+        self.ids = ids  # vectors 每一行对应的原始行号
+        self.offsets = offsets  # 第 c 个簇位于 vectors[offsets[c]:offsets[c + 1]]
+        self.nprobe = nprobe
+
+    @classmethod
+    def build(cls, base, nlist: int = None, nprobe: int = 8, train_size: int = 65536,
+              iters: int = 10, seed: int = 0) -> "IVFIndex":
+        """在 base 的向量上训练簇中心并建立倒排表
+
+        Args:
+            nlist: 簇数量，默认约为 4·sqrt(N)
+            train_size: 训练 k-means 的采样数量
+        """
+        n = len(base)
+        if n == 0:
+            raise ValueError("不能在空索引上构建 IVF")
+        nlist = min(nlist or max(1, int(4 * np.sqrt(n))), n)
+        embeddings = np.asarray(base.embeddings, dtype=np.float32)
+        rng = np.random.default_rng(seed)
+        sample = embeddings[rng.choice(n, min(train_size, n), replace=False)] if n > train_size else embeddings
+        centroids = spherical_kmeans(sample, min(nlist, len(sample)), iters=iters, seed=seed)
+
+        assign = assign_clusters(embeddings, centroids)
+        ids = np.argsort(assign, kind="stable")
+        offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assign, minlength=len(centroids)), out=offsets[1:])
+        vectors = np.ascontiguousarray(embeddings[ids])
+        return cls(base, centroids, vectors, ids, offsets, nprobe=nprobe)
+
+    def __len__(self):
+        return len(self.base)
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def dim(self) -> int:
+        return self.base.dim
+
+    @property
+    def chunks(self):
+        return self.base.chunks
+
+    @property
+    def alive(self):
+        return self.base.alive
+
+    def _scan(self, q: np.ndarray, probes: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        spans = [(self.offsets[c], self.offsets[c + 1]) for c in probes]
+        cand_ids = np.concatenate([self.ids[s:e] for s, e in spans])
+        scores = np.concatenate([self.vectors[s:e] @ q for s, e in spans])
+        if self.alive is not None:
+            scores = np.where(self.alive[cand_ids], scores, -np.inf)
+        top = top_k_indices(scores, k)
+        top = top[scores[top] > -np.inf]
+        return cand_ids[top], scores[top]
+
+    def search_ids(self, query, k: int = 3, nprobe: int = None) -> tuple[np.ndarray, np.ndarray]:
+        """只扫描最近的 nprobe 个簇，返回 top-k 的 (行号, 分数)"""
+        q = self.base._check_query(query)
+        return self._scan(q, top_k_indices(self.centroids @ q, nprobe or self.nprobe), k)
+
+    def search_ids_batch(self, queries, k: int = 3, nprobe: int = None) -> list[tuple[np.ndarray, np.ndarray]]:
+        """多条查询一起选簇（一次矩阵乘法），再逐条扫描各自的簇"""
+        q = self.base._check_query(queries).reshape(-1, self.dim)
+        probes = top_k_indices(q @ self.centroids.T, nprobe or self.nprobe)
+        return [self._scan(q[i], probes[i], k) for i in range(len(q))]
+
+    def search(self, query, k: int = 3, nprobe: int = None) -> list[tuple[str, float]]:
+        """返回与 query 最相似的 k 个 (chunk, score)（近似）"""
+        ids, scores = self.search_ids(query, k, nprobe)
+        return [(self.chunks[i], float(s)) for i, s in zip(ids, scores)]
+
+    def search_batch(self, queries, k: int = 3, nprobe: int = None) -> list[list[tuple[str, float]]]:
+        """返回每条查询最相似的 k 个 (chunk, score)（近似）"""
+        return [
+            [(self.chunks[i], float(s)) for i, s in zip(ids, scores)]
+            for ids, scores in self.search_ids_batch(queries, k, nprobe)
+        ]
+
+
+def save_ivf(ivf: IVFIndex, path: str):
+    """把 IVF 结构写到索引目录中，与底层索引放在一起"""
+    _write_atomic(os.path.join(path, IVF_CENTROIDS_FILE), ivf.centroids.tobytes())
+    _write_atomic(os.path.join(path, IVF_VECTORS_FILE), ivf.vectors.tobytes())
+    _write_atomic(os.path.join(path, IVF_IDS_FILE), ivf.ids.astype(np.int64).tobytes())
+    _write_atomic(os.path.join(path, IVF_OFFSETS_FILE), ivf.offsets.tobytes())
+    meta = {"count": len(ivf), "nlist": ivf.nlist, "dim": ivf.dim, "nprobe": ivf.nprobe,
+            "rows": _rows_fingerprint(path, len(ivf))}
+    _write_atomic(os.path.join(path, IVF_META_FILE), json.dumps(meta).encode("utf-8"))
+
+
+def load_ivf(path: str, base):
+    """memmap 打开 IVF；不存在或已过期（底层索引的行数或行内容变了）时返回 None"""
+    meta_path = os.path.join(path, IVF_META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    if (meta["count"] != len(base) or meta["dim"] != base.dim
+            or meta.get("rows") != _rows_fingerprint(path, meta["count"])):
+        return None
+    count, nlist, dim = meta["count"], meta["nlist"], meta["dim"]
+    return IVFIndex(
+        base,
+        _map_array(os.path.join(path, IVF_CENTROIDS_FILE), np.float32, (nlist, dim)),
+        _map_array(os.path.join(path, IVF_VECTORS_FILE), np.float32, (count, dim)),
+        _map_array(os.path.join(path, IVF_IDS_FILE), np.int64, (count,)),
+        _map_array(os.path.join(path, IVF_OFFSETS_FILE), np.int64, (nlist + 1,)),
+        nprobe=meta["nprobe"],
+    )
+
+
+def remove_ivf(path: str):
+    """删除索引目录中的 IVF 结构"""
+    _remove_files(path, IVF_FILES)
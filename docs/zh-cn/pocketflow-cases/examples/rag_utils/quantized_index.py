@@ -0,0 +1,170 @@
+"""
+量化向量索引
+
+float32 矩阵每个维度占 4 字节。服务端常驻内存的只需要一份压缩后的矩阵：
+- float16：每维 2 字节，精度损失很小
+- int8：每维 1 字节，按维度线性量化 x ≈ offset + scale × code（code 取 0~255）
+
+打分直接在量化矩阵上进行：q·x ≈ (q × scale)·code + q·offset，
+只需把 query 预先乘上 scale，不必把整个矩阵还原成 float32。
+可选 rescore_k：先用量化分数取前 rescore_k 个候选，再用原始 float32 向量精确重排，
+原始矩阵留在磁盘（memmap）上，只有这几行会被读入内存。
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .index_store import _map_array, _remove_files, _rows_fingerprint, _write_atomic
+from .vector_index import SCORE_BLOCK, top_k_indices
+
+QUANT_META_FILE = "quant.json"
+QUANT_SCALE_FILE = "quant_scale.f32"
+QUANT_OFFSET_FILE = "quant_offset.f32"
+QUANT_CODES_FILES = {"float16": "quant_codes.f16", "int8": "quant_codes.u8"}
+QUANT_FILES = (QUANT_META_FILE, QUANT_SCALE_FILE, QUANT_OFFSET_FILE, *QUANT_CODES_FILES.values())
+QUANT_DTYPES = {"float16": np.float16, "int8": np.uint8}
+
+SCAN_BLOCK = 65536  # 每次还原这么多行参与打分，限制临时 float32 矩阵的内存
+
+
+def quantize(embeddings, mode: str = "int8") -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """返回 (codes, scale, offset)，满足 embeddings ≈ offset + scale × codes"""
+    if mode not in QUANT_DTYPES:
+        raise ValueError(f"不支持的量化方式：{mode}，可选 {list(QUANT_DTYPES)}")
+    x = np.asarray(embeddings, dtype=np.float32)
+    dim = x.shape[1]
+    if mode == "float16":
+        return x.astype(np.float16), np.ones(dim, dtype=np.float32), np.zeros(dim, dtype=np.float32)
+    lo = x.min(axis=0) if len(x) else np.zeros(dim, dtype=np.float32)
+    hi = x.max(axis=0) if len(x) else np.zeros(dim, dtype=np.float32)
+    scale = ((hi - lo) / 255).astype(np.float32)
+    scale[scale == 0] = 1.0  # 该维所有值相同，code 全为 0
+    codes = np.clip(np.rint((x - lo) / scale), 0, 255).astype(np.uint8)
+    return codes, scale, lo.astype(np.float32)
+
+
+class QuantizedIndex:
+    """量化存储的暴力检索索引，对外接口与 VectorIndex 相同"""
+
+    def __init__(self, base, mode: str, codes, scale, offset, rescore_k: int = None):
+        self.base = base  # 底层的 VectorIndex，提供 chunks、墓碑掩码和 rescore 用的原始向量
+        self.mode = mode
+        self.codes = codes
+        self.scale = scale
+        self.offset = offset
+        self.rescore_k = rescore_k
+
+    @classmethod
+    def build(cls, base, mode: str = "int8", rescore_k: int = None) -> "QuantizedIndex":
+        codes, scale, offset = quantize(base.embeddings, mode)
+        return cls(base, mode, codes, scale, offset, rescore_k=rescore_k)
+
+    def __len__(self):
+        return len(self.base)
+
+    @property
+    def dim(self) -> int:
+        return self.base.dim
+
+    @property
+    def chunks(self):
+        return self.base.chunks
+
+    @property
+    def alive(self):
+        return self.base.alive
+
+    @property
+    def nbytes(self) -> int:
+        """常驻内存的量化矩阵大小"""
+        return self.codes.nbytes + self.scale.nbytes + self.offset.nbytes
+
+    def _scores(self, q: np.ndarray) -> np.ndarray:
+        """(Q, d) 的 query 对全部行打分，返回 (Q, N)"""
+        qs = q * self.scale
+        scores = np.empty((len(q), len(self)), dtype=np.float32)
+        for start in range(0, len(self), SCAN_BLOCK):
+            block = self.codes[start:start + SCAN_BLOCK].astype(np.float32)
+            scores[:, start:start + SCAN_BLOCK] = qs @ block.T
+        scores += (q @ self.offset)[:, None]
+        if self.alive is not None:
+            scores[:, ~np.asarray(self.alive, dtype=bool)] = -np.inf
+        return scores
+
+    def _top(self, q: np.ndarray, scores: np.ndarray, k: int, rescore_k: int) -> tuple[np.ndarray, np.ndarray]:
+        ids = top_k_indices(scores, max(k, rescore_k or 0))
+        ids = ids[scores[ids] > -np.inf]
+        if not rescore_k:
+            return ids, scores[ids]
+        # 只读取候选行的 float32 向量精确打分；按行号排序，memmap 上接近顺序读
+        ids = np.sort(ids)
+        exact = np.asarray(self.base.embeddings[ids], dtype=np.float32) @ q
+        top = top_k_indices(exact, k)
+        return ids[top], exact[top]
+
+    def search_ids(self, query, k: int = 3, rescore_k: int = None) -> tuple[np.ndarray, np.ndarray]:
+        """在量化矩阵上打分，返回 top-k 的 (行号, 分数)；rescore_k 非空时用 float32 重排"""
+        q = self.base._check_query(query)
+        rescore_k = rescore_k if rescore_k is not None else self.rescore_k
+        return self._top(q, self._scores(q[None])[0], k, rescore_k)
+
+    def search_ids_batch(self, queries, k: int = 3, rescore_k: int = None) -> list[tuple[np.ndarray, np.ndarray]]:
+        """多条查询一起打分，逐行取 top-k"""
+        q = self.base._check_query(queries).reshape(-1, self.dim)
+        rescore_k = rescore_k if rescore_k is not None else self.rescore_k
+        results = []
+        block = max(1, SCORE_BLOCK // max(len(self), 1))
+        for start in range(0, len(q), block):
+            scores = self._scores(q[start:start + block])
+            results.extend(self._top(q[start + i], s, k, rescore_k) for i, s in enumerate(scores))
+        return results
+
+    def search(self, query, k: int = 3, rescore_k: int = None) -> list[tuple[str, float]]:
+        """返回与 query 最相似的 k 个 (chunk, score)"""
+        ids, scores = self.search_ids(query, k, rescore_k)
+        return [(self.chunks[i], float(s)) for i, s in zip(ids, scores)]
+
+    def search_batch(self, queries, k: int = 3, rescore_k: int = None) -> list[list[tuple[str, float]]]:
+        """返回每条查询最相似的 k 个 (chunk, score)"""
+        return [
+            [(self.chunks[i], float(s)) for i, s in zip(ids, scores)]
+            for ids, scores in self.search_ids_batch(queries, k, rescore_k)
+        ]
+
+
+def save_quantized(index: QuantizedIndex, path: str):
+    """把量化矩阵写到索引目录中，与底层索引放在一起"""
+    _write_atomic(os.path.join(path, QUANT_CODES_FILES[index.mode]), np.ascontiguousarray(index.codes).tobytes())
+    _write_atomic(os.path.join(path, QUANT_SCALE_FILE), index.scale.tobytes())
+    _write_atomic(os.path.join(path, QUANT_OFFSET_FILE), index.offset.tobytes())
+    meta = {"count": len(index), "dim": index.dim, "mode": index.mode, "rescore_k": index.rescore_k,
+            "rows": _rows_fingerprint(path, len(index))}
+    _write_atomic(os.path.join(path, QUANT_META_FILE), json.dumps(meta).encode("utf-8"))
+
+
+def load_quantized(path: str, base):
+    """memmap 打开量化矩阵；不存在或已过期（底层索引的行数或行内容变了）时返回 None"""
+    meta_path = os.path.join(path, QUANT_META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        meta = json.load(f)
+    if (meta["count"] != len(base) or meta["dim"] != base.dim
+            or meta.get("rows") != _rows_fingerprint(path, meta["count"])):
+        return None
+    count, dim, mode = meta["count"], meta["dim"], meta["mode"]
+    return QuantizedIndex(
+        base,
+        mode,
+        _map_array(os.path.join(path, QUANT_CODES_FILES[mode]), QUANT_DTYPES[mode], (count, dim)),
+        _map_array(os.path.join(path, QUANT_SCALE_FILE), np.float32, (dim,)),
+        _map_array(os.path.join(path, QUANT_OFFSET_FILE), np.float32, (dim,)),
+        rescore_k=meta["rescore_k"],
+    )
+
+
+def remove_quantized(path: str):
+    """删除索引目录中的量化矩阵（两种精度的都删）"""
+    _remove_files(path, QUANT_FILES)
@@ -0,0 +1,89 @@
+"""
+流式切分
+
+直接从磁盘文件读取文档并逐个产出 chunk，内存占用与语料大小无关：
+- 文件通过 mmap 分块读取，按块增量解码 UTF-8（多字节字符跨块也不会出错）
+- 切分时优先在句末标点处断开，相邻 chunk 之间保留 overlap 个字符的重叠
+- 只保留"当前块 + 一个 chunk"大小的缓冲区
+"""
+
+import codecs
+import hashlib
+import mmap
+import os
+
+from .incremental import HASH_SIZE, iter_reindex
+
+BLOCK_SIZE = 1 << 20  # 每次从文件读取 1 MB
+SENTENCE_ENDS = "。！？!?；;\n"
+
+
+def _read_blocks(path: str, block_size: int = BLOCK_SIZE):
+    """mmap 文件并按块产出字节"""
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for start in range(0, len(mm), block_size):
+            yield mm[start:start + block_size]
+
+
+def file_hash(path: str) -> str:
+    """流式计算文件内容哈希，与 content_hash 对同样文本的结果一致"""
+    h = hashlib.blake2b(digest_size=HASH_SIZE)
+    for block in _read_blocks(path):
+        h.update(block)
+    return h.hexdigest()
+
+
+def iter_file_text(path: str, block_size: int = BLOCK_SIZE):
+    """按块产出文件的文本内容"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for block in _read_blocks(path, block_size):
+        text = decoder.decode(block)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _find_cut(buf: str, start: int, chunk_size: int) -> int:
+    """在 buf[start:start + chunk_size] 的后半段找最后一个句末标点，找不到就硬切"""
+    lo, hi = start + chunk_size // 2, start + chunk_size
+    cut = max(buf.rfind(ch, lo, hi) for ch in SENTENCE_ENDS)
+    return cut + 1 if cut >= 0 else hi
+
+
+def iter_chunks(texts, chunk_size: int = 500, overlap: int = 50):
+    """把文本块流切分成 chunk，尽量在句子边界断开
+
+    Args:
+        texts: 可迭代的文本块（如 iter_file_text 的返回值）
+        chunk_size: 每个 chunk 的最大字符数
+        overlap: 相邻 chunk 之间重叠的字符数，须小于 chunk_size 的一半
+    """
+    if not 0 <= overlap < chunk_size // 2:
+        raise ValueError(f"overlap 须满足 0 <= overlap < chunk_size // 2，实际 overlap={overlap}")
+    buf, pos, emitted = "", 0, 0  # buf[pos:] 待切分，buf[:emitted] 已经输出过
+    for text in texts:
+        buf, emitted, pos = buf[pos:] + text, emitted - pos, 0
+        while len(buf) - pos > chunk_size:
+            cut = _find_cut(buf, pos, chunk_size)
+            yield buf[pos:cut]
+            emitted, pos = cut, cut - overlap
+    if len(buf) > emitted:
+        yield buf[pos:]
+
+
+def iter_file_reindex(files: dict, manifest: dict, chunk_size: int = 500, overlap: int = 50,
+                      batch_size: int = 64):
+    """对磁盘文件做流式增量重建，逐批产出与 plan_reindex 格式相同的更新计划
+
+    Args:
+        files: {doc_id: 文件路径}
+    """
+    sources = {
+        doc_id: (file_hash(path), lambda path=path: iter_chunks(iter_file_text(path), chunk_size, overlap))
+        for doc_id, path in files.items()
+    }
+    return iter_reindex(sources, manifest, batch_size=batch_size)
@@ -0,0 +1,105 @@
+"""
+向量索引
+
+把所有 embedding 预先归一化后存成一块连续的 float32 矩阵：
+- 查询时只需一次矩阵-向量乘法即可得到全部余弦相似度
+- 用 argpartition 在 O(N) 内取 top-k，只对这 k 个结果排序
+- 多条查询一起来时合成一次矩阵-矩阵乘法（search_batch）
+"""
+
+import numpy as np
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """按行做 L2 归一化（零向量保持为零）"""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+SCORE_BLOCK = 1 << 24  # 批量查询时每块分数矩阵最多 1600 万个元素（64 MB）
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """沿最后一维返回分数最高的 k 个下标（按分数从高到低），一维、二维分数都适用"""
+    n = scores.shape[-1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.int64)
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        candidates = np.broadcast_to(np.arange(n), scores.shape).copy()
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=-1), axis=-1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=-1)
+
+
+class VectorIndex:
+    """暴力检索的稠密向量索引（实际场景可替换为向量数据库）"""
+
+    def __init__(self, chunks, embeddings):
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2:
+            raise ValueError(f"embeddings 必须是二维矩阵，实际维度：{matrix.ndim}")
+        if len(chunks) != matrix.shape[0]:
+            raise ValueError(f"chunks 数量 {len(chunks)} 与 embeddings 行数 {matrix.shape[0]} 不一致")
+        self.chunks = list(chunks)
+        self.embeddings = np.ascontiguousarray(normalize_rows(matrix), dtype=np.float32)
+        self.alive = None  # 墓碑掩码，None 表示全部有效
+
+    @classmethod
+    def from_normalized(cls, chunks, embeddings: np.ndarray, alive=None) -> "VectorIndex":
+        """直接包装已归一化的矩阵（如 memmap），不做拷贝"""
+        index = cls.__new__(cls)
+        index.chunks = chunks
+        index.embeddings = embeddings
+        index.alive = alive
+        return index
+
+    def __len__(self):
+        return self.embeddings.shape[0]
+
+    @property
+    def dim(self) -> int:
+        return self.embeddings.shape[1]
+
+    def _check_query(self, query) -> np.ndarray:
+        q = np.asarray(query, dtype=np.float32)
+        if q.shape[-1:] != (self.dim,) or q.ndim > 2:
+            raise ValueError(f"查询向量维度应为 {self.dim}，实际为 {q.shape}")
+        return normalize_rows(q)
+
+    def search_ids(self, query, k: int = 3) -> tuple[np.ndarray, np.ndarray]:
+        """返回 top-k 的 (行号, 分数)，已跳过墓碑行"""
+        scores = self.embeddings @ self._check_query(query)
+        if self.alive is not None:
+            scores = np.where(self.alive, scores, -np.inf)
+        ids = top_k_indices(scores, k)
+        ids = ids[scores[ids] > -np.inf]
+        return ids, scores[ids]
+
+    def search(self, query, k: int = 3) -> list[tuple[str, float]]:
+        """返回与 query 最相似的 k 个 (chunk, score)"""
+        ids, scores = self.search_ids(query, k)
+        return [(self.chunks[i], float(s)) for i, s in zip(ids, scores)]
+
+    def search_ids_batch(self, queries, k: int = 3) -> list[tuple[np.ndarray, np.ndarray]]:
+        """多条查询一起打分：(Q, d) × (d, N) 一次矩阵乘法，逐行取 top-k"""
+        q = self._check_query(queries).reshape(-1, self.dim)
+        results = []
+        block = max(1, SCORE_BLOCK // max(len(self), 1))
+        for start in range(0, len(q), block):
+            scores = q[start:start + block] @ self.embeddings.T
+            if self.alive is not None:
+                scores = np.where(self.alive, scores, -np.inf)
+            top = top_k_indices(scores, k)
+            top_scores = np.take_along_axis(scores, top, axis=-1)
+            results.extend((ids[s > -np.inf], s[s > -np.inf]) for ids, s in zip(top, top_scores))
+        return results
+
+    def search_batch(self, queries, k: int = 3) -> list[list[tuple[str, float]]]:
+        """返回每条查询最相似的 k 个 (chunk, score)"""
+        return [
+            [(self.chunks[i], float(s)) for i, s in zip(ids, scores)]
+            for ids, scores in self.search_ids_batch(queries, k)
+        ]
@@ -0,0 +1,41 @@
+"""
+示例 11：编译模式的 Flow
+对应教程：第 3 节 —— Flow 源码解析（_orch 调度循环）
+
+演示：
+- CompiledFlow 与 Flow 用法相同，运行结果一致
+- 第一次运行时把图冻结成转移表，循环中不再逐步 copy.copy 节点
+- 声明为 pure 的节点（post 只走 default）与后继融合成一个 step，step 内直接调用各节点的 prep / _exec / post
+
+复用示例 03（线性链）和示例 10（生成 ↔ 检查循环）中的节点。
+调度开销的对比见 benchmarks/bench_compiled_flow.py。
+"""
+
+from flow_utils import CompiledFlow, load_example
+
+chain = load_example("03_flow_chain.py")
+loop = load_example("10_loop_pattern.py")
+
+
+if __name__ == "__main__":
+    # --- 线性链：Fetch → Think → Output 融合成一个 step ---
+    print("=== 线性链：融合 pure 节点 ===\n")
+    fetch, think, output = chain.FetchNode(), chain.ThinkNode(), chain.OutputNode()
+    fetch >> think >> output
+    fetch.pure = think.pure = True  # post 总是返回 "default"、不在 self 上保存状态，可以与后继融合
+
+    flow = CompiledFlow(start=fetch)
+    flow.run({"question": "什么是 PocketFlow？"})
+    print(f"\n3 个节点编译为 {flow.num_steps} 个 step")
+
+    # --- 循环：生成 ↔ 检查，图结构与示例 10 相同 ---
+    print("\n=== 循环：Generate ↔ Check ===\n")
+    generate, check, output = loop.GenerateNode(), loop.CheckNode(), loop.OutputNode()
+    generate >> check
+    check - "retry" >> generate
+    check - "accept" >> output
+
+    flow = CompiledFlow(start=generate)
+    shared = {"question": "什么是 PocketFlow？"}
+    flow.run(shared)
+    print(f"\n总尝试次数：{shared['attempt']}（每个节点本次运行只 copy 一次）")
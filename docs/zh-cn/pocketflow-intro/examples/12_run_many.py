@@ -0,0 +1,52 @@
+"""
+示例 12：批量运行 Flow
+对应教程：第 1.3 节 —— 条件连接（示例 04 的审核流程）
+
+演示：
+- run_many 把同一个 Flow 用在一批 shared 上，线程池 / 进程池并发执行
+- ordered=True 按输入顺序取结果，ordered=False 谁先完成先取
+- 单个任务出错只记录在它自己的结果里，其余任务照常完成
+
+复用示例 04 的审核节点。多核扩展效果见 benchmarks/bench_run_many.py。
+"""
+
+import contextlib
+import io
+import time
+from collections import Counter
+
+from pocketflow import Flow
+from flow_utils import load_example, run_many
+
+cond = load_example("04_conditional_flow.py")
+
+
+def build_flow():
+    review, approve, reject = cond.ReviewNode(), cond.ApproveNode(), cond.RejectNode()
+    review - "approve" >> approve
+    review - "reject" >> reject
+    return Flow(start=review)
+
+
+if __name__ == "__main__":
+    flow = build_flow()
+
+    # --- 线程池，按输入顺序返回；"abc" 无法与 60 比较，会在 ReviewNode 中报错 ---
+    print("=== 线程池：按输入顺序返回 ===\n")
+    jobs = [{"score": s} for s in (80, 45, "abc", 60, 99, 12)]
+    with contextlib.redirect_stdout(io.StringIO()):  # 并发时节点的 print 会交错，这里先收起来
+        results = list(run_many(flow, jobs, workers=3))
+    for r in results:
+        outcome = f"出错：{r['error']!r}" if r["error"] else r["shared"]["result"]
+        print(f"任务 {r['index']}：分数 {r['shared']['score']!r:<6} → {outcome}")
+    print(f"\n线程模式下 shared 原地修改：jobs[0] = {jobs[0]}")
+
+    # --- 进程池，谁先完成先返回；shareds 用生成器按需产生 ---
+    print("\n=== 进程池：2000 个任务，按完成顺序返回 ===\n")
+    start = time.perf_counter()
+    stats = Counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for r in run_many(flow, ({"score": i % 100} for i in range(2000)), mode="process", ordered=False):
+            stats["error" if r["error"] else r["shared"]["decision"]] += 1
+    print(f"通过 {stats['approve']}，拒绝 {stats['reject']}，出错 {stats['error']}，"
+          f"耗时 {time.perf_counter() - start:.2f} s")
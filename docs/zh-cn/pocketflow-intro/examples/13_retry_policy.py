@@ -0,0 +1,133 @@
+"""
+示例 13：重试策略与熔断器
+对应教程：第 3.2 节 —— Node 可重试的执行单元
+
+演示：
+- RetryNode 用 RetryPolicy 代替固定的 wait：指数退避 + full jitter，累计等待有上限
+- 固定间隔重试让并发的调用方同时重试（重试风暴），加入抖动后请求被摊开
+- 多个调用共用 CircuitBreaker：下游持续失败时熔断，直接进入 exec_fallback
+
+复用示例 06 的 UnstableApiNode。
+"""
+
+import asyncio
+import random
+import time
+from collections import Counter
+
+from pocketflow import AsyncParallelBatchNode, AsyncFlow, Flow
+from flow_utils import AsyncRetryNode, CircuitBreaker, RetryNode, RetryPolicy, load_example
+
+retry = load_example("06_retry_node.py")
+
+
+class PolicyApiNode(retry.UnstableApiNode, RetryNode):
+    """示例 06 的节点，改用 RetryPolicy 重试"""
+
+    def on_retry(self, exc, delay):
+        print(f"  [退避] {delay:.2f}s 后重试")
+
+
+# ---------- 重试风暴：一段时间内完全不可用的 API ----------
+
+class FlakyService:
+    """前 outage 秒全部失败，之后恢复；记录每次重试调用的时间"""
+
+    def __init__(self, outage: float):
+        self.outage = outage
+        self.seen = set()
+        self.retries = []
+        self.start = time.perf_counter()
+
+    async def call(self, client: int) -> str:
+        now = time.perf_counter() - self.start
+        if client in self.seen:
+            self.retries.append(now)
+        self.seen.add(client)
+        await asyncio.sleep(0.005)
+        if now < self.outage:
+            raise ConnectionError("服务不可用")
+        return f"client {client} ok"
+
+    def peak(self, bucket: float = 0.02) -> int:
+        """每 bucket 秒内重试次数的最大值"""
+        return max(Counter(int(t / bucket) for t in self.retries).values())
+
+
+class FixedWaitClients(AsyncParallelBatchNode):
+    """PocketFlow 原生的固定间隔重试"""
+
+    async def prep_async(self, shared):
+        return list(range(shared["clients"]))
+
+    async def exec_async(self, client):
+        return await self.params["service"].call(client)
+
+    async def exec_fallback_async(self, client, exc):
+        return f"client {client} 放弃"
+
+    async def post_async(self, shared, prep_res, exec_res):
+        shared["results"] = exec_res
+
+
+class JitterClients(FixedWaitClients, AsyncRetryNode):
+    """同样的调用，改用指数退避 + full jitter"""
+
+
+async def retry_storm():
+    results = {}
+    for name, make_node in [
+        ("固定间隔 wait=0.05", lambda: FixedWaitClients(max_retries=8, wait=0.05)),
+        ("退避 + jitter", lambda: JitterClients(RetryPolicy(max_attempts=8, base=0.05, cap=0.4, seed=0))),
+    ]:
+        service = FlakyService(outage=0.2)
+        flow = AsyncFlow(start=make_node())
+        flow.set_params({"service": service})
+        shared = {"clients": 50}
+        await flow.run_async(shared)
+        ok = sum("ok" in r for r in shared["results"])
+        during_outage = sum(t < service.outage for t in service.retries)
+        results[name] = (during_outage, service.peak(), ok)
+    return results
+
+
+# ---------- 熔断：持续不可用的下游 ----------
+
+class DownstreamNode(RetryNode):
+    """每次调用都失败的下游服务"""
+
+    calls = 0
+
+    def exec(self, prompt):
+        DownstreamNode.calls += 1
+        raise ConnectionError("下游不可用")
+
+    def exec_fallback(self, prompt, exc):
+        return f"兜底（{type(exc).__name__}）"
+
+    def post(self, shared, prep_res, exec_res):
+        shared.setdefault("results", []).append(exec_res)
+
+
+if __name__ == "__main__":
+    # --- 1. 同步节点：前三次调用失败，观察每次的退避时间 ---
+    random.seed(3)
+    print("=== 指数退避 + full jitter（max_attempts=5, base=0.1s, 累计最多 1s）===\n")
+    policy = RetryPolicy(max_attempts=5, base=0.1, cap=1.0, max_total_delay=1.0, retry_on=(ConnectionError,), seed=0)
+    shared = {"prompt": "解释量子计算"}
+    Flow(start=PolicyApiNode(policy)).run(shared)
+
+    # --- 2. 50 个并发调用方遇到 0.2 秒故障 ---
+    print("\n=== 重试风暴：50 个调用方，服务前 0.2s 不可用 ===\n")
+    for name, (during_outage, peak, ok) in asyncio.run(retry_storm()).items():
+        print(f"{name:<18} 故障期间重试 {during_outage:>4} 次，20ms 内重试峰值 {peak:>3}，成功 {ok}/50")
+
+    # --- 3. 熔断：最近 10 次中失败过半即熔断，冷却 60 秒 ---
+    print("\n=== 熔断器：下游持续不可用，30 个请求 ===\n")
+    breaker = CircuitBreaker(failure_rate=0.5, window=10, min_calls=5, cooldown=60)
+    node = DownstreamNode(RetryPolicy(max_attempts=3, base=0.001), breaker)
+    shared = {}
+    for _ in range(30):
+        Flow(start=node).run(shared)
+    print(f"实际调用下游 {DownstreamNode.calls} 次，熔断拒绝 {breaker.rejected} 次，熔断器状态：{breaker.state}")
+    print(f"前两个请求：{shared['results'][:2]}，最后一个：{shared['results'][-1]}")
@@ -0,0 +1,79 @@
+"""
+示例 14：检查点与断点续跑
+对应教程：第 1.3 节 —— Flow 图执行（案例 02 写作工作流）
+
+演示：
+- CheckpointFlow 在每个节点 post 之后追加一条增量检查点（变化的 shared 键 + 下一个节点）
+- 润色一步崩溃后，resume() 回放日志，从润色继续，大纲和初稿不再调用 LLM
+- 流程跑完后再次 resume() 不会执行任何节点
+
+复用案例 02 的写作节点。写检查点的开销见 benchmarks/bench_checkpoint.py。
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+
+from flow_utils import CheckpointFlow, load_example, read_checkpoints
+from flow_utils.examples import CASES_DIR
+
+writing = load_example("02_writing_workflow.py", CASES_DIR)
+
+llm_calls = []
+
+
+def counted_llm(prompt):
+    llm_calls.append(prompt.split("\n")[0][:12])
+    return mock_call_llm(prompt)
+
+
+mock_call_llm = writing.mock_call_llm
+writing.mock_call_llm = counted_llm  # 节点通过模块里的全局名调用，替换后即可计数
+
+
+class CrashingPolish(writing.PolishNode):
+    """第一次运行时模拟进程在润色阶段崩溃"""
+
+    crash = True
+
+    def exec(self, draft):
+        if CrashingPolish.crash:
+            raise RuntimeError("进程在润色时被杀死")
+        return super().exec(draft)
+
+
+def build_flow(path):
+    outline, draft, polish = writing.OutlineNode(), writing.WriteDraftNode(), CrashingPolish()
+    outline >> draft >> polish
+    return CheckpointFlow(start=outline, path=path)
+
+
+if __name__ == "__main__":
+    path = os.path.join(tempfile.mkdtemp(), "writing.ckpt")
+
+    print("=== 第一次运行：在润色时崩溃 ===\n")
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_flow(path).run({"topic": "PocketFlow 入门指南"})
+    except RuntimeError as e:
+        print(f"崩溃：{e}")
+    print(f"LLM 调用：{llm_calls}")
+    for record in read_checkpoints(path)[1:]:
+        print(f"  检查点：节点 {record['node']} → 下一个 {record['next']}，写入键 {list(record['set'])}")
+    print(f"日志大小：{os.path.getsize(path)} 字节")
+
+    print("\n=== 重启后续跑 ===\n")
+    CrashingPolish.crash = False
+    llm_calls.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        shared = {}
+        build_flow(path).resume(shared)  # 新进程里重新建图，shared 从日志恢复
+    print(f"LLM 调用：{llm_calls}（只重跑了润色）")
+    print(f"最终文章标题：{shared['final_article'].splitlines()[0]}")
+
+    print("\n=== 已完成的流程再次续跑 ===\n")
+    llm_calls.clear()
+    shared = {}
+    build_flow(path).resume(shared)
+    print(f"LLM 调用：{llm_calls}，shared 键：{list(shared)}")
@@ -0,0 +1,81 @@
+"""
+示例 15：线程池并行的 BatchNode
+对应教程：第 3.4 节 —— BatchNode 批量处理
+
+演示：
+- exec 是阻塞的同步调用（如只有同步接口的 SDK）时，BatchNode 总耗时 = N × 单次延迟
+- ParallelBatchNode 把 item 交给有界线程池，结果顺序与输入一致
+- 每个 item 的重试和 exec_fallback 与 BatchNode 相同，互不影响
+
+复用示例 08 的 TranslateBatchNode 和案例 06 的 EvalResume。
+"""
+
+import contextlib
+import io
+import time
+
+from pocketflow import Flow
+from flow_utils import ParallelBatchNode, load_example
+from flow_utils.examples import CASES_DIR
+
+batch = load_example("08_batch_node.py")
+map_reduce = load_example("06_map_reduce.py", CASES_DIR)
+
+SDK_LATENCY = 0.2  # 模拟同步 SDK 每次调用阻塞 0.2 秒
+
+
+class BlockingTranslate(batch.TranslateBatchNode):
+    """翻译前阻塞等待，模拟同步 SDK；"重试" 开头的文本前两次调用失败，"失败" 开头的总是失败"""
+
+    def exec(self, text):
+        time.sleep(SDK_LATENCY)
+        if text.startswith("失败") or (text.startswith("重试") and self.cur_retry < 2):
+            raise ConnectionError(f"第 {self.cur_retry + 1} 次调用超时")
+        return super().exec(text)
+
+    def exec_fallback(self, text, exc):
+        return f"[未翻译] {text}（{exc}）"
+
+
+class ParallelTranslate(ParallelBatchNode, BlockingTranslate):
+    max_workers = 4
+
+
+class BlockingEval(map_reduce.EvalResume):
+    def exec(self, resume):
+        time.sleep(SDK_LATENCY)
+        return super().exec(resume)
+
+
+class ParallelEval(ParallelBatchNode, BlockingEval):
+    pass
+
+
+def timed_run(node, shared):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        Flow(start=node).run(shared)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    texts = ["你好世界", "PocketFlow 很简单", "重试两次后成功", "批量处理真方便", "失败后走兜底", "每个元素独立重试"]
+
+    print(f"=== 翻译 {len(texts)} 条文本（每次调用阻塞 {SDK_LATENCY}s，max_retries=3）===\n")
+    results = {}
+    for name, cls in [("BatchNode", BlockingTranslate), ("ParallelBatchNode", ParallelTranslate)]:
+        shared = {"texts": texts}
+        elapsed = timed_run(cls(max_retries=3), shared)
+        results[name] = shared["translations"]
+        print(f"{name:<18} {elapsed:.2f}s")
+    assert results["BatchNode"] == results["ParallelBatchNode"]
+    print("\n结果（两种节点完全一致，顺序与输入相同）：")
+    for text, translated in zip(texts, results["ParallelBatchNode"]):
+        print(f"  {text} → {translated}")
+
+    print("\n=== 案例 06：评估 20 份简历 ===\n")
+    resumes = [f"候选人{i}，Python 开发者，{i % 10}年经验，熟悉 AI 和机器学习" for i in range(20)]
+    for name, node in [("BatchNode", BlockingEval()), ("ParallelBatchNode", ParallelEval())]:
+        shared = {"resumes": resumes}
+        elapsed = timed_run(node, shared)
+        print(f"{name:<18} {elapsed:.2f}s，第一名：{shared['scores'][0]['resume'].split('，')[0]}")
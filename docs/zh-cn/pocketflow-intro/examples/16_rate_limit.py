@@ -0,0 +1,96 @@
+"""
+示例 16：并发上限与令牌桶限流
+对应教程：第 3.5 节 —— AsyncNode 异步并发
+
+演示：
+- AsyncParallelBatchNode 一次性并发全部 item；LimitedParallelBatchNode 最多 max_concurrency 个同时进行
+- 两个 Flow 共用一个 RateLimiter，总并发和每秒请求数都不超过后端的配额
+- 按每个 item 的 token 数扣减 tokens/sec 令牌桶
+
+复用示例 09 的 FetchUrlNode 和案例 07 的 ParallelProcess；
+模拟请求的 sleep 换成 50 ms，便于用更多 item 演示。
+"""
+
+import asyncio
+import contextlib
+import io
+import time
+
+from pocketflow import AsyncFlow
+from flow_utils import AsyncioShim, LatencyModel, LimitedParallelBatchNode, RateLimiter, load_example, patched
+from flow_utils.examples import CASES_DIR
+
+fetch = load_example("09_async_parallel.py")
+parallel = load_example("07_parallel_processing.py", CASES_DIR)
+
+
+class ConcurrencyProbe:
+    """包在模拟请求外面，记录同时进行的请求数峰值"""
+
+    def __init__(self):
+        self.current = self.peak = 0
+
+    def wrap(self, cls):
+        probe = self
+
+        class Probed(cls):
+            async def exec_async(self, item):
+                probe.current += 1
+                probe.peak = max(probe.peak, probe.current)
+                try:
+                    return await super().exec_async(item)
+                finally:
+                    probe.current -= 1
+
+        return Probed
+
+
+class LimitedFetch(LimitedParallelBatchNode, fetch.FetchUrlNode):
+    max_concurrency = 20
+
+
+class LimitedProcess(LimitedParallelBatchNode, parallel.ParallelProcess):
+    def item_tokens(self, item):
+        return len(item) * 10  # 按任务名长度估计 token 数
+
+
+async def run(node, shared):
+    start = time.perf_counter()
+    await AsyncFlow(start=node).run_async(shared)
+    return time.perf_counter() - start
+
+
+def quiet():
+    return contextlib.redirect_stdout(io.StringIO())  # 节点逐条 print，这里只看汇总
+
+
+async def main():
+    urls = [f"https://api.example.com/data{i}" for i in range(500)]
+
+    print(f"=== {len(urls)} 个 URL：不限并发 vs max_concurrency=20 ===\n")
+    for name, cls in [("AsyncParallelBatchNode", fetch.FetchUrlNode), ("LimitedParallelBatchNode", LimitedFetch)]:
+        probe = ConcurrencyProbe()
+        shared = {"urls": urls}
+        with quiet():
+            elapsed = await run(probe.wrap(cls)(), shared)
+        print(f"{name:<26} 峰值并发 {probe.peak:>4}，耗时 {elapsed:.2f}s，结果 {len(shared['results'])} 个")
+
+    print("\n=== 两个 Flow 共用限流器：并发 ≤ 10，≤ 100 请求/秒，≤ 20000 token/秒 ===\n")
+    limiter = RateLimiter(max_concurrency=10, requests_per_sec=100, tokens_per_sec=20000, burst=0.1)
+    LimitedFetch.limiter = LimitedProcess.limiter = limiter
+    LimitedFetch.max_concurrency = None  # 节点本身不限，只受共享限流器约束
+    start = time.perf_counter()
+    with quiet():
+        await asyncio.gather(
+            run(LimitedFetch(), {"urls": urls[:100]}),
+            run(LimitedProcess(), {"items": [f"任务_{i + 1}" for i in range(100)]}),
+        )
+    elapsed = time.perf_counter() - start
+    print(f"共 {limiter.total_requests} 个请求，耗时 {elapsed:.2f}s，"
+          f"平均 {limiter.total_requests / elapsed:.0f} 请求/秒，峰值并发 {limiter.peak_in_flight}")
+
+
+if __name__ == "__main__":
+    shim = AsyncioShim(LatencyModel(ms=50))
+    with patched(fetch, asyncio=shim), patched(parallel, asyncio=shim):
+        asyncio.run(main())
@@ -0,0 +1,73 @@
+"""
+示例 17：按完成顺序流式处理并行结果
+对应教程：第 3.5 节 —— AsyncNode 异步并发
+
+演示：
+- AsyncParallelBatchNode 要等最慢的 URL 返回，post_async 才能看到任何结果
+- StreamingParallelBatchNode 每完成一个就调用 post_item_async，快的结果立即被处理
+- deadline 到期后带着部分结果进入 post_async，未完成的位置是 TIMED_OUT
+- post_item_async 处理得慢时，deadline 之前已完成、还没来得及处理的结果不算超时
+
+复用示例 09 的 FetchUrlNode（prep 与 post），请求耗时按 URL 设定，其中一个是 3 秒的长尾。
+"""
+
+import asyncio
+import time
+
+from pocketflow import AsyncFlow
+from flow_utils import TIMED_OUT, StreamingParallelBatchNode, load_example
+
+fetch = load_example("09_async_parallel.py")
+
+LATENCY = {f"https://api.example.com/data{i}": 0.1 * (i + 1) for i in range(5)}
+LATENCY["https://api.example.com/slow"] = 3.0
+
+
+class TailFetch(fetch.FetchUrlNode):
+    """与示例 09 相同的节点，请求耗时按 URL 不同"""
+
+    async def exec_async(self, url):
+        await asyncio.sleep(LATENCY[url])
+        return f"内容来自 {url}"
+
+    async def post_async(self, shared, prep_res, exec_res):
+        shared["results"] = exec_res
+        done = sum(r is not TIMED_OUT for r in exec_res)
+        print(f"  +{time.perf_counter() - shared['start']:.2f}s post_async：{done}/{len(exec_res)} 个结果")
+
+
+class StreamingFetch(StreamingParallelBatchNode, TailFetch):
+    async def post_item_async(self, shared, index, url, result):
+        # 例如立即写入下游存储，不必等其他 URL
+        print(f"  +{time.perf_counter() - shared['start']:.2f}s 处理 {url.rsplit('/', 1)[1]}")
+
+
+class DeadlineFetch(StreamingFetch):
+    deadline = 1.0
+
+
+class SlowConsumerFetch(DeadlineFetch):
+    async def post_item_async(self, shared, index, url, result):
+        await asyncio.sleep(0.4)  # 例如逐条写入较慢的存储
+        await super().post_item_async(shared, index, url, result)
+
+
+async def main():
+    urls = list(LATENCY)
+    for title, node in [
+        ("AsyncParallelBatchNode（gather）", TailFetch()),
+        ("StreamingParallelBatchNode", StreamingFetch()),
+        ("StreamingParallelBatchNode，deadline=1s", DeadlineFetch()),
+        ("StreamingParallelBatchNode，deadline=1s，post_item_async 每条 0.4s", SlowConsumerFetch()),
+    ]:
+        print(f"=== {title} ===")
+        shared = {"urls": urls, "start": time.perf_counter()}
+        await AsyncFlow(start=node).run_async(shared)
+        print()
+    timed_out = [url for url, r in zip(urls, shared["results"]) if r is TIMED_OUT]
+    print(f"慢消费方 + deadline 下超时的 URL：{timed_out}")
+    assert timed_out == ["https://api.example.com/slow"], "deadline 前已完成的结果不应标记为 TIMED_OUT"
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
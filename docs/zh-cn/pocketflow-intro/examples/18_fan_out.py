@@ -0,0 +1,83 @@
+"""
+示例 18：并行分支（fan-out / fan-in）
+对应教程：第 3.3 节 —— Flow 图执行引擎
+
+演示：
+- 示例 07 中格式验证与长度验证互不依赖，却被串成子流程依次执行
+- FanOut 并发执行这两个分支，ProcessNode 作为汇合点，在两者都完成后运行
+- 用 Tracer 查看关键路径：总耗时从两个分支之和降到最长的那个分支
+- AsyncFanOut 在 AsyncFlow 中做同样的事
+
+复用示例 07 的节点，验证节点各加上模拟的调用耗时。
+"""
+
+import asyncio
+import contextlib
+import io
+import time
+
+from pocketflow import AsyncFlow, Flow
+from flow_utils import AsyncFanOut, FanOut, Tracer, load_example
+
+nested = load_example("07_nested_flow.py")
+
+
+class SlowFormat(nested.ValidateFormatNode):
+    def exec(self, data):
+        time.sleep(0.3)  # 模拟调用格式校验服务
+        return super().exec(data)
+
+
+class SlowLength(nested.ValidateLengthNode):
+    def exec(self, data):
+        time.sleep(0.5)  # 模拟调用长度校验服务
+        return super().exec(data)
+
+
+def sequential():
+    """与示例 07 相同：验证子流程中两个节点依次执行"""
+    validate_format, validate_length = SlowFormat(), SlowLength()
+    validate_format >> validate_length
+    prepare, process = nested.PrepareNode(), nested.ProcessNode()
+    prepare >> Flow(start=validate_format) >> process
+    return Flow(start=prepare)
+
+
+def fan_out():
+    """两个验证节点并行，ProcessNode 是汇合点"""
+    prepare, process = nested.PrepareNode(), nested.ProcessNode()
+    prepare >> FanOut(SlowFormat(), SlowLength()) >> process
+    return Flow(start=prepare)
+
+
+def async_fan_out():
+    prepare, process = nested.PrepareNode(), nested.ProcessNode()
+    prepare >> AsyncFanOut(SlowFormat(), SlowLength()) >> process
+    return AsyncFlow(start=prepare)
+
+
+if __name__ == "__main__":
+    raw = "  PocketFlow 是极简 LLM 框架  "
+
+    print("=== 并行分支的执行过程 ===\n")
+    fan_out().run({"raw_input": raw})
+
+    print("\n=== 耗时对比 ===\n")
+    for name, build in [("依次执行（示例 07）", sequential), ("FanOut（线程）", fan_out)]:
+        shared = {"raw_input": raw}
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            build().run(shared)
+        print(f"{name:<20}{time.perf_counter() - start:.2f}s  {shared['result']}")
+    shared = {"raw_input": raw}
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(async_fan_out().run_async(shared))
+    print(f"{'AsyncFanOut':<20}{time.perf_counter() - start:.2f}s  {shared['result']}")
+
+    print("\n=== 关键路径 ===\n")
+    flow = fan_out()
+    tracer = Tracer().attach(flow)
+    with contextlib.redirect_stdout(io.StringIO()):
+        flow.run({"raw_input": raw})
+    tracer.print_summary(min_ms=1)
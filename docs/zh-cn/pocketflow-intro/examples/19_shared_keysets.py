@@ -0,0 +1,87 @@
+"""
+示例 19：shared 读写集合追踪与并行调度
+对应教程：第 2 节 —— Shared：节点间的通信机制
+
+演示：
+- profile_flow 用 TrackedShared 跑一遍 Flow，记录每个节点读写了哪些键
+- 由读写冲突得到节点间的依赖图（可导出 Graphviz）
+- 互不冲突的节点分到同一层，parallelize() 把它们包进 FanOut 并发执行
+- required_nodes 找出产出指定键所需的最少节点，其余节点可以跳过
+
+复用示例 05 的节点，另加一个只读 question 的关键词节点；翻译和关键词各有模拟的调用耗时。
+"""
+
+import contextlib
+import io
+import time
+
+from pocketflow import Node, Flow
+from flow_utils import profile_flow, load_example
+
+store = load_example("05_shared_store.py")
+
+
+class SlowTranslate(store.TranslateNode):
+    def exec(self, data):
+        time.sleep(0.3)  # 模拟调用翻译 API
+        return super().exec(data)
+
+
+class KeywordNode(Node):
+    """提取关键词：只依赖原始问题，与翻译互不影响"""
+
+    def prep(self, shared):
+        return shared["question"]
+
+    def exec(self, question):
+        time.sleep(0.3)  # 模拟调用关键词抽取 API
+        return [w for w in ("PocketFlow", "LLM") if w in question]
+
+    def post(self, shared, prep_res, exec_res):
+        shared["keywords"] = exec_res
+
+
+def build_flow():
+    input_node, translate, keywords, answer = store.InputNode(), SlowTranslate(), KeywordNode(), store.AnswerNode()
+    input_node >> translate >> keywords >> answer
+    return Flow(start=input_node)
+
+
+def timed(flow):
+    shared = {}
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        flow.run(shared)
+    return time.perf_counter() - start, shared
+
+
+if __name__ == "__main__":
+    flow = build_flow()
+    with contextlib.redirect_stdout(io.StringIO()):
+        profile = profile_flow(flow, {})
+
+    print("=== 各节点的读写集合 ===\n")
+    for node in profile.nodes:
+        print(f"{profile.name(node):<14} 读 {sorted(profile.reads[node])}  写 {sorted(profile.writes[node])}")
+
+    print("\n=== 依赖关系 ===\n")
+    for a, b, keys in profile.dependencies():
+        print(f"{profile.name(a)} → {profile.name(b)}：{sorted(keys)}")
+
+    print("\n=== 分层（同一层可以并发）===\n")
+    for i, layer in enumerate(profile.levels()):
+        print(f"第 {i} 层：{[profile.name(node) for node in layer]}")
+
+    print("\n=== 运行对比 ===\n")
+    seq_time, seq_shared = timed(build_flow())
+    par_time, par_shared = timed(profile.parallelize())
+    print(f"原始顺序   {seq_time:.2f}s")
+    print(f"并行调度   {par_time:.2f}s，结果一致：{seq_shared == par_shared}")
+
+    print("\n=== 只需要 answer 时 ===\n")
+    needed = profile.required_nodes(["answer"])
+    skipped = [profile.name(node) for node in profile.nodes if node not in needed]
+    print(f"需要运行：{[profile.name(node) for node in needed]}，可以跳过：{skipped}")
+
+    print("\n=== Graphviz（dot -Tpng 渲染）===\n")
+    print(profile.to_dot())
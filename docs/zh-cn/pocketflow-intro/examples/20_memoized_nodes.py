@@ -0,0 +1,126 @@
+"""
+示例 20：按 prep 结果缓存 exec
+对应教程：第 1.1 节 —— Node 的三段式（prep → exec → post）
+
+演示：
+- exec 只依赖 prep_res，MemoNode 以 prep_res 的哈希为键缓存 exec 结果，重复的问题不再调用 LLM
+- memo_stats(flow) 查看每个节点的命中率
+- 覆盖 memo_key：案例 03 的 ChunkNode 的 prep_res 含有整个索引清单，只取文档和已有 chunk 哈希作为键
+- AsyncMemoNode 合并进行中的相同调用：20 个并发请求里只有 4 个不同的问题，只调用 4 次
+- exec_fallback 的返回值不进入缓存，下次仍会重新调用 exec
+
+复用示例 03 的 ThinkNode / OutputNode 和案例 03 的 ChunkNode。
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import io
+import json
+import pickle
+import sys
+import time
+
+from pocketflow import AsyncParallelBatchNode, Flow
+from flow_utils import MemoNode, AsyncMemoNode, memo_stats, load_example
+from flow_utils.examples import CASES_DIR
+
+if CASES_DIR not in sys.path:
+    sys.path.insert(0, CASES_DIR)  # 案例 03 需要导入 rag_utils
+
+chain = load_example("03_flow_chain.py")
+rag = load_example("03_rag.py", CASES_DIR)
+
+LLM_LATENCY = 0.2  # 模拟一次 LLM 调用的耗时
+
+
+class SlowThink(chain.ThinkNode):
+    calls = 0
+
+    def exec(self, question):
+        SlowThink.calls += 1
+        time.sleep(LLM_LATENCY)
+        return super().exec(question)
+
+
+class MemoThink(MemoNode, SlowThink):
+    pass
+
+
+class MemoOutput(MemoNode, chain.OutputNode):
+    pass
+
+
+class MemoChunk(MemoNode, rag.ChunkNode):
+    def memo_key(self, prep_res):
+        # 清单里有 embedding 矩阵，整体 pickle 代价太大；切分计划只取决于文档内容、
+        # 清单中各文档的行号（含已删除文档留下的墓碑）、行数和已有 chunk 的哈希
+        docs, manifest = prep_res
+        data = pickle.dumps((sorted(docs.items()), json.dumps(manifest["docs"], sort_keys=True),
+                             manifest["count"], manifest["hashes"].tobytes()))
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class AsyncThink(AsyncParallelBatchNode, AsyncMemoNode):
+    calls = 0
+
+    async def prep_async(self, shared):
+        return shared["questions"]
+
+    async def exec_async(self, question):
+        AsyncThink.calls += 1
+        await asyncio.sleep(LLM_LATENCY)
+        if question.startswith("超时"):
+            raise TimeoutError("LLM 调用超时")
+        return f"关于「{question}」的回答"
+
+    async def exec_fallback_async(self, question, exc):
+        return f"[稍后再试] {question}"
+
+    async def post_async(self, shared, prep_res, exec_res):
+        shared["answers"] = exec_res
+
+
+def build_chain(think_cls, output_cls):
+    think, output = think_cls(), output_cls()
+    think >> output
+    return Flow(start=think)
+
+
+if __name__ == "__main__":
+    questions = ["什么是 PocketFlow？", "Node 有哪三个阶段？", "什么是 PocketFlow？",
+                 "Flow 如何选择下一个节点？", "什么是 PocketFlow？", "Node 有哪三个阶段？"] * 2
+
+    print(f"=== 示例 03：{len(questions)} 次提问，其中 {len(set(questions))} 个不同的问题 ===\n")
+    for name, flow in [("Node", build_chain(SlowThink, chain.OutputNode)), ("MemoNode", build_chain(MemoThink, MemoOutput))]:
+        SlowThink.calls = 0
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for question in questions:
+                flow.run({"question": question})
+        print(f"{name:<9} {time.perf_counter() - start:.2f}s，调用 LLM {SlowThink.calls} 次")
+    for node, stats in memo_stats(flow).items():
+        print(f"  {node:<11} 命中 {stats['hits']} / 未命中 {stats['misses']}，命中率 {stats['hit_rate']:.0%}")
+
+    print("\n=== 案例 03：ChunkNode 的切分计划 ===\n")
+    docs = {"intro": "PocketFlow 是一个 100 行代码的极简 LLM 框架。" * 4, "node": "Node 分为 prep、exec、post 三个阶段。" * 4}
+    chunk = MemoChunk()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(3):
+            Flow(start=chunk).run({"documents": docs})
+        Flow(start=chunk).run({"documents": {**docs, "node": docs["node"] + "Flow 负责编排。"}})
+    stats = chunk.memo_stats
+    print(f"相同文档切分 3 次 + 修改一篇后再切分 1 次：命中 {stats.hits}，未命中 {stats.misses}")
+
+    print("\n=== AsyncMemoNode：合并并发的相同调用 ===\n")
+    batch = ["什么是 PocketFlow？", "Node 有哪三个阶段？", "Flow 如何选择下一个节点？", "超时的问题"] * 5
+    think = AsyncThink()
+    for round_name in ["第一轮", "第二轮"]:
+        AsyncThink.calls = 0
+        shared = {"questions": batch}
+        start = time.perf_counter()
+        asyncio.run(think.run_async(shared))
+        stats = think.memo_stats.as_dict()
+        print(f"{round_name}：{len(batch)} 个请求，{time.perf_counter() - start:.2f}s，"
+              f"实际调用 exec_async {AsyncThink.calls} 次；累计 {stats}")
+    print(f"\n兜底结果没有缓存，第二轮只重新调用了「超时的问题」：{shared['answers'][3]}")
@@ -0,0 +1,76 @@
+"""
+检查点开销基准测试
+
+Generate ↔ Check 循环（节点几乎不做事）跑 --iters 轮，比较每个节点的平均耗时（µs/node）：
+- Flow：不写检查点
+- CheckpointFlow：每个节点后追加增量检查点
+- CheckpointFlow + fsync：每条记录都落盘
+
+shared 中另放一个 --payload 项的列表：
+- static：列表不变，只有计数器变化，增量很小
+- growing：每轮往列表追加一项，每次都要重新序列化整个列表
+
+运行：
+  python benchmarks/bench_checkpoint.py
+  python benchmarks/bench_checkpoint.py --iters 5000 --payload 10000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pocketflow import Node, Flow
+from flow_utils import CheckpointFlow
+
+
+class Generate(Node):
+    def prep(self, shared):
+        shared["attempt"] += 1
+        if shared["grow"]:
+            shared["payload"].append(shared["attempt"])
+
+
+class Check(Node):
+    def post(self, shared, prep_res, exec_res):
+        return "accept" if shared["attempt"] >= shared["iters"] else "retry"
+
+
+def bench(make_flow, iters: int, payload: int, grow: bool) -> float:
+    generate, check, done = Generate(), Check(), Node()
+    generate >> check
+    check - "retry" >> generate
+    check - "accept" >> done
+    shared = {"attempt": 0, "iters": iters, "grow": grow, "payload": list(range(payload))}
+    flow = make_flow(generate)
+    start = time.perf_counter()
+    flow.run(shared)
+    return (time.perf_counter() - start) / (2 * iters + 1) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iters", type=int, default=20_000, help="循环轮数")
+    parser.add_argument("--payload", type=int, default=1000, help="shared 中列表的初始长度")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.ckpt")
+    flows = {
+        "Flow": lambda start: Flow(start=start),
+        "CheckpointFlow": lambda start: CheckpointFlow(start=start, path=path),
+        "CheckpointFlow+fsync": lambda start: CheckpointFlow(start=start, path=path, fsync=True),
+    }
+    print(f"{'模式':<24}{'static µs/node':>16}{'growing µs/node':>18}")
+    for name, make_flow in flows.items():
+        iters = args.iters if "fsync" not in name else max(1, args.iters // 20)  # fsync 很慢，少跑一些
+        static = bench(make_flow, iters, args.payload, grow=False)
+        growing = bench(make_flow, iters, args.payload, grow=True)
+        print(f"{name:<24}{static:>16.2f}{growing:>18.2f}")
+    print(f"\n最后一次运行的日志大小：{os.path.getsize(path) / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
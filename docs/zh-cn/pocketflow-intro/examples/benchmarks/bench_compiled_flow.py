@@ -0,0 +1,129 @@
+"""
+编译模式调度开销基准测试
+
+节点本身几乎不做事，测出来的就是 Flow 每一步的调度成本（steps/sec）：
+- loop：Generate ↔ Check 循环（示例 10、案例 09 的图结构），跑 --iters 轮
+- chain：--chain-len 个 pure 节点组成的线性链，重复运行 --runs 次
+
+对比三种模式：原版 Flow、CompiledFlow（不融合）、CompiledFlow（融合 pure 节点）。
+最后用 run_many 的线程模式并发运行同一个 Flow，检查会重试的 pure 节点在并发下不丢结果。
+
+运行：
+  python benchmarks/bench_compiled_flow.py
+  python benchmarks/bench_compiled_flow.py --iters 500000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pocketflow import Node, Flow
+from flow_utils import CompiledFlow, run_many
+
+
+class Generate(Node):
+    def prep(self, shared):
+        shared["attempt"] += 1
+
+
+class Check(Node):
+    def post(self, shared, prep_res, exec_res):
+        return "accept" if shared["attempt"] >= shared["iters"] else "retry"
+
+
+class Step(Node):
+    pure = True
+
+    def post(self, shared, prep_res, exec_res):
+        shared["steps"] += 1
+
+
+class Flaky(Node):
+    """一半概率失败、靠重试完成的 pure 节点"""
+    pure = True
+
+    def exec(self, prep_res):
+        time.sleep(0.0001)
+        if random.random() < 0.5:
+            raise ValueError("flaky")
+        return "ok"
+
+    def exec_fallback(self, prep_res, exc):
+        return "fallback"
+
+    def post(self, shared, prep_res, exec_res):
+        shared["result"] = exec_res
+
+
+FLOWS = {
+    "Flow": lambda start: Flow(start=start),
+    "Compiled": lambda start: CompiledFlow(start=start, fuse=False),
+    "Compiled+fuse": lambda start: CompiledFlow(start=start),
+}
+
+
+def bench_loop(make_flow, iters: int) -> float:
+    generate, check, done = Generate(), Check(), Node()
+    generate >> check
+    check - "retry" >> generate
+    check - "accept" >> done
+    shared = {"attempt": 0, "iters": iters}
+    start = time.perf_counter()
+    make_flow(generate).run(shared)
+    elapsed = time.perf_counter() - start
+    return (2 * iters + 1) / elapsed
+
+
+def bench_chain(make_flow, length: int, runs: int) -> float:
+    nodes = [Step() for _ in range(length)]
+    for a, b in zip(nodes, nodes[1:]):
+        a >> b
+    flow = make_flow(nodes[0])
+    shared = {"steps": 0}
+    start = time.perf_counter()
+    for _ in range(runs):
+        flow.run(shared)
+    elapsed = time.perf_counter() - start
+    return shared["steps"] / elapsed
+
+
+def check_concurrent(make_flow, jobs: int, workers: int) -> int:
+    """并发运行同一个 Flow，返回没有拿到结果的运行数（应为 0）"""
+    first = Flaky(max_retries=3)
+    first >> Flaky(max_retries=3)
+    results = run_many(make_flow(first), ({} for _ in range(jobs)), workers=workers)
+    return sum(1 for r in results if r["error"] is not None or r["shared"].get("result") is None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iters", type=int, default=100_000, help="循环轮数")
+    parser.add_argument("--chain-len", type=int, default=10, help="线性链的节点数")
+    parser.add_argument("--runs", type=int, default=20_000, help="线性链重复运行次数")
+    parser.add_argument("--jobs", type=int, default=2000, help="并发检查的运行次数")
+    parser.add_argument("--workers", type=int, default=16, help="并发检查的线程数")
+    args = parser.parse_args()
+
+    print(f"{'模式':<16}{'loop steps/s':>16}{'chain steps/s':>16}")
+    baseline = None
+    for name, make_flow in FLOWS.items():
+        loop_rate = bench_loop(make_flow, args.iters)
+        chain_rate = bench_chain(make_flow, args.chain_len, args.runs)
+        baseline = baseline or (loop_rate, chain_rate)
+        print(f"{name:<16}{loop_rate:>12,.0f} ({loop_rate / baseline[0]:.1f}x)"
+              f"{chain_rate:>10,.0f} ({chain_rate / baseline[1]:.1f}x)")
+
+    print(f"\n并发运行（run_many 线程模式，{args.jobs} 次，{args.workers} 个线程）：")
+    failed = {name: check_concurrent(make_flow, args.jobs, args.workers) for name, make_flow in FLOWS.items()}
+    for name, count in failed.items():
+        print(f"{name:<16}丢失结果 {count}")
+    if any(failed.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
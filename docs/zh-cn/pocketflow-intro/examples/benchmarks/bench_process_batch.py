@@ -0,0 +1,85 @@
+"""
+进程池 BatchNode 扩展性基准测试
+
+案例 06 的简历评分节点，每份简历重复评分 --work 次，模拟纯 Python 的 CPU 密集 exec。
+比较 --items 份简历的吞吐（items/s）：
+- BatchNode：逐个执行
+- ParallelBatchNode：线程池，受 GIL 限制
+- ProcessBatchNode：进程池，分别用 --workers 个 worker；cold 是第一次运行（含启动 worker），
+  warm 是复用常驻 worker 的后续运行
+
+运行：
+  python benchmarks/bench_process_batch.py
+  python benchmarks/bench_process_batch.py --items 2000 --workers 1 2 4 8 16
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pocketflow import Flow
+from flow_utils import ParallelBatchNode, ProcessBatchNode, load_example, shutdown_pools
+from flow_utils.examples import CASES_DIR
+
+map_reduce = load_example("06_map_reduce.py", CASES_DIR)
+
+
+class HeavyEval(map_reduce.EvalResume):
+    def exec(self, resume):
+        for _ in range(self.params["work"]):
+            map_reduce.mock_eval_resume(resume)
+        return super().exec(resume)
+
+
+class ThreadEval(ParallelBatchNode, HeavyEval):
+    pass
+
+
+class ProcessEval(ProcessBatchNode, HeavyEval):
+    pass
+
+
+def throughput(node, resumes, work: int) -> float:
+    flow = Flow(start=node)
+    flow.set_params({"work": work})
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        flow.run({"resumes": resumes})
+        return len(resumes) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=400, help="简历份数")
+    parser.add_argument("--work", type=int, default=2000, help="每份简历重复评分的次数")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--runs", type=int, default=3, help="warm 取最快的一次")
+    args = parser.parse_args()
+
+    resumes = [f"候选人{i}，Python 开发者，{i % 10}年经验，熟悉 AI 和机器学习" for i in range(args.items)]
+    base = throughput(HeavyEval(), resumes, args.work)
+    print(f"CPU 核数 {os.cpu_count()}，{args.items} 份简历，每份评分 {args.work} 次\n")
+    print(f"{'BatchNode':<28}{base:>10,.0f} items/s")
+    thread = ThreadEval()
+    thread.max_workers = max(args.workers)
+    rate = throughput(thread, resumes, args.work)
+    print(f"{'ParallelBatchNode (' + str(thread.max_workers) + ' 线程)':<28}{rate:>10,.0f} items/s ({rate / base:.2f}x)")
+
+    print(f"\n{'ProcessBatchNode':<16}{'cold items/s':>16}{'warm items/s':>16}{'加速比':>8}{'效率':>8}")
+    for workers in args.workers:
+        node = ProcessEval()
+        node.max_workers = workers
+        cold = throughput(node, resumes, args.work)
+        warm = max(throughput(node, resumes, args.work) for _ in range(args.runs))
+        speedup = warm / base
+        print(f"{str(workers) + ' workers':<16}{cold:>16,.0f}{warm:>16,.0f}{speedup:>8.2f}x{speedup / workers:>7.0%}")
+    shutdown_pools()
+
+
+if __name__ == "__main__":
+    main()
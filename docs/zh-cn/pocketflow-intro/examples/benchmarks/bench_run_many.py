@@ -0,0 +1,95 @@
+"""
+run_many 批量运行基准测试
+
+用示例 04 的审核图处理 --jobs 个任务，比较串行 flow.run 与 run_many 线程池 / 进程池的吞吐（jobs/s）：
+- cpu：审核前先做 --work 轮哈希计算，模拟 CPU 密集的节点，线程受 GIL 限制，进程能用满多核
+- io：审核前 sleep --io-ms 毫秒，模拟等待 LLM / 搜索，线程池即可并发
+
+运行：
+  python benchmarks/bench_run_many.py
+  python benchmarks/bench_run_many.py --jobs 5000 --workers 1 2 4 8
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pocketflow import Flow
+from flow_utils import load_example, run_many
+
+cond = load_example("04_conditional_flow.py")
+
+
+class CpuReview(cond.ReviewNode):
+    def exec(self, score):
+        digest = str(score).encode()
+        for _ in range(self.params["work"]):
+            digest = hashlib.sha256(digest).digest()
+        return super().exec(score)
+
+
+class IoReview(cond.ReviewNode):
+    def exec(self, score):
+        time.sleep(self.params["io_ms"] / 1000)
+        return super().exec(score)
+
+
+def build_flow(review_cls, params: dict):
+    review, approve, reject = review_cls(), cond.ApproveNode(), cond.RejectNode()
+    review - "approve" >> approve
+    review - "reject" >> reject
+    flow = Flow(start=review)
+    flow.set_params(params)
+    return flow
+
+
+def serial(flow, jobs):
+    for shared in jobs:
+        flow.run(shared)
+
+
+def bulk(flow, jobs, workers, mode):
+    for result in run_many(flow, jobs, workers=workers, mode=mode, ordered=False):
+        if result["error"]:
+            raise result["error"]
+
+
+def timed(fn, *args) -> float:
+    with contextlib.redirect_stdout(io.StringIO()):  # 丢弃节点的 print
+        start = time.perf_counter()
+        fn(*args)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=2000, help="每种模式处理的任务数")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--work", type=int, default=2000, help="cpu 负载：每个任务的哈希轮数")
+    parser.add_argument("--io-ms", type=float, default=5.0, help="io 负载：每个任务的等待毫秒数")
+    args = parser.parse_args()
+
+    workloads = {
+        "cpu": (CpuReview, args.jobs),
+        "io": (IoReview, max(1, args.jobs // 10)),  # sleep 负载串行太慢，任务数取十分之一
+    }
+    params = {"work": args.work, "io_ms": args.io_ms}
+    for name, (review_cls, n) in workloads.items():
+        flow = build_flow(review_cls, params)
+        jobs = lambda: ({"score": i % 100} for i in range(n))
+        base = n / timed(serial, flow, jobs())
+        print(f"\n[{name}] {n} 个任务，串行 {base:,.0f} jobs/s")
+        print(f"{'workers':>8}{'thread jobs/s':>18}{'process jobs/s':>20}")
+        for workers in sorted(set(args.workers)):
+            rates = [n / timed(bulk, flow, jobs(), workers, mode) for mode in ("thread", "process")]
+            print(f"{workers:>8}" + "".join(f"{rate:>12,.0f} ({rate / base:.1f}x)" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+示例基准测试套件
+
+逐个运行 workloads.py 中登记的工作负载（覆盖全部入门示例和案例示例），输出：
+- flow：每次节点转移的平均耗时（µs/transition）
+- batch：BatchNode 吞吐（items/s）
+- async：并行相对串行的加速比
+
+模拟 LLM、搜索和 sleep 都换成延迟模型：默认 0 ms，测的是纯框架 + 节点逻辑的开销；
+--latency-ms 20 则模拟每次外部调用 20 ms，用来观察批量和并发的收益。
+
+运行：
+  python benchmarks/run_suite.py                          # 运行并与基线比较（如有）
+  python benchmarks/run_suite.py --save-baseline          # 把本次结果存为基线
+  python benchmarks/run_suite.py --filter cases/ --threshold 20
+  python benchmarks/run_suite.py --latency-ms 20 --items 16 --baseline benchmarks/baseline_20ms.json
+
+有回归（比基线差超过 --threshold %）时退出码为 1，可直接用于 CI。
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flow_utils import (
+    LatencyModel, best_time, compare, count_transitions, load_baseline, metric, patched, quiet, save_baseline,
+)
+from workloads import WORKLOADS
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+class Context:
+    """传给工作负载构建函数的参数；patch 的属性在该工作负载测完后恢复"""
+
+    def __init__(self, latency: LatencyModel, items: int, stack: contextlib.ExitStack):
+        self.latency = latency
+        self.items = items
+        self._stack = stack
+
+    def patch(self, target, **attrs):
+        return self._stack.enter_context(patched(target, **attrs))
+
+
+def measure(name: str, kind: str, build, args) -> dict:
+    """构建并测量一个工作负载，返回 {指标名: metric}"""
+    with contextlib.ExitStack() as stack:
+        ctx = Context(LatencyModel(args.latency_ms, args.jitter, args.seed), args.items, stack)
+        spec = quiet(build, ctx)
+        if kind == "flow":
+            with count_transitions() as counter:
+                quiet(spec)  # 预热一次，同时数出一次运行经过多少个节点
+            seconds = quiet(best_time, spec, args.repeat, args.number)
+            return {
+                f"{name}:us_per_transition": metric(seconds / max(1, counter["transitions"]) * 1e6, "µs", "lower"),
+            }
+        if kind == "batch":
+            run, items = spec
+            quiet(run)
+            seconds = quiet(best_time, run, args.repeat, max(1, args.number // 10))
+            return {f"{name}:items_per_sec": metric(items / seconds, "items/s", "higher")}
+        sequential, parallel = spec
+        seq = quiet(best_time, sequential, args.repeat)
+        par = quiet(best_time, parallel, args.repeat)
+        return {f"{name}:speedup": metric(seq / par, "x", "higher")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="只运行名称包含该字符串的工作负载")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="每次模拟外部调用的耗时（毫秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="耗时的均匀抖动比例，如 0.2 表示 ±20%%")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--items", type=int, default=64, help="batch / async 工作负载的 item 数")
+    parser.add_argument("--repeat", type=int, default=5, help="重复轮数，取最快的一轮")
+    parser.add_argument("--number", type=int, default=200, help="flow 工作负载每轮运行次数")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线 JSON 路径")
+    parser.add_argument("--save-baseline", action="store_true", help="把本次结果写入基线")
+    parser.add_argument("--threshold", type=float, default=10.0, help="比基线差超过该百分比即判为回归")
+    args = parser.parse_args()
+    if args.latency_ms > 0:
+        args.number = min(args.number, 5)  # 有延迟时单次运行已足够稳定
+
+    warnings.simplefilter("ignore")  # 示例中的 "Flow ends" 提示不影响测量
+    results = {}
+    for name, (kind, build) in WORKLOADS.items():
+        if args.filter in name:
+            results.update(measure(name, kind, build, args))
+
+    baseline = load_baseline(args.baseline) if os.path.exists(args.baseline) and not args.save_baseline else {}
+    rows = compare(results, baseline, args.threshold)
+    print(f"{'指标':<52}{'本次':>14}{'基线':>14}{'变差':>9}")
+    for row in rows:
+        unit = results[row["name"]]["unit"]
+        base = f"{row['baseline']:.2f}" if row["baseline"] is not None else "-"
+        change = f"{row['change']:+.1f}%" if row["change"] is not None else "-"
+        flag = "  ← 回归" if row["regression"] else ""
+        print(f"{row['name']:<52}{row['value']:>10.2f} {unit:<4}{base:>13}{change:>9}{flag}")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"\n基线已保存：{args.baseline}")
+    regressions = [row["name"] for row in rows if row["regression"]]
+    if regressions:
+        print(f"\n{len(regressions)} 项比基线差超过 {args.threshold:.0f}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+基准测试的工作负载
+
+每个入门示例和案例示例对应一个工作负载：按示例 __main__ 中的方式连接节点，
+把模拟 LLM / 搜索 / sleep 换成 ctx.latency 延迟模型，返回可重复调用的运行函数。
+
+三种类型：
+- flow：返回 run()，测每次节点转移的平均耗时
+- batch：返回 (run(), item 数)，测 items/s
+- async：返回 (串行 run(), 并行 run())，测加速比
+"""
+
+import asyncio
+import os
+import random
+import sys
+
+from pocketflow import AsyncFlow, Flow
+
+from flow_utils import AsyncioShim, CompiledFlow, ParallelBatchNode, load_example, with_latency
+from flow_utils.examples import CASES_DIR
+
+
+WORKLOADS = {}  # 名称 → (类型, 构建函数)
+
+
+def workload(name: str, kind: str):
+    def register(build):
+        WORKLOADS[name] = (kind, build)
+        return build
+    return register
+
+
+def intro(filename: str):
+    return load_example(filename)
+
+
+def case(filename: str):
+    if CASES_DIR not in sys.path:
+        sys.path.insert(0, CASES_DIR)  # 案例 03 需要导入 rag_utils
+    return load_example(filename, CASES_DIR)
+
+
+def slow(ctx, module, *names):
+    """给 module 中的模拟函数加上延迟模型"""
+    for name in names:
+        ctx.patch(module, **{name: with_latency(getattr(module, name), ctx.latency)})
+
+
+def slow_exec(ctx, cls):
+    """exec 里没有可替换的模拟函数时，用子类在 exec 前加上延迟"""
+    latency = ctx.latency
+
+    class Slow(cls):
+        def exec(self, prep_res):
+            latency.sleep()
+            return super().exec(prep_res)
+
+    Slow.__name__ = cls.__name__
+    return Slow
+
+
+def run_async(flow, make_shared):
+    return lambda: asyncio.run(flow.run_async(make_shared()))
+
+
+# ---------- 入门示例 ----------
+
+@workload("intro/01_hello_pocketflow", "flow")
+def hello(ctx):
+    m = intro("01_hello_pocketflow.py")
+    flow = Flow(start=slow_exec(ctx, m.GreetNode)())
+    return lambda: flow.run({"name": "小明"})
+
+
+@workload("intro/02_node_lifecycle", "flow")
+def node_lifecycle(ctx):
+    m = intro("02_node_lifecycle.py")
+    flow = Flow(start=slow_exec(ctx, m.SummarizeNode)())
+    return lambda: flow.run({"text": "PocketFlow 是一个仅 100 行代码、零依赖的 LLM 应用框架。"})
+
+
+def flow_chain(ctx, flow_cls):
+    m = intro("03_flow_chain.py")
+    fetch, think, output = m.FetchNode(), slow_exec(ctx, m.ThinkNode)(), m.OutputNode()
+    fetch >> think >> output
+    fetch.pure = think.pure = True
+    flow = flow_cls(start=fetch)
+    return lambda: flow.run({"question": "什么是 PocketFlow？"})
+
+
+workload("intro/03_flow_chain", "flow")(lambda ctx: flow_chain(ctx, Flow))
+workload("intro/03_flow_chain[compiled]", "flow")(lambda ctx: flow_chain(ctx, CompiledFlow))
+
+
+@workload("intro/04_conditional_flow", "flow")
+def conditional_flow(ctx):
+    m = intro("04_conditional_flow.py")
+    review = slow_exec(ctx, m.ReviewNode)()
+    review - "approve" >> m.ApproveNode()
+    review - "reject" >> m.RejectNode()
+    flow = Flow(start=review)
+
+    def run():
+        flow.run({"score": 80})
+        flow.run({"score": 45})
+    return run
+
+
+@workload("intro/05_shared_store", "flow")
+def shared_store(ctx):
+    m = intro("05_shared_store.py")
+    input_node = m.InputNode()
+    input_node >> slow_exec(ctx, m.TranslateNode)() >> slow_exec(ctx, m.AnswerNode)()
+    flow = Flow(start=input_node)
+    return lambda: flow.run({})
+
+
+@workload("intro/06_retry_node", "flow")
+def retry_node(ctx):
+    m = intro("06_retry_node.py")
+    flow = Flow(start=slow_exec(ctx, m.UnstableApiNode)(max_retries=5, wait=0))
+    rng = ctx.patch(m, random=random.Random()).random
+
+    def run():
+        rng.seed(42)  # 每次运行的失败序列相同
+        flow.run({"prompt": "解释量子计算"})
+    return run
+
+
+@workload("intro/07_nested_flow", "flow")
+def nested_flow(ctx):
+    m = intro("07_nested_flow.py")
+    validate_format, validate_length = m.ValidateFormatNode(), m.ValidateLengthNode()
+    validate_format >> validate_length
+    prepare = m.PrepareNode()
+    prepare >> Flow(start=validate_format) >> slow_exec(ctx, m.ProcessNode)()
+    flow = Flow(start=prepare)
+    return lambda: flow.run({"raw_input": "  PocketFlow 是极简 LLM 框架  "})
+
+
+def parallel(cls):
+    """同一个 BatchNode 改为在线程池中执行 item"""
+    return type(cls.__name__, (ParallelBatchNode, cls), {})
+
+
+def batch_node(ctx, wrap):
+    m = intro("08_batch_node.py")
+    flow = Flow(start=wrap(slow_exec(ctx, m.TranslateBatchNode))(max_retries=2))
+    texts = [f"第 {i} 条文本" for i in range(ctx.items)]
+    return (lambda: flow.run({"texts": texts})), len(texts)
+
+
+workload("intro/08_batch_node", "batch")(lambda ctx: batch_node(ctx, lambda cls: cls))
+workload("intro/08_batch_node[parallel]", "batch")(lambda ctx: batch_node(ctx, parallel))
+
+
+@workload("intro/09_async_parallel", "async")
+def async_parallel(ctx):
+    m = intro("09_async_parallel.py")
+    ctx.patch(m, asyncio=AsyncioShim(ctx.latency))
+    urls = [f"https://api.example.com/data{i}" for i in range(ctx.items)]
+    return (run_async(AsyncFlow(start=m.SequentialFetchNode()), lambda: {"urls": urls}),
+            run_async(AsyncFlow(start=m.FetchUrlNode()), lambda: {"urls": urls}))
+
+
+def loop_pattern(ctx, flow_cls):
+    m = intro("10_loop_pattern.py")
+    generate, check = slow_exec(ctx, m.GenerateNode)(), m.CheckNode()
+    generate >> check
+    check - "retry" >> generate
+    check - "accept" >> m.OutputNode()
+    flow = flow_cls(start=generate)
+    return lambda: flow.run({"question": "什么是 PocketFlow？"})
+
+
+workload("intro/10_loop_pattern", "flow")(lambda ctx: loop_pattern(ctx, Flow))
+workload("intro/10_loop_pattern[compiled]", "flow")(lambda ctx: loop_pattern(ctx, CompiledFlow))
+
+
+# ---------- 案例示例 ----------
+
+@workload("cases/01_chatbot", "flow")
+def chatbot(ctx):
+    m = case("01_chatbot.py")
+    slow(ctx, m, "mock_call_llm")
+    get_input, send_reply = m.GetInput(), m.SendReply()
+    get_input >> m.CallLLM() >> send_reply
+    send_reply - "continue" >> get_input
+    flow = Flow(start=get_input)
+    ctx.patch(m, input=None)
+
+    def run():
+        script = iter(["你好", "PocketFlow 是什么？", "谢谢", "quit"])
+        m.input = lambda prompt="": next(script)  # 代替终端输入
+        flow.run({})
+    return run
+
+
+@workload("cases/02_writing_workflow", "flow")
+def writing_workflow(ctx):
+    m = case("02_writing_workflow.py")
+    slow(ctx, m, "mock_call_llm")
+    outline = m.OutlineNode()
+    outline >> m.WriteDraftNode() >> m.PolishNode()
+    flow = Flow(start=outline)
+    return lambda: flow.run({"topic": "PocketFlow 入门指南"})
+
+
+@workload("cases/03_rag", "flow")
+def rag(ctx):
+    m = case("03_rag.py")
+    slow(ctx, m, "mock_embed_texts", "mock_call_llm")
+    chunk, index = m.ChunkNode(), m.IndexNode()
+    chunk >> m.EmbedBatch() >> index
+    offline = Flow(start=chunk)
+    retrieve = m.RetrieveNode()
+    retrieve >> m.GenerateNode()
+    online = Flow(start=retrieve)
+    documents = {f"doc-{i}": f"PocketFlow 第 {i} 篇文档：Node 负责做事，Flow 负责调度。" * 3 for i in range(20)}
+
+    def run():
+        shared = {"documents": documents}  # 不设 index_dir：内存索引，不落盘
+        offline.run(shared)
+        shared["question"] = "PocketFlow 的核心概念是什么？"
+        online.run(shared)
+    return run
+
+
+@workload("cases/04_search_agent", "flow")
+def search_agent(ctx):
+    m = case("04_search_agent.py")
+    slow(ctx, m, "mock_call_llm", "mock_web_search")
+    think = m.ThinkNode()
+    search = m.SearchNode()
+    think - "need_more" >> search
+    think - "enough" >> m.SynthesizeNode()
+    search >> think
+    flow = Flow(start=think)
+
+    def run():
+        m._search_count = 0  # 模拟 LLM 靠全局计数决定何时停止搜索
+        flow.run({"question": "PocketFlow 是什么？有哪些设计模式？"})
+    return run
+
+
+@workload("cases/05_multi_agent", "flow")
+def multi_agent(ctx):
+    m = case("05_multi_agent.py")
+    ctx.patch(m, asyncio=AsyncioShim(ctx.latency))
+
+    class Guesser(m.GuesserAgent):
+        # 示例里游戏结束后提示者仍阻塞在 hinter_queue.get()，两个 Flow 永远不会一起结束；
+        # 这里结束时多发一条消息，让提示者看到 game_over 后退出
+        async def post_async(self, shared, prep_res, exec_res):
+            action = await super().post_async(shared, prep_res, exec_res)
+            if action == "end":
+                await shared["hinter_queue"].put(exec_res)
+            return action
+
+    hinter, guesser = m.HinterAgent(), Guesser()
+    hinter - "continue" >> hinter
+    guesser - "continue" >> guesser
+    hinter_flow, guesser_flow = AsyncFlow(start=hinter), AsyncFlow(start=guesser)
+
+    async def play():
+        shared = {"word": "大熊猫", "taboo_words": ["熊猫", "国宝", "黑白"],
+                  "hinter_queue": asyncio.Queue(), "guesser_queue": asyncio.Queue()}
+        shared["hinter_queue"].put_nowait("start")
+        await asyncio.gather(hinter_flow.run_async(shared), guesser_flow.run_async(shared))
+    return lambda: asyncio.run(play())
+
+
+def map_reduce(ctx, wrap):
+    m = case("06_map_reduce.py")
+    slow(ctx, m, "mock_eval_resume")
+    evaluate = wrap(m.EvalResume)()
+    evaluate >> m.ShowResults()
+    flow = Flow(start=evaluate)
+    resumes = [f"候选人{i}，Python 开发者，{i % 10}年经验，熟悉 AI 和机器学习" for i in range(ctx.items)]
+    return (lambda: flow.run({"resumes": resumes})), len(resumes)
+
+
+workload("cases/06_map_reduce", "batch")(lambda ctx: map_reduce(ctx, lambda cls: cls))
+workload("cases/06_map_reduce[parallel]", "batch")(lambda ctx: map_reduce(ctx, parallel))
+
+
+@workload("cases/07_parallel_processing", "async")
+def parallel_processing(ctx):
+    m = case("07_parallel_processing.py")
+    ctx.patch(m, asyncio=AsyncioShim(ctx.latency))
+    items = [f"任务_{i + 1}" for i in range(ctx.items)]
+    return (run_async(AsyncFlow(start=m.SequentialProcess()), lambda: {"items": items}),
+            run_async(AsyncFlow(start=m.ParallelProcess()), lambda: {"items": items}))
+
+
+@workload("cases/08_structured_output", "flow")
+def structured_output(ctx):
+    m = case("08_structured_output.py")
+    slow(ctx, m, "mock_call_llm")
+    generate, validate, output = m.GenerateJSON(), m.ValidateAndStore(max_retries=2), m.OutputNode()
+    generate >> validate
+    validate - "retry" >> generate
+    validate - "done" >> output
+    validate - "give_up" >> output
+    flow = Flow(start=generate)
+
+    def run():
+        m._call_count = 0  # 模拟 LLM 前两次故意输出错误格式
+        flow.run({"task": "评估候选人张三的 Python 编程能力"})
+    return run
+
+
+@workload("cases/09_chain_of_thought", "flow")
+def chain_of_thought(ctx):
+    m = case("09_chain_of_thought.py")
+    slow(ctx, m, "mock_reason", "mock_verify")
+    step_reason, verify = m.StepReason(), m.Verify()
+    step_reason >> verify
+    verify - "error" >> step_reason
+    verify - "continue" >> step_reason
+    verify - "ok" >> m.Conclude()
+    flow = Flow(start=step_reason)
+    return lambda: flow.run({"question": "PocketFlow 如何用 100 行代码实现 LLM 应用框架？"})
+
+
+@workload("cases/10_mcp_tool", "flow")
+def mcp_tool(ctx):
+    m = case("10_mcp_tool.py")
+    slow(ctx, m, "mock_call_llm", "mcp_execute")
+    plan, select, reflect = m.PlanNode(), m.SelectTool(), m.ReflectNode()
+    plan >> select >> m.ExecuteTool() >> reflect
+    reflect - "continue" >> select
+    reflect - "done" >> m.OutputNode()
+    flow = Flow(start=plan)
+
+    def run():
+        m._step = 0  # 模拟 LLM 靠全局步数选择工具
+        flow.run({"task": "查询北京天气，转换为华氏度，并翻译成英文"})
+    return run
+
+
+@workload("cases/11_agent_skills", "flow")
+def agent_skills(ctx):
+    m = case("11_agent_skills.py")
+    slow(ctx, m, "mock_select_skill", "mock_apply_skill")
+    select = m.SelectSkill()
+    select >> m.ApplySkill()
+    flow = Flow(start=select)
+    skills_dir = os.path.join(CASES_DIR, "skills")  # 不存在时使用内置技能
+
+    def run():
+        for task in ["请总结 PocketFlow 的核心优势", "搭建一个 PocketFlow 项目的步骤清单", "评审这段 Node 代码的质量"]:
+            flow.run({"task": task, "skills_dir": skills_dir})
+    return run
+
+
+@workload("cases/12_agentic_coding", "flow")
+def agentic_coding(ctx):
+    project_dir = os.path.join(CASES_DIR, "12_agentic_coding")
+    if project_dir not in sys.path:
+        sys.path.insert(0, project_dir)
+    import flow as agent_flow
+    import nodes
+
+    slow(ctx, nodes, "call_llm", "search_web")
+    flow = agent_flow.create_agent_flow(safe_mode=True)
+    return lambda: flow.run({"question": "PocketFlow 有哪些设计模式？"})
@@ -0,0 +1,16 @@
+from .examples import load_example
+from .compiled import CompiledFlow, collect_nodes
+from .tracing import Tracer
+from .benchmark import (
+    LatencyModel, AsyncioShim, with_latency, patched, count_transitions, quiet, best_time,
+    metric, save_baseline, load_baseline, compare,
+)
+from .bulk import run_many
+from .retry import RetryPolicy, CircuitBreaker, CircuitOpenError, RetryNode, AsyncRetryNode
+from .checkpoint import CheckpointFlow, read_checkpoints
+from .parallel import ParallelBatchNode, ProcessBatchNode, shutdown_pools
+from .limits import TokenBucket, RateLimiter, LimitedParallelBatchNode
+from .streaming import StreamingParallelBatchNode, TIMED_OUT
+from .dag import FanOut, AsyncFanOut
+from .keysets import TrackedShared, KeyProfile, profile_flow
+from .memo import MemoCache, MemoStats, MemoNode, AsyncMemoNode, memo_stats
@@ -0,0 +1,178 @@
+"""
+基准测试工具
+
+把示例里的模拟函数和 sleep 换成可配置的延迟模型，再测量：
+- 每次节点转移的框架开销（微秒）
+- BatchNode 的吞吐（items/s）
+- 异步并发相对串行的加速比
+
+结果可以保存为 JSON 基线，之后的运行与基线比较，变差超过阈值即标记为回归。
+"""
+
+import asyncio
+import contextlib
+import inspect
+import io
+import json
+import platform
+import random
+import time
+from datetime import datetime
+
+import pocketflow
+
+from .compiled import CompiledFlow
+
+
+class LatencyModel:
+    """模拟外部调用的耗时：固定 ms 毫秒，加上 ±jitter 比例的均匀抖动"""
+
+    def __init__(self, ms: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        self.ms = ms
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+
+    def sample(self) -> float:
+        """返回一次调用的耗时（秒）"""
+        if self.ms <= 0:
+            return 0.0
+        return self.ms * (1 + self._rng.uniform(-self.jitter, self.jitter)) / 1000
+
+    def sleep(self):
+        seconds = self.sample()
+        if seconds > 0:
+            time.sleep(seconds)
+
+    async def sleep_async(self):
+        # 延迟为 0 时仍让出一次事件循环，保持与真实 I/O 相同的调度形态
+        await asyncio.sleep(self.sample())
+
+
+def with_latency(fn, model: LatencyModel):
+    """包装 fn：先按延迟模型等待，再调用原函数；协程函数得到协程包装"""
+    if inspect.iscoroutinefunction(fn):
+        async def wrapper(*args, **kwargs):
+            await model.sleep_async()
+            return await fn(*args, **kwargs)
+    else:
+        def wrapper(*args, **kwargs):
+            model.sleep()
+            return fn(*args, **kwargs)
+    wrapper.__wrapped__ = fn
+    return wrapper
+
+
+class AsyncioShim:
+    """替换示例模块里的 asyncio：sleep 改由延迟模型决定，其余属性原样转发"""
+
+    def __init__(self, model: LatencyModel):
+        self._model = model
+
+    def __getattr__(self, name):
+        return getattr(asyncio, name)
+
+    async def sleep(self, _seconds=0, result=None):
+        await self._model.sleep_async()
+        return result
+
+
+@contextlib.contextmanager
+def patched(target, **attrs):
+    """临时替换 target 的属性，退出时恢复"""
+    missing = object()
+    saved = {name: getattr(target, name, missing) for name in attrs}
+    for name, value in attrs.items():
+        setattr(target, name, value)
+    try:
+        yield target
+    finally:
+        for name, value in saved.items():
+            if value is missing:
+                delattr(target, name)
+            else:
+                setattr(target, name, value)
+
+
+@contextlib.contextmanager
+def count_transitions():
+    """统计执行过的节点数（不含 Flow 自身），Flow 和 CompiledFlow 都适用
+
+    CompiledFlow 融合 step 中直接调用的 pure 节点不经过 _run，通过 _on_direct 回调计入
+    """
+    counter = {"transitions": 0}
+    run, run_async = pocketflow.BaseNode._run, pocketflow.AsyncNode._run_async
+
+    def _run(self, shared):
+        counter["transitions"] += 1
+        return run(self, shared)
+
+    async def _run_async(self, shared):
+        counter["transitions"] += 1
+        return await run_async(self, shared)
+
+    def _on_direct(node):
+        counter["transitions"] += 1
+
+    # Flow / AsyncFlow 各自覆盖了 _run / _run_async，不会被计入
+    with patched(pocketflow.BaseNode, _run=_run), patched(pocketflow.AsyncNode, _run_async=_run_async), \
+            patched(CompiledFlow, _on_direct=staticmethod(_on_direct)):
+        yield counter
+
+
+def quiet(fn, *args):
+    """丢弃示例里的 print 输出后调用 fn"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+def best_time(fn, repeat: int = 5, number: int = 1) -> float:
+    """重复 repeat 轮、每轮调用 number 次，返回单次调用的最短耗时（秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+# ---------- 基线 ----------
+
+def metric(value: float, unit: str, better: str) -> dict:
+    """一条测量结果；better 为 "lower" 或 "higher"，决定回归的方向"""
+    return {"value": value, "unit": unit, "better": better}
+
+
+def save_baseline(path: str, results: dict):
+    data = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def load_baseline(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(results: dict, baseline: dict, threshold: float = 10.0) -> list[dict]:
+    """逐项与基线比较，返回 [{"name", "value", "baseline", "change", "regression"}]
+
+    change 为"变差"方向的百分比（正数表示更差），超过 threshold 即为回归。
+    """
+    rows = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None or not base["value"]:
+            rows.append({"name": name, "value": current["value"], "baseline": None,
+                         "change": None, "regression": False})
+            continue
+        ratio = current["value"] / base["value"]
+        change = (ratio - 1) * 100 if current["better"] == "lower" else (1 / ratio - 1) * 100 if ratio else float("inf")
+        rows.append({"name": name, "value": current["value"], "baseline": base["value"],
+                     "change": change, "regression": change > threshold})
+    return rows
@@ -0,0 +1,94 @@
+"""
+批量运行 Flow
+
+示例 04 依次调用 flow.run(shared1)、flow.run(shared2)，排队的任务通常也是这样一个个处理。
+run_many(flow, shareds) 把同一个 Flow 用在一批 shared 上，交给线程池或进程池并发执行：
+- mode="thread"：shared 原地修改，适合以 I/O 为主的节点（调用 LLM、搜索）
+- mode="process"：每个 worker 进程启动时反序列化一次 Flow，之后只传 shared，
+  适合 CPU 密集的节点，能用满所有核；shared 经过序列化往返，结果里的是副本
+- ordered=True 按输入顺序返回，False 则谁先完成先返回
+- 某个任务抛出的异常记录在它的结果里，不影响其他任务
+
+shareds 可以是生成器：同时在途的任务最多 max_pending 个，几千个任务也不会一次性全部提交。
+Flow._orch 每次运行都 copy 节点，同一个 Flow 可以被多个线程同时运行；
+但节点如果修改模块级全局变量，需要自己保证线程安全。
+"""
+
+import itertools
+import os
+import pickle
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from .examples import LOADED, ensure_loaded
+
+_worker_flow = None  # 进程池 worker 中反序列化好的 Flow
+
+
+def _run_one(flow, shared):
+    try:
+        return flow.run(shared), shared, None
+    except Exception as e:
+        return None, shared, e
+
+
+def _init_worker(flow_bytes: bytes, modules: dict):
+    global _worker_flow
+    ensure_loaded(modules)  # 先导入 load_example 加载的示例，节点类才能反序列化
+    _worker_flow = pickle.loads(flow_bytes)
+
+
+def _run_in_worker(shared):
+    return _run_one(_worker_flow, shared)
+
+
+def run_many(flow, shareds, workers: int = None, mode: str = "thread", ordered: bool = True,
+             max_pending: int = None):
+    """在 shareds 的每一项上运行 flow，逐个产出结果
+
+    每个结果是 {"index", "shared", "action", "error"}：index 是输入中的位置，
+    action 是 flow.run 的返回值，error 是抛出的异常（成功时为 None）。
+
+    Args:
+        workers: 线程 / 进程数，默认 CPU 核数
+        mode: "thread" 或 "process"
+        ordered: True 按输入顺序产出，False 按完成顺序产出
+        max_pending: 已提交但尚未产出的任务上限，默认 workers * 4
+    """
+    if mode not in ("thread", "process"):
+        raise ValueError(f"mode must be 'thread' or 'process', got {mode!r}")
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+
+    if mode == "thread":
+        pool = ThreadPoolExecutor(workers)
+        submit = lambda shared: pool.submit(_run_one, flow, shared)
+    else:
+        # Flow 只序列化一次，在每个 worker 启动时传过去
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(pickle.dumps(flow), dict(LOADED)))
+        submit = lambda shared: pool.submit(_run_in_worker, shared)
+
+    jobs = enumerate(shareds)
+    pending, finished, next_index = {}, {}, 0  # finished：ordered 模式下等待前面任务的结果
+    try:
+        while True:
+            for index, shared in itertools.islice(jobs, max_pending - len(pending) - len(finished)):
+                pending[submit(shared)] = (index, shared)
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, shared = pending.pop(future)
+                try:
+                    action, shared, error = future.result()
+                except Exception as e:  # 结果无法序列化、worker 崩溃等
+                    action, error = None, e
+                result = {"index": index, "shared": shared, "action": action, "error": error}
+                if not ordered:
+                    yield result
+                else:
+                    finished[index] = result
+            while next_index in finished:
+                yield finished.pop(next_index)
+                next_index += 1
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,151 @@
+"""
+编译模式的 Flow
+
+Flow._orch 每走一步都要 copy.copy 下一个节点、再查一次 successors 字典。
+在 Generate ↔ Check 这类紧凑循环里，这部分调度开销往往比节点本身还重。
+CompiledFlow 在第一次运行时把图"冻结"成一张转移表：
+- 节点编号，转移表是 step 编号 → {action: 下一个 step 编号}
+- 每次运行每个节点只 copy 一次，循环里再次到达时复用同一个副本
+- 标记为 pure 的节点（post 总是走 default，不在 self 上保存运行状态）与唯一的后继融合成一个 step：
+  step 内依次直接调用各节点的 prep / _exec / post，中间不查表；pure 节点每个线程复制一次，
+  同一线程之后的运行都复用这个副本，不再逐次 copy，也不经过 _run 分派。
+  不同线程各用各的副本，run_many 的线程模式下同一个 CompiledFlow 仍可以并发运行
+
+语义差异：同一次运行中，节点在 self 上留下的状态会带到下一次访问（原版每次都是新副本）。
+编译后再修改图的连接或 pure 节点的属性不会生效，需要重新调用 compile()。
+"""
+
+import copy
+import threading
+import warnings
+
+from pocketflow import BaseNode, Flow
+
+
+def collect_nodes(start) -> list:
+    """从 start 出发，按广度优先收集所有可达节点（start 排在第一个）"""
+    nodes, seen = [start], {id(start)}
+    for node in nodes:
+        for succ in node.successors.values():
+            if id(succ) not in seen:
+                seen.add(id(succ))
+                nodes.append(succ)
+    return nodes
+
+
+class CompiledFlow(Flow):
+    """把图预编译成转移表执行的 Flow，用法与 Flow 相同
+
+    Args:
+        fuse: 是否融合 pure 节点组成的线性链。节点通过 node.pure = True 声明
+              自己的 post 只返回 None 或 "default"，并且不在 self 上保存运行状态
+    """
+
+    def __init__(self, start=None, fuse: bool = True):
+        super().__init__(start)
+        self.fuse = fuse
+        self._nodes = None  # 编号 → 节点模板
+        self._steps = None  # step 编号 → (节点编号元组, {action: step 编号}, 末节点的 action 列表)
+        self._pure = None  # 编号 → 是否直接调用 prep / _exec / post
+        self._direct = None  # 线程 id → 该线程的 pure 节点副本列表（其余位置为 None）
+
+    # count_transitions 等统计工具把它设为回调，融合 step 中每直接执行一个节点调用一次
+    _on_direct = None
+
+    def start(self, start):
+        self._nodes = self._steps = self._pure = self._direct = None
+        return super().start(start)
+
+    def compile(self) -> "CompiledFlow":
+        """根据当前的连接关系重新生成转移表"""
+        nodes = collect_nodes(self.start_node)
+        index = {id(node): i for i, node in enumerate(nodes)}
+        indegree = [0] * len(nodes)
+        for node in nodes:
+            for succ in node.successors.values():
+                indegree[index[id(succ)]] += 1
+
+        def fusable(node):
+            # 只能融合：pure、只有一个 default 后继、后继只有这一个入口且不是起点
+            if not (self.fuse and getattr(node, "pure", False) and list(node.successors) == ["default"]):
+                return False
+            succ = index[id(node.successors["default"])]
+            return succ != 0 and indegree[succ] == 1
+
+        chains, member_of = [], set()
+        for i, node in enumerate(nodes):
+            if i in member_of:
+                continue
+            chain = [i]
+            while fusable(nodes[chain[-1]]):
+                nxt = index[id(nodes[chain[-1]].successors["default"])]
+                if nxt in chain:
+                    break
+                chain.append(nxt)
+            # 被前面的链吞并的节点不再单独成为 step
+            member_of.update(chain[1:])
+            chains.append(chain)
+        chains = [c for c in chains if c[0] not in member_of]
+        head = {c[0]: s for s, c in enumerate(chains)}
+        self._nodes = nodes
+        # 只有 _run 未被改写的 pure 节点可以拆开直接调用（子 Flow、带埋点的节点仍走 _run）
+        self._pure = [self.fuse and getattr(node, "pure", False) and type(node)._run is BaseNode._run
+                      for node in nodes]
+        self._direct = {}
+        self._steps = [
+            (
+                tuple(chain),
+                {a: head[index[id(n)]] for a, n in nodes[chain[-1]].successors.items()},
+                list(nodes[chain[-1]].successors),
+            )
+            for chain in chains
+        ]
+        return self
+
+    @property
+    def num_steps(self) -> int:
+        """编译后的 step 数量（融合后少于节点数量）"""
+        if self._steps is None:
+            self.compile()
+        return len(self._steps)
+
+    def _direct_nodes(self) -> list:
+        """当前线程的 pure 节点副本：cur_retry、params 等写在节点上的状态不会被其他线程的运行覆盖"""
+        tid = threading.get_ident()
+        nodes = self._direct.get(tid)
+        if nodes is None:
+            nodes = self._direct[tid] = [copy.copy(node) if pure else None
+                                         for node, pure in zip(self._nodes, self._pure)]
+        return nodes
+
+    def _orch(self, shared, params=None):
+        if self._steps is None:
+            self.compile()
+        p, steps, templates = (params or {**self.params}), self._steps, self._nodes
+        direct, on_direct = self._direct_nodes(), self._on_direct
+        run_nodes = [None] * len(templates)  # 本次运行的节点副本，按需创建
+        step, last_action = 0, None
+        while step is not None:
+            members, table, actions = steps[step]
+            for j in members:
+                node = direct[j]
+                if node is not None:
+                    node.params = p
+                    prep_res = node.prep(shared)
+                    last_action = node.post(shared, prep_res, node._exec(prep_res))
+                    if on_direct is not None:
+                        on_direct(node)
+                else:
+                    node = run_nodes[j]
+                    if node is None:
+                        node = run_nodes[j] = copy.copy(templates[j])
+                        node.set_params(p)
+                    last_action = node._run(shared)
+                if j != members[-1] and last_action not in (None, "default"):
+                    # pure 节点违反约定：按原版语义，找不到对应 action 时 Flow 结束
+                    warnings.warn(f"Flow ends: '{last_action}' not found in ['default']")
+                    return last_action
+            step = table.get(last_action or "default")
+            if step is None and actions:
+                warnings.warn(f"Flow ends: '{last_action}' not found in {actions}")
+        return last_action
@@ -0,0 +1,77 @@
+"""
+并行分支（fan-out / fan-in）
+
+示例 07 的验证子流程里，格式验证和长度验证都只读 shared["data"]、写不同的键，
+却只能串成 validate_format >> validate_length 依次执行。FanOut 把互不依赖的分支并发执行：
+
+    prepare >> FanOut(validate_format, validate_length) >> process
+
+- 每个分支可以是单个节点，也可以是一个子 Flow（分支内部仍按顺序执行）
+- 所有分支结束后 FanOut 才走向后继，后继节点就是汇合点（join），关键路径变成最长的那个分支
+- FanOut 在线程池中执行分支，适合同步节点；AsyncFanOut 用 asyncio.gather，可以放在 AsyncFlow 里，
+  其中的同步分支交给 asyncio.to_thread
+- post 收到各分支返回的 action 列表（按分支顺序），默认返回 "default"；需要按分支结果选择路径时覆盖 post
+
+分支之间共享同一个 shared：各分支应只写互不相同的键（dict 的单键读写在 CPython 中是原子的）。
+"""
+
+import asyncio
+import contextvars
+import copy
+from concurrent.futures import ThreadPoolExecutor
+
+from pocketflow import AsyncNode, BaseNode
+
+
+class FanOut(BaseNode):
+    """在线程池中并发执行多个分支，全部完成后走向后继
+
+    Args:
+        branches: 节点或 Flow，各自以当前 params 在同一个 shared 上运行
+        max_workers: 线程数上限，默认等于分支数
+    """
+
+    def __init__(self, *branches, max_workers: int = None):
+        super().__init__()
+        self.branches = list(branches)
+        self.max_workers = max_workers
+
+    def _run_branch(self, branch, shared):
+        node = copy.copy(branch)
+        node.set_params(self.params)
+        return node._run(shared)
+
+    def _run(self, shared):
+        p = self.prep(shared)
+        with ThreadPoolExecutor(self.max_workers or len(self.branches)) as pool:
+            # 每个分支在复制的 contextvars 上下文中运行，Tracer 的父子关系得以保留
+            futures = [pool.submit(contextvars.copy_context().run, self._run_branch, branch, shared)
+                       for branch in self.branches]
+            actions = [future.result() for future in futures]
+        return self.post(shared, p, actions)
+
+    def post(self, shared, prep_res, exec_res):
+        return "default"
+
+
+class AsyncFanOut(AsyncNode):
+    """FanOut 的异步版本：异步分支直接 gather，同步分支在线程中执行"""
+
+    def __init__(self, *branches):
+        super().__init__()
+        self.branches = list(branches)
+
+    async def _run_branch(self, branch, shared):
+        node = copy.copy(branch)
+        node.set_params(self.params)
+        if isinstance(node, AsyncNode):
+            return await node._run_async(shared)
+        return await asyncio.to_thread(node._run, shared)
+
+    async def _run_async(self, shared):
+        p = await self.prep_async(shared)
+        actions = await asyncio.gather(*(self._run_branch(branch, shared) for branch in self.branches))
+        return await self.post_async(shared, p, list(actions))
+
+    async def post_async(self, shared, prep_res, exec_res):
+        return "default"
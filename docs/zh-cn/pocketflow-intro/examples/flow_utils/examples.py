@@ -0,0 +1,37 @@
+"""
+按文件名导入示例脚本
+
+示例文件名以数字开头（如 10_loop_pattern.py），无法直接 import。
+基准测试和进阶示例通过 load_example 复用这些脚本里定义的节点。
+
+导入的模块会登记到 sys.modules，其中的节点类因此可以被 pickle；
+进程池的 worker 通过 ensure_loaded 按同样的名字重新导入，才能反序列化这些节点。
+"""
+
+import importlib.util
+import os
+import sys
+
+EXAMPLES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CASES_DIR = os.path.normpath(os.path.join(EXAMPLES_DIR, "..", "..", "pocketflow-cases", "examples"))
+
+LOADED = {}  # 模块名 → 示例文件路径
+
+
+def load_example(filename: str, examples_dir: str = EXAMPLES_DIR):
+    """导入 examples_dir 下的示例脚本，返回模块对象（不会执行 __main__ 部分）"""
+    name = "example_" + os.path.splitext(os.path.basename(filename))[0]
+    path = os.path.join(examples_dir, filename)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    LOADED[name] = path
+    return module
+
+
+def ensure_loaded(modules: dict):
+    """在当前进程中导入 {模块名: 文件路径} 里尚未导入的示例"""
+    for name, path in modules.items():
+        if name not in sys.modules:
+            load_example(os.path.basename(path), os.path.dirname(path))
@@ -0,0 +1,248 @@
+"""
+shared 读写集合追踪与并行调度
+
+示例 05 的节点只通过 question、language、translated_question、answer 这些键通信，
+但没有任何地方记录"哪个节点读写了哪个键"，引擎也就无从判断哪些节点可以并发或可以跳过。
+
+profile_flow(flow, shared) 用 TrackedShared（dict 子类）代替 shared 跑一遍 flow，
+按节点记录读集合与写集合，得到 KeyProfile：
+- dependencies()：按实际执行顺序，两个节点存在写后读 / 读后写 / 写后写冲突时连一条边
+- to_dot()：导出 Graphviz 依赖图
+- levels()：把线性链分层，同一层的节点互不冲突，可以并发
+- parallelize()：按 levels 重建 Flow，多于一个节点的层包进 FanOut
+- required_nodes(outputs)：要得到 outputs 中的键，至少需要运行哪些节点（其余可以跳过）
+
+记录是保守的：读到可变对象（list、dict 等）也算作写，因为节点可能原地修改它；
+遍历 shared（keys / items / 迭代）算作读了全部键。
+"""
+
+import contextvars
+import copy
+import functools
+
+from pocketflow import AsyncNode, Flow
+
+from .dag import FanOut
+
+ALL = "*"  # 读了全部键（遍历 shared）
+_IMMUTABLE = (str, bytes, int, float, bool, complex, tuple, frozenset, type(None))
+_current_node = contextvars.ContextVar("current_node", default=None)
+
+
+class TrackedShared(dict):
+    """记录每个节点读写了哪些键的 shared"""
+
+    def __init__(self, data, profile: "KeyProfile"):
+        super().__init__(data)
+        self._profile = profile
+
+    def _read(self, key, value_access: bool = True):
+        node = _current_node.get()
+        if node is not None:
+            self._profile.reads[node].add(key)
+            if value_access and key != ALL and not isinstance(dict.get(self, key), _IMMUTABLE):
+                self._profile.writes[node].add(key)  # 可变对象可能被原地修改
+
+    def _write(self, key):
+        node = _current_node.get()
+        if node is not None:
+            self._profile.writes[node].add(key)
+
+    def __getitem__(self, key):
+        self._read(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self._read(key)
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self._read(key, value_access=False)
+        return super().__contains__(key)
+
+    def __setitem__(self, key, value):
+        self._write(key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._write(key)
+        super().__delitem__(key)
+
+    def setdefault(self, key, default=None):
+        self._read(key)
+        if not super().__contains__(key):
+            self._write(key)
+        return super().setdefault(key, default)
+
+    def pop(self, key, *default):
+        self._write(key)
+        return super().pop(key, *default)
+
+    def update(self, *args, **kwargs):
+        for key in dict(*args, **kwargs):
+            self._write(key)
+        super().update(*args, **kwargs)
+
+    def __iter__(self):
+        self._read(ALL)
+        return super().__iter__()
+
+    def keys(self):
+        self._read(ALL)
+        return super().keys()
+
+    def values(self):
+        self._read(ALL)
+        return super().values()
+
+    def items(self):
+        self._read(ALL)
+        return super().items()
+
+
+class KeyProfile:
+    """一次运行中各节点的读写集合（节点用原图中的模板节点标识）"""
+
+    def __init__(self):
+        self.nodes = []  # 按首次执行的顺序
+        self.reads = {}  # 节点 → 读过的键
+        self.writes = {}  # 节点 → 写过的键
+        self.runs = {}  # 节点 → 执行次数
+
+    def name(self, node) -> str:
+        name = type(node).__name__
+        same = [n for n in self.nodes if type(n).__name__ == name]
+        return name if len(same) <= 1 else f"{name}#{same.index(node) + 1}"
+
+    def _enter(self, node):
+        if node not in self.runs:
+            self.nodes.append(node)
+            self.reads[node], self.writes[node], self.runs[node] = set(), set(), 0
+        self.runs[node] += 1
+
+    def conflicts(self, a, b) -> set:
+        """a 先于 b 执行时，两者冲突的键（空集合表示可以并发）"""
+        ra, wa, rb, wb = self.reads[a], self.writes[a], self.reads[b], self.writes[b]
+        keys = (wa & rb) | (ra & wb) | (wa & wb)
+        if wa and ALL in rb or wb and ALL in ra:
+            keys.add(ALL)
+        return keys
+
+    def dependencies(self) -> list[tuple]:
+        """[(前一个节点, 后一个节点, 冲突的键)]，按执行顺序两两比较"""
+        return [(a, b, self.conflicts(a, b))
+                for i, a in enumerate(self.nodes) for b in self.nodes[i + 1:] if self.conflicts(a, b)]
+
+    def to_dot(self) -> str:
+        lines = ["digraph shared_deps {", "  rankdir=LR;"]
+        for node in self.nodes:
+            reads = ", ".join(sorted(self.reads[node])) or "-"
+            writes = ", ".join(sorted(self.writes[node])) or "-"
+            lines.append(f'  "{self.name(node)}" [shape=box, label="{self.name(node)}\\nR: {reads}\\nW: {writes}"];')
+        for a, b, keys in self.dependencies():
+            lines.append(f'  "{self.name(a)}" -> "{self.name(b)}" [label="{", ".join(sorted(keys))}"];')
+        lines.append("}")
+        return "\n".join(lines)
+
+    def levels(self) -> list[list]:
+        """把执行顺序分层：每个节点放在它所依赖的节点之后的最早一层"""
+        if any(count > 1 for count in self.runs.values()):
+            raise ValueError("flow contains a loop; only straight-line flows can be levelled")
+        level = {}
+        for i, node in enumerate(self.nodes):
+            level[node] = max((level[a] + 1 for a in self.nodes[:i] if self.conflicts(a, node)), default=0)
+        layers = [[] for _ in range(max(level.values(), default=-1) + 1)]
+        for node in self.nodes:
+            layers[level[node]].append(node)
+        return layers
+
+    def required_nodes(self, outputs) -> list:
+        """要得到 outputs 中的键需要运行的节点（按执行顺序）；不在其中的节点可以跳过"""
+        needed, keys = [], set(outputs)
+        for node in reversed(self.nodes):
+            if self.writes[node] & keys or (ALL in keys and self.writes[node]):
+                needed.append(node)
+                keys |= self.reads[node]
+        return needed[::-1]
+
+    def parallelize(self, flow_cls=Flow):
+        """按 levels() 重建 Flow：单节点的层直接连接，多节点的层包进 FanOut"""
+        if any(list(node.successors) not in ([], ["default"]) for node in self.nodes):
+            raise ValueError("flow has conditional transitions; only straight-line flows can be parallelized")
+        steps = []
+        for layer in self.levels():
+            nodes = [_detached(node) for node in layer]
+            steps.append(nodes[0] if len(nodes) == 1 else FanOut(*nodes))
+        for a, b in zip(steps, steps[1:]):
+            a >> b
+        return flow_cls(start=steps[0])
+
+
+def _detached(node):
+    """节点的副本，去掉原图中的连接"""
+    node = copy.copy(node)
+    node.successors = {}
+    return node
+
+
+@functools.lru_cache(maxsize=None)
+def _profiled_class(cls):
+    if issubclass(cls, AsyncNode):
+        async def _run_async(self, shared):
+            self._key_profile._enter(self._key_template)
+            token = _current_node.set(self._key_template)
+            try:
+                return await super(type(self), self)._run_async(shared)
+            finally:
+                _current_node.reset(token)
+        body = {"_run_async": _run_async}
+    else:
+        def _run(self, shared):
+            self._key_profile._enter(self._key_template)
+            token = _current_node.set(self._key_template)
+            try:
+                return super(type(self), self)._run(shared)
+            finally:
+                _current_node.reset(token)
+        body = {"_run": _run}
+    return type(cls.__name__, (cls,), {"__qualname__": cls.__qualname__, "__module__": cls.__module__, **body})
+
+
+def _leaf_nodes(flow):
+    """flow 中所有非 Flow 节点（递归进入子 Flow 和 FanOut 分支）"""
+    stack, seen, leaves = [flow], set(), []
+    while stack:
+        node = stack.pop()
+        if node is None or id(node) in seen:
+            continue
+        seen.add(id(node))
+        stack.extend(node.successors.values())
+        stack.extend(getattr(node, "branches", ()))
+        if isinstance(node, Flow):
+            stack.append(node.start_node)
+        elif not hasattr(node, "branches"):
+            leaves.append(node)
+    return leaves
+
+
+def profile_flow(flow, shared: dict, run=None) -> KeyProfile:
+    """在 TrackedShared 上运行一次 flow，返回各节点的读写集合；运行结果写回 shared
+
+    run 用于异步 Flow：例如 run=lambda f, s: asyncio.run(f.run_async(s))
+    """
+    profile = KeyProfile()
+    leaves = _leaf_nodes(flow)
+    saved = [(node, type(node)) for node in leaves]
+    for node in leaves:
+        node._key_profile, node._key_template = profile, node
+        node.__class__ = _profiled_class(type(node))
+    tracked = TrackedShared(shared, profile)
+    try:
+        (run or (lambda f, s: f.run(s)))(flow, tracked)
+    finally:
+        for node, cls in saved:
+            node.__class__ = cls
+            del node._key_profile, node._key_template
+        shared.clear()
+        shared.update(dict.items(tracked))
+    return profile
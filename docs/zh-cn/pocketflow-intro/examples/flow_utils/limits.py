@@ -0,0 +1,169 @@
+"""
+并发上限与令牌桶限流
+
+AsyncParallelBatchNode 对全部 item 调用 asyncio.gather：1 万个 item 就是 1 万个同时发出的请求，
+很快触发服务商的限流，也会一次性创建大量协程和响应对象。
+- LimitedParallelBatchNode：最多 max_concurrency 个 item 同时执行，结果顺序不变
+- RateLimiter：并发信号量 + 每秒请求数 / 每秒 token 数两个令牌桶，
+  可以被多个节点、多个 Flow 共用，用来约束访问同一个后端的总流量
+
+令牌桶采用"预约"方式：取令牌时直接扣减（可以为负），按欠下的数量计算需要等待的时间，
+先到先得，不依赖某个事件循环上的锁，同步代码也可以用 acquire_sync。
+"""
+
+import asyncio
+import copy
+import threading
+import time
+import weakref
+
+from pocketflow import AsyncParallelBatchNode
+
+
+class TokenBucket:
+    """每秒补充 rate 个令牌、最多存 capacity 个（默认等于 rate，即允许 1 秒的突发）"""
+
+    def __init__(self, rate: float, capacity: float = None, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1) -> float:
+        """扣减 amount 个令牌，返回需要等待的秒数（0 表示立即可用）"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self, amount: float = 1):
+        delay = self.reserve(amount)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self, amount: float = 1):
+        delay = self.reserve(amount)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RateLimiter:
+    """访问同一个后端的共享限流器
+
+    Args:
+        max_concurrency: 同时进行的请求数上限（在同一个事件循环内计数）
+        requests_per_sec: 每秒请求数
+        tokens_per_sec: 每秒 token 数，调用 limit(tokens=...) 时按请求的 token 数扣减
+        burst: 令牌桶容量相对速率的秒数，默认 1 秒
+    """
+
+    def __init__(self, max_concurrency: int = None, requests_per_sec: float = None, tokens_per_sec: float = None,
+                 burst: float = 1.0):
+        self.max_concurrency = max_concurrency
+        self.requests = TokenBucket(requests_per_sec, requests_per_sec * burst) if requests_per_sec else None
+        self.tokens = TokenBucket(tokens_per_sec, tokens_per_sec * burst) if tokens_per_sec else None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_requests = 0
+        self._semaphores = weakref.WeakKeyDictionary()  # 事件循环 → Semaphore
+
+    def _semaphore(self):
+        loop = asyncio.get_running_loop()
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            sem = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return sem
+
+    async def __aenter__(self):
+        return await self.acquire()
+
+    async def __aexit__(self, *exc):
+        self.release()
+
+    def limit(self, tokens: float = 0):
+        """async with limiter.limit(tokens=估计的 token 数): ..."""
+        return _Limit(self, tokens)
+
+    async def acquire(self, tokens: float = 0):
+        if self.max_concurrency:
+            await self._semaphore().acquire()
+        try:
+            if self.requests:
+                await self.requests.acquire(1)
+            if self.tokens and tokens:
+                await self.tokens.acquire(tokens)
+        except BaseException:
+            if self.max_concurrency:
+                self._semaphore().release()
+            raise
+        self.in_flight += 1
+        self.total_requests += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return self
+
+    def release(self):
+        self.in_flight -= 1
+        if self.max_concurrency:
+            self._semaphore().release()
+
+
+class _Limit:
+    def __init__(self, limiter: RateLimiter, tokens: float):
+        self._limiter, self._tokens = limiter, tokens
+
+    async def __aenter__(self):
+        return await self._limiter.acquire(self._tokens)
+
+    async def __aexit__(self, *exc):
+        self._limiter.release()
+
+
+class LimitedParallelBatchNode(AsyncParallelBatchNode):
+    """并发受限、可接入共享 RateLimiter 的 AsyncParallelBatchNode
+
+    类属性（可在子类或实例上修改）：
+        max_concurrency: 本节点同时执行的 item 数，None 表示不限（与原版相同）
+        limiter: 共享的 RateLimiter，每次调用 exec_async（包括重试）都要先通过它
+
+    按 token 限流时覆盖 item_tokens(item) 返回该 item 预计消耗的 token 数。
+    可以与 AsyncRetryNode、AsyncMemoNode 组合：class MyBatch(LimitedParallelBatchNode, AsyncRetryNode)，
+    每个 item 按重试策略执行，每次重试同样先通过限流器。
+    """
+
+    max_concurrency = None
+    limiter = None
+
+    def item_tokens(self, item) -> float:
+        return 0
+
+    async def _exec_item(self, item):
+        # 交给 MRO 中下一个 _exec 处理单个 item（AsyncNode 的重试，或组合进来的 AsyncRetryNode、AsyncMemoNode），
+        # 限流器套在 exec_async 上：每次真正调用（包括重试）前都要先通过它，缓存命中则不占用额度
+        node = self
+        if self.limiter is not None:
+            node = copy.copy(self)
+            exec_async = node.exec_async
+
+            async def limited(prep_res):
+                async with self.limiter.limit(self.item_tokens(prep_res)):
+                    return await exec_async(prep_res)
+            node.exec_async = limited
+        return await super(AsyncParallelBatchNode, node)._exec(item)
+
+    async def _exec(self, items):
+        items = list(items or [])
+        results = [None] * len(items)
+        pending = iter(enumerate(items))
+
+        async def worker():
+            # 固定数量的 worker 依次领取 item，同一时刻只存在 max_concurrency 个进行中的调用
+            for index, item in pending:
+                results[index] = await self._exec_item(item)
+
+        workers = min(self.max_concurrency or len(items), len(items))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return results
@@ -0,0 +1,202 @@
+"""
+按 prep 结果缓存 exec
+
+exec 只依赖 prep 的返回值：同一个问题再问一次、同一批文档再切一次，Node 仍会重新调用 exec。
+MemoNode / AsyncMemoNode 把 prep_res 的哈希作为键，命中时直接返回上次的 exec 结果：
+- memo_key(prep_res)：缓存键，默认是 (节点类名, prep_res) 的 pickle 哈希；
+  prep_res 很大或含有不可 pickle 的对象时覆盖它，返回 None 表示这次不缓存
+- MemoCache：有容量上限的 LRU，可选 TTL（秒），可以在多个节点之间共用
+- 只缓存 exec 成功的结果，exec_fallback 的返回值不会进入缓存
+- AsyncMemoNode 合并进行中的相同调用：并发的 item 键相同时只执行一次 exec_async，其余等待它的结果
+- 每个节点一份 MemoStats（hits / misses / coalesced / hit_rate），memo_stats(flow) 汇总整个 Flow
+
+命中时返回的是缓存中的同一个对象，post 中不要原地修改 exec_res。
+"""
+
+import asyncio
+import copy
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from pocketflow import AsyncNode, Node
+
+from .keysets import _leaf_nodes
+
+
+class MemoCache:
+    """线程安全的 LRU 缓存，ttl 秒后条目过期（None 表示不过期）"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.evictions = 0
+        self._clock = clock
+        self._data = OrderedDict()  # 键 → (过期时间, 值)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key) -> tuple:
+        """返回 (是否命中, 值)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires, value = entry
+            if expires is not None and expires <= self._clock():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def put(self, key, value):
+        with self._lock:
+            expires = None if self.ttl is None else self._clock() + self.ttl
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class MemoStats:
+    """单个节点的缓存统计（节点的副本共用同一份）"""
+
+    def __init__(self):
+        self.hits = self.misses = self.coalesced = self.uncacheable = 0
+        self._lock = threading.Lock()
+
+    def count(self, field: str):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    @property
+    def hit_rate(self) -> float:
+        """命中（含合并的并发调用）占全部可缓存调用的比例"""
+        total = self.hits + self.coalesced + self.misses
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced,
+                "uncacheable": self.uncacheable, "hit_rate": self.hit_rate}
+
+
+class MemoNode(Node):
+    """按 memo_key(prep_res) 缓存 exec 结果的 Node
+
+    类属性 memo_maxsize / memo_ttl 决定默认缓存的容量和过期时间；也可以传入 cache 让多个节点共用。
+    与 BatchNode / ParallelBatchNode 组合时把批处理类写在前面：class MyBatch(BatchNode, MemoNode)，
+    这样每个 item 各自查缓存；与 RetryNode 组合时把 MemoNode 写在前面，命中的调用不会进入重试逻辑。
+    """
+
+    memo_maxsize = 1024
+    memo_ttl = None
+
+    def __init__(self, *args, cache: MemoCache = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Flow 运行时复制节点，缓存和统计在副本之间按引用共享
+        self.memo_cache = cache or MemoCache(self.memo_maxsize, self.memo_ttl)
+        self.memo_stats = MemoStats()
+
+    def memo_key(self, prep_res):
+        """prep_res 对应的缓存键；返回 None 表示不缓存"""
+        try:
+            data = pickle.dumps((type(self).__qualname__, prep_res), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return None
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def _watched(self, fallback_name: str) -> tuple:
+        """节点的副本，其 exec_fallback 被调用时在返回的列表中留下记录"""
+        node, fell_back = copy.copy(self), []
+        fallback = getattr(node, fallback_name)
+
+        def watched(prep_res, exc):
+            fell_back.append(exc)
+            return fallback(prep_res, exc)
+        setattr(node, fallback_name, watched)
+        return node, fell_back
+
+    def _exec(self, prep_res):
+        key = self.memo_key(prep_res)
+        if key is None:
+            self.memo_stats.count("uncacheable")
+            return super()._exec(prep_res)
+        found, value = self.memo_cache.get(key)
+        if found:
+            self.memo_stats.count("hits")
+            return value
+        self.memo_stats.count("misses")
+        node, fell_back = self._watched("exec_fallback")
+        result = super(MemoNode, node)._exec(prep_res)
+        if not fell_back:
+            self.memo_cache.put(key, result)
+        return result
+
+
+class AsyncMemoNode(MemoNode, AsyncNode):
+    """MemoNode 的异步版本，并发的相同调用只执行一次
+
+    与 AsyncParallelBatchNode 组合：class MyBatch(AsyncParallelBatchNode, AsyncMemoNode)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._memo_inflight = {}  # 键 → 进行中调用的 Future
+
+    async def _exec(self, prep_res):
+        key = self.memo_key(prep_res)
+        if key is None:
+            self.memo_stats.count("uncacheable")
+            return await super(MemoNode, self)._exec(prep_res)
+        found, value = self.memo_cache.get(key)
+        if found:
+            self.memo_stats.count("hits")
+            return value
+        pending = self._memo_inflight.get(key)
+        if pending is not None:
+            # 相同的调用正在进行，等它的结果（一个等待者被取消不影响其他等待者）
+            self.memo_stats.count("coalesced")
+            return await asyncio.shield(pending)
+        self.memo_stats.count("misses")
+        future = self._memo_inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            node, fell_back = self._watched("exec_fallback_async")
+            result = await super(MemoNode, node)._exec(prep_res)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # 没有等待者时不报 "exception was never retrieved"
+            raise
+        else:
+            if not fell_back:
+                self.memo_cache.put(key, result)
+            future.set_result(result)
+            return result
+        finally:
+            del self._memo_inflight[key]
+
+
+def memo_stats(flow, **extra) -> dict:
+    """Flow 中所有 MemoNode 的统计：{节点名: MemoStats.as_dict()}，同名节点加编号区分
+
+    extra 中是其他提供 as_dict() 的统计对象（如 LLM 响应缓存的 stats），按关键字参数名一并列出
+    """
+    nodes = [node for node in _leaf_nodes(flow) if isinstance(node, MemoNode)]
+    stats = {}
+    for node in nodes:
+        name = type(node).__name__
+        same = [n for n in nodes if type(n).__name__ == name]
+        stats[name if len(same) == 1 else f"{name}#{same.index(node) + 1}"] = node.memo_stats.as_dict()
+    stats.update((name, source.as_dict()) for name, source in extra.items())
+    return stats
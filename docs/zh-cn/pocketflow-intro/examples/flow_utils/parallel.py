@@ -0,0 +1,114 @@
+"""
+线程池 / 进程池并行的 BatchNode
+
+BatchNode 逐个执行 item，exec 里是阻塞的同步 SDK 调用时，总耗时是 N × 单次延迟。
+客户端库只有同步接口时无法改写成 AsyncParallelBatchNode，ParallelBatchNode 把每个 item
+交给有界线程池执行：
+- 每个 item 在节点的浅拷贝上运行 Node._exec，重试次数（cur_retry）、wait 和 exec_fallback
+  与 BatchNode 完全相同，互不干扰
+- 结果按输入顺序返回；某个 item 的 exec_fallback 抛出异常时，尚未开始的 item 被取消，异常照常抛出
+- 每个 item 在复制的 contextvars 上下文中运行，Tracer 等基于 contextvars 的工具照常工作
+
+exec 里如果修改 self 上的状态或模块级全局变量，需要自己保证线程安全。
+
+exec 是纯 Python 的 CPU 计算时（如案例 06 的评分），线程受 GIL 限制，ProcessBatchNode 改用进程池：
+- item 按 chunk 分组发给 worker 进程，每个 item 在 worker 里照常走重试与 exec_fallback
+- 进程池按 max_workers 缓存在模块里，多次运行 Flow 复用已经启动的 worker，不用每次重新 fork / import
+- 节点（去掉 successors）和 item 必须可以 pickle；exec 对 self 或全局变量的修改不会传回主进程
+"""
+
+import atexit
+import contextvars
+import copy
+import math
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from pocketflow import BatchNode
+
+from .examples import LOADED, ensure_loaded
+
+
+class ParallelBatchNode(BatchNode):
+    """在线程池中并行执行 exec 的 BatchNode
+
+    并发上限 max_workers 是类属性，可以在子类或实例上修改（node.max_workers = 4）。
+    构造参数与 BatchNode 相同，也可以与 RetryNode 组合：class X(ParallelBatchNode, RetryNode)
+    """
+
+    max_workers = 8
+
+    def _exec_item(self, item):
+        # 与 BatchNode 相同的单 item 执行逻辑（含重试与 fallback），在独立的浅拷贝上运行
+        return super(BatchNode, copy.copy(self))._exec(item)
+
+    def _exec(self, items):
+        items = list(items or [])
+        if len(items) <= 1 or self.max_workers <= 1:
+            return [self._exec_item(item) for item in items]
+        pool = ThreadPoolExecutor(min(self.max_workers, len(items)))
+        try:
+            futures = [pool.submit(contextvars.copy_context().run, self._exec_item, item) for item in items]
+            return [future.result() for future in futures]
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+# ---------- 进程池 ----------
+
+_pools = {}  # max_workers → 常驻的 ProcessPoolExecutor
+
+
+def _process_pool(max_workers: int) -> ProcessPoolExecutor:
+    pool = _pools.get(max_workers)
+    if pool is None:
+        pool = _pools[max_workers] = ProcessPoolExecutor(max_workers)
+    return pool
+
+
+@atexit.register
+def shutdown_pools():
+    """关闭所有缓存的进程池（进程退出时自动调用）"""
+    while _pools:
+        _pools.popitem()[1].shutdown(wait=True, cancel_futures=True)
+
+
+def _run_chunk(modules: dict, payload: bytes) -> list:
+    # 先导入 load_example 加载过的示例，节点类才能反序列化
+    ensure_loaded(modules)
+    node, items = pickle.loads(payload)
+    return [super(BatchNode, node)._exec(item) for item in items]
+
+
+class ProcessBatchNode(BatchNode):
+    """在进程池中按 chunk 执行 item 的 BatchNode，适合 CPU 密集的 exec
+
+    max_workers（默认 CPU 核数）和 chunksize（默认让每个 worker 分到约 4 个 chunk）
+    都是类属性，可以在子类或实例上修改。
+    """
+
+    max_workers = None
+    chunksize = None
+
+    def _exec(self, items):
+        items = list(items or [])
+        if not items:
+            return []
+        workers = self.max_workers or os.cpu_count() or 1
+        size = self.chunksize or max(1, math.ceil(len(items) / (workers * 4)))
+        node = copy.copy(self)
+        node.successors = {}  # 不把整张图发给 worker
+        modules = dict(LOADED)
+        chunks = [pickle.dumps((node, items[i:i + size]), protocol=pickle.HIGHEST_PROTOCOL)
+                  for i in range(0, len(items), size)]
+        futures = [_process_pool(workers).submit(_run_chunk, modules, chunk) for chunk in chunks]
+        try:
+            return [result for future in futures for result in future.result()]
+        except BrokenProcessPool:
+            _pools.pop(workers, None)  # worker 崩溃后池不可再用，下次运行重新创建
+            raise
+        finally:
+            for future in futures:
+                future.cancel()  # 出错时不再执行排队中的 chunk；已完成的 cancel 无效果
@@ -0,0 +1,203 @@
+"""
+重试策略与熔断器
+
+Node._exec 失败后固定 time.sleep(self.wait) 再重试：
+- 同一时刻失败的调用方会在同一时刻一起重试，对已经出故障的 API 形成"重试风暴"
+- 下游整体不可用时，每个节点仍要把 max_retries 次重试和等待全部走完才进入 exec_fallback
+
+RetryNode / AsyncRetryNode 用 RetryPolicy 代替 max_retries + wait：
+- 指数退避 + full jitter：第 n 次重试前等待 uniform(0, min(cap, base * 2**n)) 秒
+- max_total_delay 限制一次执行里累计等待的上限，用完即进入 exec_fallback
+- retry_on 指定哪些异常值得重试，其他异常直接进入 exec_fallback
+- 异步版本用 asyncio.sleep 等待，事件循环在退避期间继续处理其他任务
+
+多个节点可以共用一个 CircuitBreaker：最近 window 次调用中失败比例超过 failure_rate 时熔断，
+cooldown 秒内的调用不再执行 exec，直接以 CircuitOpenError 进入 exec_fallback；
+冷却结束后放行一次探测调用，成功则恢复，失败则继续熔断。
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+
+from pocketflow import AsyncNode, Node
+
+
+class CircuitOpenError(Exception):
+    """熔断期间跳过 exec 时传给 exec_fallback 的异常"""
+
+
+class RetryPolicy:
+    """指数退避 + full jitter 的重试策略
+
+    Args:
+        max_attempts: 最多执行 exec 的次数（含第一次），对应 max_retries
+        base: 第一次重试的退避上限（秒），之后每次翻倍
+        cap: 单次退避的上限（秒）
+        max_total_delay: 一次执行里累计等待的上限（秒），None 表示不限
+        retry_on: 值得重试的异常类型
+        jitter: False 时不加随机抖动，等待时间就是退避上限
+        seed: 抖动的随机种子
+    """
+
+    def __init__(self, max_attempts: int = 3, base: float = 0.5, cap: float = 10.0, max_total_delay: float = None,
+                 retry_on: tuple = (Exception,), jitter: bool = True, seed: int = None):
+        self.max_attempts = max_attempts
+        self.base = base
+        self.cap = cap
+        self.max_total_delay = max_total_delay
+        self.retry_on = retry_on
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+
+    def next_delay(self, attempt: int, exc: Exception, waited: float):
+        """第 attempt 次（从 0 计）执行失败后应等待的秒数；返回 None 表示不再重试"""
+        if attempt + 1 >= self.max_attempts or not isinstance(exc, self.retry_on):
+            return None
+        delay = min(self.cap, self.base * 2 ** attempt)
+        if self.jitter:
+            delay = self._rng.uniform(0, delay)
+        if self.max_total_delay is not None:
+            remaining = self.max_total_delay - waited
+            if remaining <= 0:
+                return None
+            delay = min(delay, remaining)
+        return delay
+
+
+class CircuitBreaker:
+    """按最近 window 次调用的失败比例熔断，可在多个节点、多个线程间共用
+
+    状态：closed（正常放行）→ open（全部拒绝）→ 冷却 cooldown 秒后 half_open（放行一次探测）
+    """
+
+    def __init__(self, failure_rate: float = 0.5, window: int = 20, min_calls: int = 5, cooldown: float = 30.0,
+                 failure_on: tuple = (Exception,), clock=time.monotonic):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.failure_on = failure_on
+        self.state = "closed"
+        self.rejected = 0  # 熔断期间被拒绝的调用数
+        self._clock = clock
+        self._outcomes = deque(maxlen=window)  # True 表示失败
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """本次调用是否可以执行"""
+        with self._lock:
+            if self.state == "open" and self._clock() - self._opened_at >= self.cooldown:
+                self.state, self._probing = "half_open", False
+            if self.state == "closed" or (self.state == "half_open" and not self._probing):
+                self._probing = self.state == "half_open"
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, exc: Exception = None):
+        """记录一次调用的结果，exc 为 None 表示成功"""
+        failed = exc is not None and isinstance(exc, self.failure_on)
+        with self._lock:
+            if self.state == "half_open":
+                self._outcomes.clear()
+                if failed:
+                    self._open()
+                else:
+                    self.state = "closed"
+                return
+            self._outcomes.append(failed)
+            if (self.state == "closed" and len(self._outcomes) >= self.min_calls
+                    and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate):
+                self._open()
+
+    def release(self):
+        """放行的调用没有结果就结束了（被取消、被中断）：不计入统计，让出 half_open 的探测名额"""
+        with self._lock:
+            if self.state == "half_open":
+                self._probing = False
+
+    def _open(self):
+        self.state, self._opened_at, self._probing = "open", self._clock(), False
+
+
+class RetryNode(Node):
+    """按 RetryPolicy 重试、可接入 CircuitBreaker 的 Node
+
+    策略也可以写成类属性 retry_policy / circuit_breaker。与 BatchNode 组合时把 BatchNode 写在前面：
+    class MyBatch(BatchNode, RetryNode)，这样每个 item 各自按策略重试。
+    """
+
+    retry_policy = None
+    circuit_breaker = None
+
+    def __init__(self, policy: RetryPolicy = None, breaker: CircuitBreaker = None):
+        policy = policy or self.retry_policy or RetryPolicy()
+        super().__init__(max_retries=policy.max_attempts, wait=0)
+        self.retry_policy = policy
+        self.circuit_breaker = breaker or self.circuit_breaker
+
+    def on_retry(self, exc: Exception, delay: float):
+        """每次退避等待前调用，可覆盖用于日志"""
+
+    def _exec(self, prep_res):
+        policy, breaker, waited = self.retry_policy, self.circuit_breaker, 0.0
+        for self.cur_retry in range(policy.max_attempts):
+            if breaker and not breaker.allow():
+                return self.exec_fallback(prep_res, CircuitOpenError("circuit breaker is open"))
+            try:
+                result = self.exec(prep_res)
+            except Exception as e:
+                if breaker:
+                    breaker.record(e)
+                delay = policy.next_delay(self.cur_retry, e, waited)
+                if delay is None:
+                    return self.exec_fallback(prep_res, e)
+                self.on_retry(e, delay)
+                time.sleep(delay)
+                waited += delay
+            except BaseException:
+                if breaker:
+                    breaker.release()
+                raise
+            else:
+                if breaker:
+                    breaker.record()
+                return result
+
+
+class AsyncRetryNode(RetryNode, AsyncNode):
+    """RetryNode 的异步版本：退避期间用 asyncio.sleep 让出事件循环
+
+    与 AsyncParallelBatchNode 组合：class MyBatch(AsyncParallelBatchNode, AsyncRetryNode)
+    """
+
+    async def _exec(self, prep_res):
+        policy, breaker, waited = self.retry_policy, self.circuit_breaker, 0.0
+        # 并发的 item 共用同一个节点，重试次数用局部变量记录（与 AsyncNode._exec 相同）
+        for attempt in range(policy.max_attempts):
+            if breaker and not breaker.allow():
+                return await self.exec_fallback_async(prep_res, CircuitOpenError("circuit breaker is open"))
+            try:
+                result = await self.exec_async(prep_res)
+            except Exception as e:
+                if breaker:
+                    breaker.record(e)
+                delay = policy.next_delay(attempt, e, waited)
+                if delay is None:
+                    return await self.exec_fallback_async(prep_res, e)
+                self.on_retry(e, delay)
+                await asyncio.sleep(delay)
+                waited += delay
+            except BaseException:
+                # 取消（deadline、wait_for）或中断时没有结果可记，但要让出探测名额，否则熔断器永远停在 half_open
+                if breaker:
+                    breaker.release()
+                raise
+            else:
+                if breaker:
+                    breaker.record()
+                return result
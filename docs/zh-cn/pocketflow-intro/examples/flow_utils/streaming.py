@@ -0,0 +1,93 @@
+"""
+按完成顺序流式处理并行结果
+
+AsyncParallelBatchNode 用 asyncio.gather 等全部 item 完成后才调用 post_async，
+最慢的那个请求决定了下游什么时候能开始。StreamingParallelBatchNode 改为：
+- 每个 item 一完成就调用 post_item_async(shared, index, item, result)，可以立即处理或写出
+- stream(items) 是底层的异步迭代器，按完成顺序产出 (index, result)，也可以单独使用
+- deadline 秒后不再等待剩余 item（取消它们），post_async 拿到部分结果，
+  未完成的位置是 TIMED_OUT
+
+继承自 LimitedParallelBatchNode，max_concurrency、limiter 和逐 item 的重试同样适用。
+"""
+
+import asyncio
+import contextlib
+
+from .limits import LimitedParallelBatchNode
+
+
+class _TimedOut:
+    def __repr__(self):
+        return "TIMED_OUT"
+
+
+TIMED_OUT = _TimedOut()  # deadline 之前没有完成的 item 在 exec_res 中的占位值
+
+
+class StreamingParallelBatchNode(LimitedParallelBatchNode):
+    """结果按完成顺序交给 post_item_async 的并行批处理节点
+
+    类属性 deadline：从开始执行 item 算起的最长等待秒数，None 表示等全部完成。
+    post_async 收到的 exec_res 仍按输入顺序排列。
+    """
+
+    deadline = None
+
+    async def post_item_async(self, shared, index, item, result):
+        """单个 item 完成时调用，默认什么都不做"""
+
+    async def stream(self, items, deadline: float = None):
+        """并发执行 items，按完成顺序产出 (index, result)；超过 deadline 秒后停止并取消剩余 item"""
+        items = list(items or [])
+        if not items:
+            return
+        done = asyncio.Queue()
+        pending = iter(enumerate(items))
+
+        async def worker():
+            try:
+                for index, item in pending:
+                    done.put_nowait((index, await self._exec_item(item), None))
+            except Exception as e:  # exec_fallback 抛出的异常交给消费方重新抛出
+                done.put_nowait((None, None, e))
+
+        tasks = [asyncio.create_task(worker()) for _ in range(min(self.max_concurrency or len(items), len(items)))]
+        loop = asyncio.get_running_loop()
+        end = None if deadline is None else loop.time() + deadline
+        async def stop():
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            for _ in range(len(items)):
+                timeout = None if end is None else max(0.0, end - loop.time())
+                try:
+                    index, result, error = await asyncio.wait_for(done.get(), timeout)
+                except asyncio.TimeoutError:
+                    # 消费方处理得慢时，到 deadline 队列里可能还有已完成的结果（timeout 为 0 时
+                    # wait_for 不会去取）：先停掉 worker，再把队列中剩下的结果全部产出，只有没完成的才算超时
+                    await stop()
+                    while not done.empty():
+                        index, result, error = done.get_nowait()
+                        if error is not None:
+                            raise error
+                        yield index, result
+                    return
+                if error is not None:
+                    raise error
+                yield index, result
+        finally:
+            await stop()
+
+    async def _run_async(self, shared):
+        prep_res = await self.prep_async(shared)
+        items = list(prep_res or [])
+        results = [TIMED_OUT] * len(items)
+        # post_item_async 抛出异常时也要关闭 stream，让它取消并等待还在运行的 worker
+        async with contextlib.aclosing(self.stream(items, self.deadline)) as stream:
+            async for index, result in stream:
+                results[index] = result
+                await self.post_item_async(shared, index, items[index], result)
+        return await self.post_async(shared, prep_res, results)
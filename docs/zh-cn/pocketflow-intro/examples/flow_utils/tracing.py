@@ -0,0 +1,310 @@
+"""
+节点级追踪
+
+Flow 跑得慢时，需要知道时间花在 prep、exec、重试、wait 等待还是 post 上。
+Tracer.attach(flow) 把图中每个节点（含嵌套的子 Flow）换成带埋点的子类：
+- 每个节点一次运行是一个 span，其中再细分 prep / exec / post
+- exec 阶段里每次调用 exec 是一个 attempt span（BatchNode 的每个 item 都有自己的 attempt）
+- 失败后到下一次重试之间的间隔记为 wait span（node.wait > 0 时）
+- 异步节点按 asyncio task 分配泳道，并发的 item 在时间轴上并排显示
+
+save_chrome_trace() 导出 Chrome trace-event JSON，可直接拖进 https://ui.perfetto.dev 查看；
+critical_path() / print_summary() 给出决定总耗时的那条 span 链，适合分析异步并发流程。
+追踪是可选的：不调用 attach 就没有任何额外开销，detach() 恢复原来的类。
+"""
+
+import asyncio
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+
+from pocketflow import AsyncNode, BatchNode, Flow
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+_last_attempt = contextvars.ContextVar("last_attempt", default=None)
+
+
+class Tracer:
+    """记录 span 并导出为 Chrome trace-event 格式"""
+
+    def __init__(self):
+        self.spans = []  # {"id", "parent", "name", "cat", "start", "end", "tid", "args"}
+        self._ids = itertools.count()
+        self._lanes = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._patched = []  # (节点, 原来的类)
+
+    # ---------- 记录 ----------
+
+    def _lane(self) -> int:
+        """同一个线程 / asyncio task 的 span 画在同一条泳道上"""
+        try:
+            key = ("task", id(asyncio.current_task()))
+        except RuntimeError:
+            key = ("thread", threading.get_ident())
+        with self._lock:
+            return self._lanes.setdefault(key, len(self._lanes))
+
+    def _open(self, name: str, cat: str, args: dict = None, start: float = None) -> dict:
+        span = {
+            "id": next(self._ids), "parent": _current_span.get(), "name": name, "cat": cat,
+            "start": time.perf_counter() if start is None else start, "end": None,
+            "tid": self._lane(), "args": args or {},
+        }
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def span(self, name: str, cat: str, fn, *args, span_args: dict = None):
+        """同步调用 fn(*args)，期间的子调用都记为它的子 span"""
+        span = self._open(name, cat, span_args)
+        token = _current_span.set(span["id"])
+        try:
+            return fn(*args)
+        except Exception as e:
+            span["args"]["error"] = repr(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span["end"] = time.perf_counter()
+
+    async def span_async(self, name: str, cat: str, fn, *args, span_args: dict = None):
+        """异步版本的 span"""
+        span = self._open(name, cat, span_args)
+        token = _current_span.set(span["id"])
+        try:
+            return await fn(*args)
+        except Exception as e:
+            span["args"]["error"] = repr(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span["end"] = time.perf_counter()
+
+    def _attempt(self, node) -> dict:
+        """判断这次 exec 调用是新 item 还是当前 item 的重试，必要时补一个 wait span
+
+        当前 item 的编号和尝试次数存在 contextvar 里（每个线程 / task 一份）：
+        exec 成功或调用了 exec_fallback 后这个 item 结束，同一节点的下一次 exec 分配新编号；
+        上一次 exec 失败且 item 尚未结束时才算重试。不比较参数，相同的 item 重复出现也各自编号。
+        """
+        last = _last_attempt.get()
+        if last and last["node"] is node and last["open"]:
+            info = {"item": last["item"], "attempt": last["attempt"] + 1}
+            if getattr(node, "wait", 0) > 0:
+                wait = self._open("wait", "wait", {"seconds": node.wait}, start=last["end"])
+                wait["end"] = time.perf_counter()
+        else:
+            info = {"item": next(node._trace_items) if isinstance(node, BatchNode) else None, "attempt": 0}
+        _last_attempt.set({"node": node, "open": True, "end": None, **info})
+        return info
+
+    def _attempt_done(self, failed: bool):
+        last = _last_attempt.get()
+        last["open"], last["end"] = failed, time.perf_counter()
+
+    def _item_done(self, node):
+        """exec_fallback 被调用：当前 item 不会再重试"""
+        last = _last_attempt.get()
+        if last and last["node"] is node:
+            last["open"] = False
+
+    def _attempt_args(self, info: dict) -> dict:
+        return {k: v for k, v in info.items() if v is not None}
+
+    # ---------- 埋点 ----------
+
+    def attach(self, flow) -> "Tracer":
+        """给 flow 及其可达的所有节点（递归进入子 Flow）加上埋点"""
+        stack, seen = [flow], set()
+        while stack:
+            node = stack.pop()
+            if id(node) in seen or node is None:
+                continue
+            seen.add(id(node))
+            if not getattr(type(node), "_traced", False):
+                self._patched.append((node, type(node)))
+                node.__class__ = _traced_class(type(node))
+            node._tracer = self
+            stack.extend(node.successors.values())
+            stack.extend(getattr(node, "branches", ()))  # FanOut 的并行分支
+            if isinstance(node, Flow):
+                stack.append(node.start_node)
+        return self
+
+    def detach(self):
+        """恢复节点原来的类"""
+        for node, cls in self._patched:
+            node.__class__ = cls
+            node.__dict__.pop("_tracer", None)
+        self._patched.clear()
+
+    # ---------- 导出与分析 ----------
+
+    def chrome_trace(self) -> dict:
+        """转换成 Chrome trace-event 格式（complete 事件，时间单位微秒）"""
+        pid = os.getpid()
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": f"lane {tid}"}}
+            for tid in sorted(set(self._lanes.values()))
+        ]
+        for span in self.spans:
+            if span["end"] is None:
+                continue
+            events.append({
+                "name": span["name"], "cat": span["cat"], "ph": "X", "pid": pid, "tid": span["tid"],
+                "ts": round((span["start"] - self._origin) * 1e6, 3),
+                "dur": round((span["end"] - span["start"]) * 1e6, 3),
+                "args": span["args"],
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+
+    def critical_path(self) -> list[tuple[int, dict]]:
+        """返回决定总耗时的 span 链，元素为 (深度, span)
+
+        在每一层，从最晚结束的子 span 往前找：前一个是"在它开始之前最晚结束"的兄弟 span。
+        并发的子 span 中只有最慢的那个会出现在关键路径上。
+        """
+        children = {}
+        for span in self.spans:
+            if span["end"] is not None:
+                children.setdefault(span["parent"], []).append(span)
+
+        def walk(parent, depth):
+            spans = children.get(parent, [])
+            chain, cursor = [], None
+            while True:
+                candidates = [s for s in spans if cursor is None or s["end"] <= cursor["start"]]
+                if not candidates:
+                    break
+                cursor = max(candidates, key=lambda s: s["end"])
+                chain.append(cursor)
+            result = []
+            for span in reversed(chain):
+                result.append((depth, span))
+                result.extend(walk(span["id"], depth + 1))
+            return result
+
+        return walk(None, 0)
+
+    def print_summary(self, min_ms: float = 0.0):
+        """打印关键路径：每个 span 的耗时、占总耗时的比例，以及与它时间重叠的兄弟 span 数量"""
+        path = self.critical_path()
+        if not path:
+            print("（没有记录到 span）")
+            return
+        total_ms = sum(s["end"] - s["start"] for depth, s in path if depth == 0) * 1000
+        siblings = {}
+        for span in self.spans:
+            if span["end"] is not None:
+                siblings.setdefault(span["parent"], []).append(span)
+        print(f"关键路径（总耗时 {total_ms:.1f} ms）：")
+        for depth, span in path:
+            ms = (span["end"] - span["start"]) * 1000
+            if ms < min_ms:
+                continue
+            args = " ".join(f"{k}={v}" for k, v in span["args"].items())
+            overlap = sum(1 for s in siblings[span["parent"]]
+                          if s is not span and s["start"] < span["end"] and s["end"] > span["start"])
+            note = f"  （与 {overlap} 个 span 并发，最晚结束）" if overlap else ""
+            label = "  " * depth + span["name"]
+            print(f"{label:<30}{ms:>9.1f} ms{ms / total_ms * 100 if total_ms else 0:>5.0f}%  {args}{note}")
+
+
+# ---------- 带埋点的子类 ----------
+
+@functools.lru_cache(maxsize=None)
+def _traced_class(cls):
+    """为 cls 生成同名子类，覆盖各阶段方法并记录 span"""
+    if issubclass(cls, AsyncNode):
+        body = _async_methods(cls)
+    elif issubclass(cls, Flow):
+        body = {"_run": _sync_methods()["_run"]}  # 子 Flow 只记整体耗时，内部节点各自埋点
+    else:
+        body = _sync_methods()
+    return type(cls.__name__, (cls,), {"_traced": True, "__qualname__": cls.__qualname__,
+                                       "__module__": cls.__module__, **body})
+
+
+def _sync_methods():
+    # 节点的类就是埋点子类，super(type(self), self) 即原来的实现
+    def _run(self, shared):
+        cat = "flow" if isinstance(self, Flow) else "node"
+        return self._tracer.span(type(self).__name__, cat, super(type(self), self)._run, shared)
+
+    def prep(self, shared):
+        return self._tracer.span("prep", "phase", super(type(self), self).prep, shared)
+
+    def _exec(self, prep_res):
+        self._trace_items = itertools.count()  # BatchNode 的 item 在本次运行内编号
+        return self._tracer.span("exec", "phase", super(type(self), self)._exec, prep_res)
+
+    def exec(self, prep_res):
+        tracer = self._tracer
+        info = tracer._attempt(self)
+        try:
+            result = tracer.span("attempt", "attempt", super(type(self), self).exec, prep_res,
+                                 span_args=tracer._attempt_args(info))
+        except Exception:
+            tracer._attempt_done(failed=True)
+            raise
+        tracer._attempt_done(failed=False)
+        return result
+
+    def exec_fallback(self, prep_res, exc):
+        self._tracer._item_done(self)
+        return self._tracer.span("fallback", "phase", super(type(self), self).exec_fallback, prep_res, exc)
+
+    def post(self, shared, prep_res, exec_res):
+        return self._tracer.span("post", "phase", super(type(self), self).post, shared, prep_res, exec_res)
+
+    return {"_run": _run, "prep": prep, "_exec": _exec, "exec": exec, "exec_fallback": exec_fallback, "post": post}
+
+
+def _async_methods(cls):
+    async def _run_async(self, shared):
+        cat = "flow" if isinstance(self, Flow) else "node"
+        return await self._tracer.span_async(type(self).__name__, cat, super(type(self), self)._run_async, shared)
+
+    async def prep_async(self, shared):
+        return await self._tracer.span_async("prep", "phase", super(type(self), self).prep_async, shared)
+
+    async def _exec(self, prep_res):
+        self._trace_items = itertools.count()
+        return await self._tracer.span_async("exec", "phase", super(type(self), self)._exec, prep_res)
+
+    async def exec_async(self, prep_res):
+        tracer = self._tracer
+        info = tracer._attempt(self)
+        try:
+            result = await tracer.span_async("attempt", "attempt", super(type(self), self).exec_async, prep_res,
+                                             span_args=tracer._attempt_args(info))
+        except Exception:
+            tracer._attempt_done(failed=True)
+            raise
+        tracer._attempt_done(failed=False)
+        return result
+
+    async def exec_fallback_async(self, prep_res, exc):
+        self._tracer._item_done(self)
+        return await self._tracer.span_async("fallback", "phase", super(type(self), self).exec_fallback_async,
+                                             prep_res, exc)
+
+    async def post_async(self, shared, prep_res, exec_res):
+        return await self._tracer.span_async("post", "phase", super(type(self), self).post_async,
+                                             shared, prep_res, exec_res)
+
+    if issubclass(cls, Flow):
+        # AsyncFlow 只记整体耗时和自身的 prep / post，内部节点各自埋点
+        return {"_run_async": _run_async, "prep_async": prep_async, "post_async": post_async}
+    return {"_run_async": _run_async, "prep_async": prep_async, "_exec": _exec, "exec_async": exec_async,
+            "exec_fallback_async": exec_fallback_async, "post_async": post_async}